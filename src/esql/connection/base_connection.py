@@ -2,17 +2,21 @@ from __future__ import annotations
 
 import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import TypeVar, Generic, Any, Generator, Callable
+from typing import TypeVar, Generic, Any, Generator, Callable, Iterable, Sequence
 
 from empire_commons.types_ import JsonType, JsonListType
 import ereport
 
 from esql.connection.base_query_collectors import BaseQueryCollectors
+from esql.connection.base_query_result import BaseQueryResult
 
 TypeConnection = TypeVar('TypeConnection')
 TypeQueryResult = TypeVar('TypeQueryResult')
 
+StatementType = str | tuple[str, Sequence[Any]]
+
 
 class BaseConnection(ABC, Generic[TypeConnection, TypeQueryResult]):
     """
@@ -46,6 +50,13 @@ class BaseConnection(ABC, Generic[TypeConnection, TypeQueryResult]):
         """
         return self._connection
 
+    @property
+    def is_connected(self) -> bool:
+        """
+        Returns true when a connection has been made and has not been closed
+        """
+        return self._connection is not None
+
     @abstractmethod
     def connect(self) -> BaseConnection:
         """
@@ -129,6 +140,90 @@ class BaseConnection(ABC, Generic[TypeConnection, TypeQueryResult]):
                                            batch_size=batch_size,
                                            verbose=verbose)
 
+    def execute_many(
+            self,
+            queries: Iterable[StatementType],
+            *,
+            max_concurrency: int = 8,
+            merge: bool = False,
+            merge_key: Callable[[Any], Any] | None = None,
+            collector_method: Callable[
+                [Any, int], JsonType | JsonListType | Generator[JsonType, Any, None]] = None,
+            batch_size: int = 1,
+            verbose: bool = False
+    ) -> list[TypeQueryResult] | BaseQueryResult:
+        """
+        Executes *queries* concurrently, at most *max_concurrency* at a time, using threads.
+
+        :param queries: The queries. Each element is either a query or a ``(query, parameters)`` tuple
+        :param max_concurrency: Maximum number of queries running at the same time
+        :param merge: When true, the results are merged into a single one with ``merge()``
+        :param merge_key: When merging results sorted by a key, the key, see ``merge()``
+        :param collector_method: The collector method, used for every query
+        :param batch_size: Batch size, passed to collector method
+        :param verbose: When true, emits logs of executing query and success.
+        :return: One result per query, in the same order as *queries*, or the merged result
+        """
+        statements: list[tuple[str, Sequence[Any]]] = [self._unpack_statement(statement) for statement in queries]
+        kwargs: dict[str, Any] = self._make_execute_kwargs(collector_method, batch_size, verbose)
+
+        if not statements:
+            results: list[TypeQueryResult] = []
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(statements))), thread_name_prefix='esql-many') as executor:
+                results = list(executor.map(
+                    lambda statement: self.execute_query(statement[0], *statement[1], **kwargs),
+                    statements
+                ))
+
+        return self._merge_many(results, merge_key) if merge else results
+
+    async def execute_many_async(
+            self,
+            queries: Iterable[StatementType],
+            *,
+            max_concurrency: int = 8,
+            merge: bool = False,
+            merge_key: Callable[[Any], Any] | None = None,
+            collector_method: Callable[
+                [Any, int], JsonType | JsonListType | Generator[JsonType, Any, None]] = None,
+            batch_size: int = 1,
+            verbose: bool = False
+    ) -> list[TypeQueryResult] | BaseQueryResult:
+        """
+        Same as ``execute_many()``, but awaits ``execute_query_async()``, at most *max_concurrency* at a time.
+        """
+        statements: list[tuple[str, Sequence[Any]]] = [self._unpack_statement(statement) for statement in queries]
+        kwargs: dict[str, Any] = self._make_execute_kwargs(collector_method, batch_size, verbose)
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _execute(statement: tuple[str, Sequence[Any]]) -> TypeQueryResult:
+            async with semaphore:
+                return await self.execute_query_async(statement[0], *statement[1], **kwargs)
+
+        results: list[TypeQueryResult] = list(await asyncio.gather(*(_execute(statement) for statement in statements)))
+        return self._merge_many(results, merge_key) if merge else results
+
+    @staticmethod
+    def _unpack_statement(statement: StatementType) -> tuple[str, Sequence[Any]]:
+        if isinstance(statement, str):
+            return statement, ()
+        return statement[0], tuple(statement[1])
+
+    @staticmethod
+    def _make_execute_kwargs(collector_method: Callable | None, batch_size: int, verbose: bool) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {
+            'batch_size': batch_size,
+            'verbose': verbose
+        }
+        if collector_method:
+            kwargs['collector_method'] = collector_method
+        return kwargs
+
+    @staticmethod
+    def _merge_many(results: list[TypeQueryResult], key: Callable[[Any], Any] | None) -> BaseQueryResult:
+        return (type(results[0]) if results else BaseQueryResult).merge(*results, key=key)
+
     def close(self):
         """
         If a connection has been made to a database, closes it.
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Generic, TypeVar, Generator
+
+from esql._internal.ref import DEFAULT_REPORTER
+from esql.connection.base_connection import BaseConnection
+
+LOGGER = DEFAULT_REPORTER
+
+TypePooledConnection = TypeVar('TypePooledConnection', bound=BaseConnection)
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectionPoolStatistics:
+    """
+    Snapshot of a pool's counters
+
+    - created: Number of connections opened by the pool
+    - closed: Number of connections closed by the pool (evicted, unhealthy or on pool close)
+    - checkouts: Number of successful borrows
+    - checkins: Number of connections given back to the pool
+    - waits: Number of borrows that had to wait for a connection to be given back
+    - timeouts: Number of borrows that gave up waiting
+    - failed_health_checks: Number of connections discarded because they failed their health check
+    - evicted: Number of connections closed because they were idle for too long
+    - in_use: Number of connections currently borrowed
+    - idle: Number of connections currently waiting in the pool
+    """
+    created: int
+    closed: int
+    checkouts: int
+    checkins: int
+    waits: int
+    timeouts: int
+    failed_health_checks: int
+    evicted: int
+    in_use: int
+    idle: int
+
+
+class _PooledEntry:
+    __slots__ = (
+        'connection',
+        'last_used_at'
+    )
+
+    def __init__(self, connection: BaseConnection, last_used_at: float):
+        self.connection: BaseConnection = connection
+        self.last_used_at: float = last_used_at
+
+
+class BaseConnectionPool(ABC, Generic[TypePooledConnection]):
+    """
+    Thread-safe pool of connections.
+
+    Connections are handed out most-recently-used first, so the warmest sessions are reused and the coldest ones are the
+    first to be evicted once they stay idle longer than *max_idle_time*. The pool never shrinks below *min_size* through
+    eviction and never holds more than *max_size* connections (borrowed + idle).
+    """
+    __slots__ = (
+        'min_size',
+        'max_size',
+        'max_idle_time',
+        'health_check_interval',
+        'checkout_timeout',
+        '_idle',
+        '_size',
+        '_condition',
+        '_is_closed',
+        '_created',
+        '_closed',
+        '_checkouts',
+        '_checkins',
+        '_waits',
+        '_timeouts',
+        '_failed_health_checks',
+        '_evicted'
+    )
+
+    def __init__(
+            self,
+            *,
+            min_size: int = 1,
+            max_size: int = 10,
+            max_idle_time: float | None = 300.0,
+            health_check_interval: float | None = 30.0,
+            checkout_timeout: float | None = None
+    ):
+        """
+        :param min_size: Number of connections opened by ``open()`` and kept even when idle
+        :param max_size: Maximum number of connections (borrowed and idle)
+        :param max_idle_time: Seconds after which an idle connection is closed. None disables eviction.
+        :param health_check_interval: A connection idle for more than this number of seconds is actively checked (round trip)
+            before being handed out. 0 checks on every checkout, None only performs the passive check.
+        :param checkout_timeout: Default number of seconds a borrow waits for a connection. None waits forever.
+        """
+        if max_size < 1:
+            raise ValueError(f'max_size must be at least 1, got {max_size}')
+        if not 0 <= min_size <= max_size:
+            raise ValueError(f'min_size must be between 0 and max_size ({max_size}), got {min_size}')
+
+        self.min_size: int = min_size
+        self.max_size: int = max_size
+        self.max_idle_time: float | None = max_idle_time
+        self.health_check_interval: float | None = health_check_interval
+        self.checkout_timeout: float | None = checkout_timeout
+
+        self._idle: deque[_PooledEntry] = deque()
+        self._size: int = 0
+        self._condition: threading.Condition = threading.Condition(threading.Lock())
+        self._is_closed: bool = False
+
+        self._created: int = 0
+        self._closed: int = 0
+        self._checkouts: int = 0
+        self._checkins: int = 0
+        self._waits: int = 0
+        self._timeouts: int = 0
+        self._failed_health_checks: int = 0
+        self._evicted: int = 0
+
+    @abstractmethod
+    def _make_connection(self) -> TypePooledConnection:
+        """
+        Creates and connects a new connection
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _is_healthy(self, connection: TypePooledConnection, *, ping: bool) -> bool:
+        """
+        Returns true when *connection* can be handed out.
+        :param connection: The connection
+        :param ping: When true, the check should make a round trip to the server
+        """
+        raise NotImplementedError()
+
+    @property
+    def statistics(self) -> ConnectionPoolStatistics:
+        """
+        Returns a snapshot of the pool's counters
+        """
+        with self._condition:
+            return ConnectionPoolStatistics(
+                created=self._created,
+                closed=self._closed,
+                checkouts=self._checkouts,
+                checkins=self._checkins,
+                waits=self._waits,
+                timeouts=self._timeouts,
+                failed_health_checks=self._failed_health_checks,
+                evicted=self._evicted,
+                in_use=self._size - len(self._idle),
+                idle=len(self._idle)
+            )
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
+    def open(self) -> BaseConnectionPool:
+        """
+        Opens connections until the pool holds *min_size* of them
+        """
+        while True:
+            with self._condition:
+                if self._is_closed:
+                    raise RuntimeError('Cannot open a closed pool')
+                if self._size >= self.min_size:
+                    return self
+                self._size += 1
+
+            connection: TypePooledConnection = self._create_reserved()
+            with self._condition:
+                self._idle.append(_PooledEntry(connection, time.monotonic()))
+                self._condition.notify()
+
+    @contextmanager
+    def borrow(self, timeout: float | None = None) -> Generator[TypePooledConnection, None, None]:
+        """
+        Borrows a connection for the duration of the ``with`` block:
+
+            with pool.borrow() as connection:
+                connection.execute_query(...)
+
+        :param timeout: Seconds to wait for a connection, defaults to *checkout_timeout*
+        """
+        connection: TypePooledConnection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def acquire(self, timeout: float | None = None) -> TypePooledConnection:
+        """
+        Takes a connection out of the pool. Prefer ``borrow()``; connections obtained here must be given back with
+        ``release()``.
+        :param timeout: Seconds to wait for a connection, defaults to *checkout_timeout*
+        :raise TimeoutError: When no connection became available in time
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline: float | None = None if timeout is None else time.monotonic() + timeout
+        has_waited: bool = False
+
+        while True:
+            entry: _PooledEntry | None = None
+            to_close: list[BaseConnection] = []
+            with self._condition:
+                while True:
+                    if self._is_closed:
+                        raise RuntimeError('Cannot borrow from a closed pool')
+
+                    to_close.extend(self._pop_expired())
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+
+                    if not has_waited:
+                        has_waited = True
+                        self._waits += 1
+
+                    remaining: float | None = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        raise TimeoutError(f'No connection available after {timeout} seconds (max_size = {self.max_size})')
+                    self._condition.wait(remaining)
+
+            self._close_connections(to_close)
+
+            if entry is None:
+                connection: TypePooledConnection = self._create_reserved()
+            elif self._check_entry(entry):
+                connection = entry.connection  # noqa
+            else:
+                continue
+
+            with self._condition:
+                self._checkouts += 1
+            return connection
+
+    def release(self, connection: TypePooledConnection):
+        """
+        Gives a connection back to the pool
+        """
+        with self._condition:
+            self._checkins += 1
+            if not self._is_closed:
+                self._idle.append(_PooledEntry(connection, time.monotonic()))
+                self._condition.notify()
+                return
+            self._size -= 1
+
+        self._close_connections([connection])
+
+    def evict_idle(self) -> int:
+        """
+        Closes the connections that have been idle for longer than *max_idle_time*. Eviction also happens on every
+        borrow, this method is meant for callers that want to reclaim sessions while the pool is not being used.
+        :return: The number of evicted connections
+        """
+        with self._condition:
+            expired: list[BaseConnection] = self._pop_expired()
+
+        self._close_connections(expired)
+        return len(expired)
+
+    def close(self):
+        """
+        Closes idle connections. Borrowed connections are closed when they are given back.
+        """
+        with self._condition:
+            self._is_closed = True
+            to_close: list[BaseConnection] = [entry.connection for entry in self._idle]
+            self._size -= len(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+
+        self._close_connections(to_close)
+
+    def _pop_expired(self) -> list[BaseConnection]:
+        """
+        Must be called with the lock held. Idle entries are ordered from the least to the most recently used.
+        """
+        if self.max_idle_time is None:
+            return []
+
+        now: float = time.monotonic()
+        expired: list[BaseConnection] = []
+        while self._idle and self._size > self.min_size and now - self._idle[0].last_used_at > self.max_idle_time:
+            expired.append(self._idle.popleft().connection)
+            self._size -= 1
+            self._evicted += 1
+
+        if expired:
+            LOGGER.debug('Evicted %d idle connection(s)', len(expired))
+        return expired
+
+    def _check_entry(self, entry: _PooledEntry) -> bool:
+        idle_time: float = time.monotonic() - entry.last_used_at
+        ping: bool = self.health_check_interval is not None and idle_time >= self.health_check_interval
+
+        try:
+            is_healthy: bool = self._is_healthy(entry.connection, ping=ping)  # noqa
+        except Exception as error:
+            LOGGER.warn('Health check raised: %s', error)
+            is_healthy = False
+
+        if is_healthy:
+            return True
+
+        LOGGER.warn('Discarding unhealthy connection')
+        with self._condition:
+            self._failed_health_checks += 1
+            self._size -= 1
+            self._condition.notify()
+
+        self._close_connections([entry.connection])
+        return False
+
+    def _create_reserved(self) -> TypePooledConnection:
+        """
+        Creates a connection for a slot already reserved in *_size*. The slot is freed if creation fails.
+        """
+        try:
+            connection: TypePooledConnection = self._make_connection()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._created += 1
+        return connection
+
+    def _close_connections(self, connections: list[BaseConnection]):
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception as error:
+                LOGGER.warn('Failed to close pooled connection: %s', error)
+
+        if connections:
+            with self._condition:
+                self._closed += len(connections)
+
+    def __enter__(self) -> BaseConnectionPool:
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any
-
-from empire_commons import list_util
+import heapq
+import itertools
+from collections.abc import Iterator
+from typing import Any, Callable, Generator
 
 
 class BaseQueryResult:
@@ -11,7 +12,8 @@ class BaseQueryResult:
     """
     __slots__ = (
         'error',
-        'results'
+        'results',
+        'parts'
     )
 
     def __init__(
@@ -21,6 +23,7 @@ class BaseQueryResult:
     ):
         self.error: str | None = error
         self.results: Any | None = results
+        self.parts: tuple[BaseQueryResult, ...] = ()
 
     @property
     def is_errored(self) -> bool:
@@ -29,18 +32,91 @@ class BaseQueryResult:
         """
         return self.error is not None
 
+    @property
+    def part_errors(self) -> list[str | None]:
+        """
+        Returns the error of each merged result, in order; for a result that was not merged, its own error
+        """
+        return [part.error for part in self.parts] if self.parts else [self.error]
+
+    def close(self):
+        """
+        Releases what lazy results hold (a cursor, a spill file) without consuming them. Results are unusable afterward.
+        """
+        close: Callable[[], Any] | None = getattr(self.results, 'close', None)
+        if callable(close):
+            close()
+        for part in self.parts:
+            part.close()
+
     @classmethod
-    def merge(cls, *others: BaseQueryResult) -> BaseQueryResult:
+    def merge(cls, *others: BaseQueryResult, key: Callable[[Any], Any] | None = None, reverse: bool = False) -> BaseQueryResult:
         """
-        Merges this result with other result(s)
+        Merges results into a single sequence of records. The merged results are kept in ``parts``.
+
+        Every result is read as records: the items of a list, the records of the batches (lists) yielded by generator
+        collectors or by ``iter_batches()`` (spilled records). Any other result, a scalar, a string, a single record or an
+        Arrow table, counts as one item. Records are concatenated into a list; as soon as one of the results is lazy (an
+        iterator, or spilled records), the merged records are lazy as well: the parts are chained and consumed one after
+        the other, without being held in memory together.
+
+        :param key: When provided, the records of the results, each already sorted by *key*, are merged lazily into a
+            single sorted stream (k-way merge)
+        :param reverse: Whether the results are sorted in descending order of *key*
         """
-        return BaseQueryResult(
-            ', '.join(filter(None, [result.error for result in others])),
-            list_util.merge_lists(*filter(None, [result.results for result in others]))
+        results: list[Any] = [result.results for result in others if result.results is not None]
+        merged_results: Any
+        if key is not None:
+            merged_results = heapq.merge(*(_iter_records(part) for part in results), key=key, reverse=reverse)
+        elif any(_is_lazy(part) for part in results):
+            merged_results = itertools.chain.from_iterable(_iter_records(part) for part in results)
+        else:
+            merged_results = cls._concatenate(results)
+
+        return cls._make_merged(
+            ', '.join(filter(None, [result.error for result in others])) or None,
+            merged_results,
+            others
         )
 
+    @classmethod
+    def _concatenate(cls, results: list[Any]) -> list[Any]:
+        """
+        Returns the records of eager *results*, in order
+        """
+        return [record for part in results for record in _iter_records(part)]
+
+    @classmethod
+    def _make_merged(cls, error: str | None, results: Any, parts: tuple[BaseQueryResult, ...]) -> BaseQueryResult:
+        merged: BaseQueryResult = BaseQueryResult(error, results)
+        merged.parts = parts
+        return merged
+
     def __repr__(self) -> str:
         return f'''BaseQueryResult(
     error={self.error},
     results={self.results}
 )'''
+
+
+def _is_lazy(results: Any) -> bool:
+    return isinstance(results, Iterator) or hasattr(results, 'iter_batches')
+
+
+def _iter_records(results: Any) -> Generator[Any, None, None]:
+    """
+    Iterates the records of a result, see ``BaseQueryResult.merge()``
+    """
+    if isinstance(results, list):
+        yield from results
+    elif hasattr(results, 'iter_batches'):
+        for batch in results.iter_batches():
+            yield from batch
+    elif isinstance(results, Iterator):
+        for item in results:
+            if isinstance(item, list):
+                yield from item
+            else:
+                yield item
+    else:
+        yield results
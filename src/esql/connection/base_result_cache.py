@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Final, Sequence
+
+_CACHEABLE_STATEMENT_REGEX: Final[re.Pattern] = re.compile(r'^\s*(SELECT|WITH|SHOW|DESC|DESCRIBE)\b', re.IGNORECASE)
+_SQL_TOKEN_REGEX: Final[re.Pattern] = re.compile(
+    r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"]|"")*"|\$\$.*?\$\$|(?P<blank>(?:--[^\n]*|/\*.*?\*/|\s+)+)|[^'"$\s/-]+|.""",
+    re.DOTALL
+)
+_IDENTIFIER_PATTERN: Final[str] = r'(?:"(?:[^"]|"")+"|[\w$]+)'
+_TABLE_REFERENCE_REGEX: Final[re.Pattern] = re.compile(
+    rf'\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+({_IDENTIFIER_PATTERN}(?:\s*\.\s*{_IDENTIFIER_PATTERN})*)',
+    re.IGNORECASE
+)
+_IDENTIFIER_REGEX: Final[re.Pattern] = re.compile(_IDENTIFIER_PATTERN)
+
+
+def is_cacheable_statement(query: str) -> bool:
+    """
+    Returns true for statements that only read (SELECT, WITH, SHOW, DESCRIBE), whose results can be cached
+    """
+    return _CACHEABLE_STATEMENT_REGEX.match(query) is not None
+
+
+def _normalize_token(match: re.Match) -> str:
+    token: str = match.group()
+    if match.lastgroup == 'blank':
+        return ' '
+    return token if token[0] in '\'"$' else token.upper()
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_statement(query: str) -> str:
+    """
+    Returns *query* without comments, with whitespace runs collapsed to a single space, in uppercase (unquoted identifiers
+    are case-insensitive) except for literals and quoted identifiers, and without trailing semicolons: two spellings of
+    the same statement normalize to the same text
+    """
+    return _SQL_TOKEN_REGEX.sub(_normalize_token, query).strip().rstrip(';').rstrip()
+
+
+def normalize_table_name(name: str) -> str:
+    """
+    Returns the last part of the qualified *name*, uppercase unless quoted
+    """
+    parts: list[str] = _IDENTIFIER_REGEX.findall(name)
+    last: str = parts[-1] if parts else name
+    return last[1:-1].replace('""', '"') if last.startswith('"') else last.upper()
+
+
+def get_referenced_tables(query: str) -> frozenset[str]:
+    """
+    Returns the (normalized) names of the tables and views following FROM, JOIN, INTO, UPDATE and TABLE in *query*.
+    Meant for invalidation: this is a lexical scan, it does not see the second table of ``FROM A, B``.
+    """
+    return frozenset(normalize_table_name(name) for name in _TABLE_REFERENCE_REGEX.findall(normalize_statement(query)))
+
+
+def make_cache_key(query: str, query_parameters: Sequence[Any], context: Sequence[Any]) -> str:
+    """
+    Returns a digest of the normalized *query*, its parameters and the *context* it runs in (role, warehouse, ...).
+    Parameters and context are keyed by their ``repr()``.
+    """
+    digest = hashlib.sha256(normalize_statement(query).encode())
+    digest.update(b'\0')
+    digest.update(repr(tuple(query_parameters)).encode())
+    digest.update(b'\0')
+    digest.update(repr(tuple(context)).encode())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResult:
+    """
+    A cached query result.
+
+    - query_id: ID of the query that produced the results
+    - results: The results, shared by every hit: do not modify them
+    - tables: Names of the tables the query read, see ``get_referenced_tables()``
+    - expires_at: Wall-clock time (``time.time()``) after which the entry is stale
+    """
+    query_id: str | None
+    results: Any
+    tables: frozenset[str]
+    expires_at: float
+
+
+class BaseResultCache(ABC):
+    """
+    Base class for query result caches. Entries are keyed by ``make_cache_key()`` and live for a per-entry TTL;
+    ``invalidate()`` drops the entries of the queries that read a table.
+
+    Every invalidation increments *generation*: read it before running a query and pass it to ``put()``, so results of a
+    query that was in flight during an invalidation are not stored. Only invalidations made through this object count,
+    not the ones other processes sharing the same storage make.
+
+    Subclasses store the entries: ``_load()``, ``_store()``, ``_discard()``, ``_invalidate()`` and ``_clear()`` must be
+    thread-safe.
+    """
+    __slots__ = (
+        'default_ttl',
+        'hit_count',
+        'miss_count',
+        'generation',
+        '_counters_lock',
+        '_generation_lock'
+    )
+
+    def __init__(self, default_ttl: float = 60.0):
+        """
+        :param default_ttl: Seconds an entry lives when ``put()`` is given no TTL
+        """
+        self.default_ttl: float = default_ttl
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+        self.generation: int = 0
+        self._counters_lock: threading.Lock = threading.Lock()
+        self._generation_lock: threading.Lock = threading.Lock()
+
+    @property
+    def hit_ratio(self) -> float:
+        lookup_count: int = self.hit_count + self.miss_count
+        return self.hit_count / lookup_count if lookup_count else 0.0
+
+    def get(self, key: str) -> CachedResult | None:
+        """
+        Returns the live entry of *key*, None when there is none or it expired
+        """
+        entry: CachedResult | None = self._load(key)
+        if entry is not None and entry.expires_at <= time.time():
+            self._discard(key)
+            entry = None
+
+        with self._counters_lock:
+            if entry is None:
+                self.miss_count += 1
+            else:
+                self.hit_count += 1
+        return entry
+
+    def put(
+            self,
+            key: str,
+            query_id: str | None,
+            results: Any,
+            tables: frozenset[str],
+            ttl: float | None = None,
+            generation: int | None = None
+    ) -> bool:
+        """
+        Caches *results* under *key* for *ttl* seconds (defaults to *default_ttl*)
+        :param generation: The *generation* read before running the query; when entries were invalidated since, the
+            results may be stale and are not stored
+        :return: True when the entry was stored
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return False
+        with self._generation_lock:
+            if generation is not None and generation != self.generation:
+                return False
+            return self._store(key, CachedResult(query_id, results, tables, time.time() + ttl))
+
+    def invalidate_statement(self, query: str) -> int:
+        """
+        Drops the entries of the queries reading a table *query* refers to
+        :return: The number of entries dropped
+        """
+        return sum(self.invalidate(table) for table in get_referenced_tables(query))
+
+    def invalidate(self, table: str) -> int:
+        """
+        Drops the entries of the queries reading *table* (qualified or not)
+        :return: The number of entries dropped
+        """
+        with self._generation_lock:
+            self.generation += 1
+            return self._invalidate(table)
+
+    def clear(self):
+        with self._generation_lock:
+            self.generation += 1
+            self._clear()
+
+    @abstractmethod
+    def _invalidate(self, table: str) -> int:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _clear(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _load(self, key: str) -> CachedResult | None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _store(self, key: str, entry: CachedResult) -> bool:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _discard(self, key: str):
+        raise NotImplementedError()
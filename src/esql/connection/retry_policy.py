@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import random
+import re
+from dataclasses import dataclass
+from typing import Final
+
+_IDEMPOTENT_STATEMENT_REGEX: Final[re.Pattern] = re.compile(r'^\s*(SHOW|DESC|DESCRIBE|LIST|LS|EXPLAIN)\b', re.IGNORECASE)
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    How many times, and how far apart, a failed statement is attempted again.
+
+    Delays follow an exponential backoff with "full jitter": attempt N waits a random duration between 0 and
+    ``min(max_delay, base_delay * 2 ** N)``, so clients failing at the same time do not retry at the same time.
+
+    - max_attempts: Total number of attempts, including the first one. 1 disables retrying.
+    - base_delay: Upper bound, in seconds, of the first delay
+    - max_delay: Upper bound, in seconds, of any delay
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Returns the number of seconds to wait after the failed attempt number *attempt* (0-based)
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def can_retry(self, attempt: int) -> bool:
+        """
+        Returns true when the failed attempt number *attempt* (0-based) can be followed by another one
+        """
+        return attempt + 1 < self.max_attempts
+
+
+NO_RETRY: Final[RetryPolicy] = RetryPolicy(max_attempts=1)
+
+
+def is_idempotent_statement(query: str) -> bool:
+    """
+    Returns true for statements that only read metadata (SHOW, DESCRIBE, LIST, EXPLAIN) and can be sent again safely.
+    """
+    return _IDEMPOTENT_STATEMENT_REGEX.match(query) is not None
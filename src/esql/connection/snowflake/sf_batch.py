@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Generator, Iterable, Sequence
+
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+
+_VALUE_OVERHEAD_BYTES: int = 8
+
+
+@dataclass(frozen=True, slots=True)
+class SFBatchChunk:
+    """
+    Report of a single ``executemany()`` call
+
+    - index: Position of the chunk in the batch
+    - row_count: Number of rows sent
+    - byte_count: Estimated payload size, in bytes
+    - elapsed: Wall time of the call, in seconds
+    - affected_rows: Number of rows reported by Snowflake as affected
+    - query_id: Snowflake query ID
+    - error: Error message, when the chunk failed
+    """
+    index: int
+    row_count: int
+    byte_count: int
+    elapsed: float
+    affected_rows: int | None
+    query_id: str | None
+    error: str | None = None
+
+
+class SFBatchResult(SFQueryResult):
+    """
+    Result of :meth:`esql.connection.snowflake.sf_connection.SFConnection.execute_batch`. *results* holds the total number of
+    affected rows and *query_id* the ID of the last chunk.
+    """
+    __slots__ = (
+        'chunks',
+    )
+
+    def __init__(self, chunks: list[SFBatchChunk]):
+        super().__init__(
+            query_id=chunks[-1].query_id if chunks else None,
+            error_message=', '.join(filter(None, [chunk.error for chunk in chunks])) or None,
+            results=sum(chunk.affected_rows or 0 for chunk in chunks)
+        )
+        self.chunks: list[SFBatchChunk] = chunks
+
+    @property
+    def query_ids(self) -> list[str | None]:
+        return [chunk.query_id for chunk in self.chunks]
+
+    @property
+    def row_count(self) -> int:
+        """
+        Number of rows sent to Snowflake
+        """
+        return sum(chunk.row_count for chunk in self.chunks)
+
+    @property
+    def elapsed(self) -> float:
+        return sum(chunk.elapsed for chunk in self.chunks)
+
+    def __repr__(self) -> str:
+        return f'''SFBatchResult(
+    query_id={self.query_id},
+    error={self.error},
+    results={self.results},
+    chunks={len(self.chunks)}
+)'''
+
+
+def estimate_row_size(row: Sequence[Any]) -> int:
+    """
+    Cheap estimation of the bound size of *row*: length of strings and bytes, a fixed size for everything else.
+    """
+    size: int = 0
+    for value in row:
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value) + _VALUE_OVERHEAD_BYTES
+        else:
+            size += _VALUE_OVERHEAD_BYTES
+    return size
+
+
+def iter_row_chunks(
+        rows: Iterable[Sequence[Any]],
+        chunk_rows: int,
+        chunk_bytes: int | None
+) -> Generator[tuple[list[Sequence[Any]], int], None, None]:
+    """
+    Splits *rows* into chunks of at most *chunk_rows* rows and, when provided, about *chunk_bytes* bytes. A single row
+    larger than *chunk_bytes* makes a chunk on its own.
+    :return: A generator of ``(rows, estimated byte count)`` tuples
+    """
+    if chunk_rows < 1:
+        raise ValueError(f'chunk_rows must be at least 1, got {chunk_rows}')
+
+    chunk: list[Sequence[Any]] = []
+    chunk_size: int = 0
+    for row in rows:
+        row_size: int = estimate_row_size(row)
+        if chunk and (len(chunk) >= chunk_rows or (chunk_bytes is not None and chunk_size + row_size > chunk_bytes)):
+            yield chunk, chunk_size
+            chunk = []
+            chunk_size = 0
+
+        chunk.append(row)
+        chunk_size += row_size
+
+    if chunk:
+        yield chunk, chunk_size
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import snowflake.connector.constants as sf_constants
+
+from esql.sql_.adapters.snowflake.snowflake_data_types import SnowflakeDataTypes
+
+
+@dataclass(frozen=True, slots=True)
+class SFColumn:
+    """
+    A column of a query result, as described by the cursor
+
+    - name: Name of the column
+    - data_type: Type of the values. ``NUMBER`` columns with a scale are reported as FLOAT.
+    - type_name: Connector type name (``FIXED``, ``TEXT``, ``TIMESTAMP_NTZ``, ...)
+    - scale: Number of digits after the decimal point, for ``NUMBER`` columns
+    - is_nullable: Whether the column can hold NULL
+    """
+    name: str
+    data_type: SnowflakeDataTypes
+    type_name: str
+    scale: int | None = None
+    is_nullable: bool = True
+
+    @staticmethod
+    def from_metadata(metadata: Any) -> SFColumn:
+        """
+        Builds a column from an entry of ``cursor.description`` (``ResultMetadata`` or DB-API 7-tuple)
+        """
+        name, type_code, _, _, _, scale, is_nullable = metadata[:7]
+        type_name: str = sf_constants.FIELD_ID_TO_NAME[type_code]
+
+        data_type: SnowflakeDataTypes
+        if type_name == 'FIXED' and scale:
+            data_type = SnowflakeDataTypes.FLOAT
+        else:
+            try:
+                data_type = SnowflakeDataTypes.parse(type_name)
+            except ValueError:  # GEOGRAPHY, GEOMETRY, ...: returned as text
+                data_type = SnowflakeDataTypes.STRING
+
+        return SFColumn(name, data_type, type_name, scale, bool(is_nullable))
+
+
+def get_columns(description: Sequence[Any] | None) -> list[SFColumn]:
+    """
+    Returns the columns of a result from its cursor ``description``
+    """
+    return [SFColumn.from_metadata(metadata) for metadata in description or []]
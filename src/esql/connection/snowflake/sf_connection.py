@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any, Callable, Generator
+from types import GeneratorType
+from typing import Any, Callable, Final, Generator, Iterable, Sequence
 
 import ereport
 from empire_commons.types_ import JsonType, JsonListType
@@ -14,19 +21,66 @@ from snowflake.connector.network import SnowflakeRestful
 
 from esql._internal.ref import REPORTER_NAME, LOGGING_LEVEL_ENV_VAR_NAME
 from esql.connection.base_connection import BaseConnection
+from esql.connection.base_result_cache import BaseResultCache, CachedResult, get_referenced_tables, is_cacheable_statement, make_cache_key
+from esql.connection.retry_policy import RetryPolicy, is_idempotent_statement
+from esql.connection.snowflake.sf_batch import SFBatchChunk, SFBatchResult, iter_row_chunks
 from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
 from esql.connection.snowflake.sf_query_result import SFQueryResult
+from esql.connection.snowflake.sf_query_statistics import SFQueryStatistics
+from esql.connection.snowflake.sf_result_cache import describe_collector
+from esql.connection.snowflake.sf_session_context import SFSessionContext, format_exact_identifier
+from esql.connection.snowflake.sf_show_paginator import SFShowPaginator
+from esql.connection.snowflake.sf_transaction import SFTransaction
+from esql.connection.snowflake.sf_warehouses import SFWarehouses
 from esql.connection.snowflake.error_interpreter import interpret_programming_error
+from esql.exceptions import SessionContextLostException
+from esql.sql_.adapters.snowflake.snowflake_listers import SnowflakeListers
 
 
 LOGGER = ereport.get_or_make_reporter(REPORTER_NAME, LOGGING_LEVEL_ENV_VAR_NAME)
 
+_SESSION_LOST_ERROR_CODES: Final[frozenset[int]] = frozenset({
+    250002,  # Connection is closed
+    390111,  # Session no longer exists
+    390112,  # Session expired
+    390114,  # Authentication token expired
+})
+_SESSION_STATEMENT_REGEX: Final[re.Pattern] = re.compile(r'(?:^|;)\s*(USE|ALTER\s+SESSION)\b', re.IGNORECASE)
+_QUERY_HISTORY_STATEMENT: Final[str] = """SELECT COMPILATION_TIME, EXECUTION_TIME, QUEUED_PROVISIONING_TIME, QUEUED_OVERLOAD_TIME, BYTES_SCANNED, WAREHOUSE_NAME
+FROM TABLE({database}.INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION(RESULT_LIMIT => 10000))
+WHERE QUERY_ID = '{query_id}'"""
+_QUERY_ID_REGEX: Final[re.Pattern] = re.compile(r'[0-9a-fA-F-]+')
+_TRANSIENT_ERRORS: Final[tuple[type[Exception], ...]] = (
+    sf.errors.OperationalError,
+    sf.errors.InterfaceError,
+    sf.errors.ServiceUnavailableError,
+    sf.errors.GatewayTimeoutError,
+    sf.errors.RequestTimeoutError,
+    sf.errors.OtherHTTPRetryableError
+)
+
 
 class SFConnection(BaseConnection[sf, SFQueryResult]):
     __slots__ = (
         'warehouse',
         'region',
-        'role'
+        'role',
+        'async_io_workers',
+        'paramstyle',
+        'persistent_cursors',
+        'auto_reconnect',
+        'retry_policy',
+        'client_session_keep_alive',
+        'keep_alive_heartbeat_frequency',
+        'result_cache',
+        '_io_executor',
+        '_idle_cursors',
+        '_persistent_cursors',
+        '_cursors_lock',
+        '_streaming_cursors',
+        '_reconnect_lock',
+        '_session_context',
+        '_session_lock'
     )
 
     def __init__(
@@ -37,17 +91,85 @@ class SFConnection(BaseConnection[sf, SFQueryResult]):
             warehouse: str | None = None,
             database: str | None = None,
             region: str | None = None,
-            role: str | None = None
+            role: str | None = None,
+            *,
+            async_io_workers: int = 8,
+            paramstyle: str | None = None,
+            persistent_cursors: bool = False,
+            auto_reconnect: bool = True,
+            retry_policy: RetryPolicy = RetryPolicy(),
+            client_session_keep_alive: bool = False,
+            keep_alive_heartbeat_frequency: int | None = None,
+            result_cache: BaseResultCache | None = None
     ):
+        """
+        :param async_io_workers: Number of threads shared by all the ``execute_query_async()`` calls of this connection to
+            submit queries, poll their status and fetch their results. The wait itself does not hold any thread.
+        :param paramstyle: Connector parameter style. With ``qmark`` or ``numeric``, parameters are bound server-side, which
+            lets ``execute_batch()`` use array binding. Defaults to the connector's (``pyformat``, bound client-side).
+        :param persistent_cursors: When true, ``get_cursor()`` keeps the cursors it opens in a pool, per cursor class, and
+            lends an idle one to each query instead of opening and closing a cursor every time. The pool holds as many
+            cursors as queries ran at the same time, whichever threads ran them. Results still being consumed lazily
+            (generator collectors) keep their cursor to themselves.
+        :param auto_reconnect: When true, a query failing because the session expired or the connection was lost makes
+            the connection log in again, restore the session context (see ``session_context``) and send the query again.
+        :param retry_policy: Number of attempts and delays for ``execute_query()``. Transient failures are only retried for
+            idempotent statements, see ``execute_query()``.
+        :param client_session_keep_alive: When true, the connector sends heartbeats so the session does not expire while
+            the connection is idle.
+        :param keep_alive_heartbeat_frequency: Seconds between two heartbeats, defaults to the connector's (one hour)
+        :param result_cache: When provided, results of read-only statements run through ``execute_query()`` are cached
+            there, keyed by the normalized statement, its parameters, the collector, the account and user, and the role,
+            warehouse, database and schema of the session. Collectors declared ``uncacheable()`` (streaming, spilling,
+            Arrow) bypass it. Other statements, whichever method sends them (scripts, batches, transactions, asynchronous
+            queries), invalidate the entries of the tables they refer to. See
+            :class:`esql.connection.snowflake.sf_result_cache.SFResultCache` (in memory) and
+            :class:`esql.connection.snowflake.sf_disk_result_cache.SFDiskResultCache` (shared by the processes of a host).
+        """
         super().__init__(user, password, account, database)
         self.warehouse: str | None = warehouse
         self.region: str | None = region
         self.role: str | None = role
+        self.async_io_workers: int = async_io_workers
+        self.paramstyle: str | None = paramstyle
+        self.persistent_cursors: bool = persistent_cursors
+        self.auto_reconnect: bool = auto_reconnect
+        self.retry_policy: RetryPolicy = retry_policy
+        self.client_session_keep_alive: bool = client_session_keep_alive
+        self.keep_alive_heartbeat_frequency: int | None = keep_alive_heartbeat_frequency
+        self.result_cache: BaseResultCache | None = result_cache
+        self._io_executor: ThreadPoolExecutor | None = None
+        self._idle_cursors: dict[type, list[sf_cursor.SnowflakeCursor]] = {}
+        self._persistent_cursors: list[sf_cursor.SnowflakeCursor] = []
+        self._cursors_lock: threading.Lock = threading.Lock()
+        self._streaming_cursors: weakref.WeakSet[sf_cursor.SnowflakeCursor] = weakref.WeakSet()
+        self._reconnect_lock: threading.Lock = threading.Lock()
+        self._session_context: SFSessionContext | None = None
+        self._session_lock: threading.RLock = threading.RLock()
 
     @property
     def snowflake_api(self) -> SnowflakeRestful:
         return self._connection.rest
 
+    @property
+    def is_connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    def ping(self) -> bool:
+        """
+        Makes a round trip to Snowflake and returns true when the session answered
+        """
+        if not self.is_connected:
+            return False
+
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute('SELECT 1')
+                return True
+        except sf.errors.Error as error:
+            LOGGER.warn('Ping failed: %s', error)
+            return False
+
     def commit(self):
         self._connection.commit()
 
@@ -55,14 +177,67 @@ class SFConnection(BaseConnection[sf, SFQueryResult]):
         self._connection.rollback()
 
     @contextmanager
-    def get_cursor(self):
-        logging.getLogger('snowflake.connector.cursor').setLevel(logging.ERROR)
-        cursor: sf.DictCursor | None = None
+    def transaction(self, *, buffer_dml: bool = True, flush_size: int = 100, verbose: bool = False) -> Generator[SFTransaction, None, None]:
+        """
+        Runs the statements of the block in a single transaction, committed when the block exits and rolled back when it
+        raises:
+
+            with connection.transaction() as transaction:
+                transaction.execute('INSERT INTO T VALUES (?)', 1)
+                transaction.execute('UPDATE U SET A = ?', 2)
+
+        With *buffer_dml*, DML statements are deferred and sent together with ``BEGIN`` and ``COMMIT``; see
+        :class:`esql.connection.snowflake.sf_transaction.SFTransaction`.
+        """
+        transaction: SFTransaction = SFTransaction(self, buffer_dml=buffer_dml, flush_size=flush_size, verbose=verbose)
         try:
-            cursor = self._connection.cursor(sf.DictCursor)  # noqa
+            yield transaction
+        except BaseException:
+            transaction.rollback()
+            raise
+        transaction.commit()
+
+    def paginate_show(
+            self,
+            lister: Callable[..., str],
+            *,
+            page_size: int = 1000,
+            prefetch: bool = True,
+            verbose: bool = False,
+            **lister_parameters: Any
+    ) -> SFShowPaginator:
+        """
+        Iterates over the rows of a SHOW command, fetched *page_size* rows at a time:
+
+            for schema in connection.paginate_show(SnowflakeListers.list_schemas, in_database='DB'):
+                ...
+
+        See :class:`esql.connection.snowflake.sf_show_paginator.SFShowPaginator`.
+        :param lister: A ``SnowflakeListers`` method accepting *limit* and *limit_filter*
+        :param lister_parameters: Other parameters of *lister*
+        """
+        return SFShowPaginator(self, lister, page_size=page_size, prefetch=prefetch, verbose=verbose, **lister_parameters)
+
+    @contextmanager
+    def get_cursor(self, cursor_class: type[sf_cursor.SnowflakeCursor] = sf.DictCursor):
+        """
+        Returns a cursor of class *cursor_class*. With *persistent_cursors*, the cursor is an idle one of the pool and goes
+        back to it, open, afterward. Cursors a lazy result still reads from stay open until the result is exhausted.
+        """
+        if self.persistent_cursors:
+            cursor: sf_cursor.SnowflakeCursor = self._acquire_persistent_cursor(cursor_class)
+            try:
+                yield cursor
+            finally:
+                self._release_persistent_cursor(cursor_class, cursor)
+            return
+
+        cursor: sf_cursor.SnowflakeCursor | None = None
+        try:
+            cursor = self._connection.cursor(cursor_class)  # noqa
             yield cursor
         finally:
-            if cursor:
+            if cursor and cursor not in self._streaming_cursors:
                 cursor.close()
 
     def execute_query(
@@ -73,45 +248,637 @@ class SFConnection(BaseConnection[sf, SFQueryResult]):
             # TODO: set default value for collector_method to None, set its actual default value in method
             collector_method: Callable[[Any, int], JsonType | JsonListType | Generator[JsonType, Any, None]] = SFQueryCollectors.gather_all_records,
             batch_size: int = 1,
-            verbose: bool = True
+            verbose: bool = True,
+            idempotent: bool | None = None,
+            cache_ttl: float | None = None
     ):
+        """
+        Executes the provided query.
+
+        When the session expired or the connection was lost, and *auto_reconnect* is true, the connection logs in again,
+        moves the new session to the role, warehouse, database, schema and session parameters of the lost one, and the
+        query is sent again: Snowflake refused it, so it did not run. Other transient failures (network, service
+        unavailable) are retried according to *retry_policy* only when the statement is idempotent.
+
+        :param query: The query
+        :param query_parameters: The query parameters
+        :param query_name: The query name (for logging purposes)
+        :param collector_method: The collector method
+        :param batch_size: Batch size, passed to collector method
+        :param verbose: When true, emits logs of executing query and success.
+        :param idempotent: Whether the query can safely run more than once. When None, SHOW, DESCRIBE, LIST and EXPLAIN
+            statements are considered idempotent.
+        :param cache_ttl: Seconds the results stay in *result_cache*, defaults to the cache's. 0 bypasses the cache.
+        :return: A result object. Results served from *result_cache* are shared with the other hits: do not modify them.
+        """
         if not query:
             ereport.warn('No query provided')
             return SFQueryResult(None, None, None)
 
-        with self.get_cursor() as cursor:
+        if idempotent is None:
+            idempotent = is_idempotent_statement(query)
+
+        cache_key: str | None = None
+        generation: int = 0
+        with self._tracking_statement(query):
+            if self._is_cache_used(query, collector_method, cache_ttl):
+                cache_key = self._make_cache_key(query, query_parameters, collector_method, batch_size)
+                generation = self.result_cache.generation
+                cached: CachedResult | None = self.result_cache.get(cache_key)
+                if cached is not None:
+                    return SFQueryResult(query_id=cached.query_id, error_message=None, results=cached.results)
+
+            result: SFQueryResult = self._execute_query_with_retries(
+                query, query_parameters, query_name, collector_method, batch_size, verbose, idempotent
+            )
+
+        if cache_key is not None and not result.is_errored:
+            self.result_cache.put(cache_key, result.query_id, result.results, get_referenced_tables(query), cache_ttl, generation)
+        return result
+
+    def _is_cache_used(self, query: str, collector_method: Callable[[Any, int], Any], cache_ttl: float | None) -> bool:
+        """
+        Returns true when the results of *query* are looked up in and stored to *result_cache*
+        """
+        return (
+            self.result_cache is not None and (cache_ttl is None or cache_ttl > 0)
+            and is_cacheable_statement(query) and SFQueryCollectors.is_cacheable(collector_method)
+        )
+
+    def _execute_query_with_retries(
+            self,
+            query: str,
+            query_parameters: tuple[Any, ...],
+            query_name: str | None,
+            collector_method: Callable[[Any, int], JsonType | JsonListType | Generator[JsonType, Any, None]],
+            batch_size: int,
+            verbose: bool,
+            idempotent: bool
+    ) -> SFQueryResult:
+        """
+        Runs ``_execute_query_once()``, reconnecting and retrying according to *auto_reconnect* and *retry_policy*, see
+        ``execute_query()``
+        """
+        attempt: int = 0
+        while True:
+            connection: sf.SnowflakeConnection = self._connection
+            try:
+                result: SFQueryResult = self._execute_query_once(query, query_parameters, query_name, collector_method, batch_size, verbose)
+            except sf.errors.Error as error:
+                is_session_lost: bool = self._is_session_lost(error)
+                if not self.retry_policy.can_retry(attempt) or not (
+                        (is_session_lost and self.auto_reconnect) or (idempotent and isinstance(error, _TRANSIENT_ERRORS))
+                ):
+                    raise
+
+                delay: float = self.retry_policy.get_delay(attempt)
+                LOGGER.warn('Query failed (attempt %d / %d): %s. Retrying in %.2fs', attempt + 1, self.retry_policy.max_attempts, error, delay)
+                if is_session_lost:
+                    self._reconnect_from(connection)
+                time.sleep(delay)
+                attempt += 1
+            else:
+                return result
+
+    def _make_cache_key(
+            self,
+            query: str,
+            query_parameters: Sequence[Any],
+            collector_method: Callable[[Any, int], Any],
+            batch_size: int
+    ) -> str:
+        # The connector's own role, warehouse, database and schema follow every statement of the session, whichever
+        # method sent it, unlike the tracked session context. Account and user tell apart the connections sharing a cache.
+        connection: sf.SnowflakeConnection = self._connection
+        return make_cache_key(
+            query,
+            query_parameters,
+            (
+                self.host, self.user, connection.role, connection.warehouse, connection.database, connection.schema,
+                describe_collector(collector_method), batch_size
+            )
+        )
+
+    def _execute_query_once(
+            self,
+            query: str,
+            query_parameters: tuple[Any, ...],
+            query_name: str | None,
+            collector_method: Callable[[Any, int], JsonType | JsonListType | Generator[JsonType, Any, None]],
+            batch_size: int,
+            verbose: bool
+    ) -> SFQueryResult:
+        with self.get_cursor(SFQueryCollectors.get_cursor_class(collector_method)) as cursor:
             if verbose:
-                if query_name:
-                    LOGGER.info('Executing query: %s...', query_name)
-                else:
-                    LOGGER.info('Executing query: %s', query.replace('\n', ' ').replace('\t', ' ').replace('  ', ' ')[:500] if query else None)
+                self._log_execution_start(query, query_name)
 
+            started_at: float = time.perf_counter()
             try:
                 cursor.execute(query, query_parameters)
             except sf.errors.ProgrammingError as e:
+                if self._is_session_lost(e):
+                    raise
+
                 interpret_programming_error(query, e)
                 return SFQueryResult(
                     query_id=e.sfqid,
                     error_message=e.msg,
                     results=None
                 )
+            statistics: SFQueryStatistics = self._make_statistics(cursor, time.perf_counter() - started_at)
 
             if verbose:
-                if query_name:
-                    LOGGER.success('Successfully executed query %s', query_name)
-                else:
-                    LOGGER.success('Successfully executed query.')
+                self._log_execution_success(query_name)
+
+            results: Any = statistics.run_collector(collector_method, cursor, batch_size)
+            if isinstance(results, GeneratorType):
+                results = self._stream_from_cursor(cursor, statistics.follow(results))
 
             return SFQueryResult(
                 query_id=cursor.sfqid,
                 error_message=', '.join(cursor.messages) if cursor.messages else None,
-                results=collector_method(cursor, batch_size)
+                results=results,
+                statistics=statistics
             )
 
+    def execute_script(
+            self,
+            statements: Sequence[str] | str,
+            *query_parameters: Any,
+            query_name: str | None = None,
+            collector_method: Callable[[Any, int], JsonType | JsonListType | Generator[JsonType, Any, None]] = SFQueryCollectors.gather_all_records,
+            batch_size: int = 1,
+            verbose: bool = True
+    ) -> list[SFQueryResult]:
+        """
+        Sends several statements in a single request (``MULTI_STATEMENT_COUNT``) and collects the result of each one:
+
+            connection.execute_script([
+                'CREATE TABLE IF NOT EXISTS T (A INT)',
+                'INSERT INTO T VALUES (1)',
+                'SELECT COUNT(*) FROM T'
+            ])
+
+        Snowflake runs the statements in order and stops at the first failure; the failed statement is then the last
+        result and holds the error. Results are collected eagerly, generator collectors are drained.
+
+        :param statements: The statements, or a script of ``;``-separated statements
+        :param query_parameters: The parameters of all the statements, in order
+        :param query_name: The script name (for logging purposes)
+        :param collector_method: The collector method, applied to every statement
+        :param batch_size: Batch size, passed to collector method
+        :param verbose: When true, emits logs of executing query and success.
+        :return: One result per executed statement, each with its own query ID
+        """
+        if isinstance(statements, str):
+            query: str = statements
+            statement_count: int = 0  # Let Snowflake count them
+        else:
+            statements = [statement.strip().rstrip(';') for statement in statements if statement and statement.strip()]
+            query = ';\n'.join(statements)
+            statement_count = len(statements)
+
+        if not query.strip():
+            ereport.warn('No query provided')
+            return []
+
+        results: list[SFQueryResult] = []
+        with self._tracking_statement(query, is_script=True), self.get_cursor(SFQueryCollectors.get_cursor_class(collector_method)) as cursor:
+            if verbose:
+                self._log_execution_start(query, query_name)
+
+            try:
+                started_at: float = time.perf_counter()
+                cursor.execute(query, query_parameters, num_statements=statement_count)
+                while True:
+                    statistics: SFQueryStatistics = self._make_statistics(cursor, time.perf_counter() - started_at)
+                    statement_results: Any = statistics.run_collector(collector_method, cursor, batch_size)
+                    if isinstance(statement_results, GeneratorType):
+                        statement_results = list(statistics.follow(statement_results))
+
+                    results.append(SFQueryResult(
+                        query_id=cursor.sfqid,
+                        error_message=', '.join(cursor.messages) if cursor.messages else None,
+                        results=statement_results,
+                        statistics=statistics
+                    ))
+                    started_at = time.perf_counter()
+                    if not cursor.nextset():
+                        break
+            except sf.errors.ProgrammingError as e:
+                interpret_programming_error(query, e)
+                results.append(SFQueryResult(
+                    query_id=e.sfqid,
+                    error_message=e.msg,
+                    results=None
+                ))
+                return results
+
+        if verbose:
+            self._log_execution_success(query_name)
+        return results
+
+    @property
+    def session_context(self) -> SFSessionContext:
+        """
+        Returns the tracked context of the session. Role, warehouse, database and schema are seeded from the connector
+        on first access; session parameters are seeded from ``SHOW PARAMETERS IN SESSION`` the first time they are changed.
+        Running ``USE`` or ``ALTER SESSION`` through any ``execute_*()`` method drops the tracked context.
+        """
+        with self._session_lock:
+            if self._session_context is None:
+                self._session_context = SFSessionContext(
+                    role=self._connection.role,
+                    warehouse=self._connection.warehouse,
+                    database=self._connection.database,
+                    schema=self._connection.schema
+                )
+            return self._session_context
+
+    def set_session_context(
+            self,
+            *,
+            role: str | None = None,
+            warehouse: SFWarehouses | str | None = None,
+            database: str | None = None,
+            schema: str | None = None,
+            parameters: dict[str, Any] | None = None,
+            verbose: bool = False
+    ) -> SFQueryResult:
+        """
+        Moves the session to the requested context. Arguments equal to the tracked context are skipped and the remaining
+        changes are sent together, in a single round trip:
+
+            connection.set_session_context(role='ANALYST', warehouse='WH_SMALL', parameters={'QUERY_TAG': 'nightly'})
+
+        :param role: Role to use
+        :param warehouse: Warehouse to use
+        :param database: Database to use
+        :param schema: Schema to use, in *database* if provided, otherwise in the current database
+        :param parameters: Session parameters to set
+        :param verbose: When true, emits logs of executing query and success.
+        :return: A result whose *results* are the statements that were sent (empty when nothing changed)
+        """
+        warehouse = getattr(warehouse, 'value', warehouse)
+
+        with self._session_lock:
+            context: SFSessionContext = self.session_context
+            if parameters and context.parameters is None:
+                context.parameters = self._fetch_session_parameters()
+
+            statements: list[str] = context.plan(role=role, warehouse=warehouse, database=database, schema=schema, parameters=parameters)
+            if not statements:
+                return SFQueryResult(None, None, [])
+
+            query: str = ';\n'.join(statements)
+            with self.get_cursor(sf_cursor.SnowflakeCursor) as cursor:
+                if verbose:
+                    self._log_execution_start(query, None)
+                try:
+                    cursor.execute(query, num_statements=len(statements))
+                except sf.errors.ProgrammingError as e:
+                    interpret_programming_error(query, e)
+                    self._session_context = None
+                    return SFQueryResult(e.sfqid, e.msg, statements)
+
+            context.apply(role=role, warehouse=warehouse, database=database, schema=schema, parameters=parameters)
+            if verbose:
+                self._log_execution_success(None)
+            return SFQueryResult(cursor.sfqid, None, statements)
+
+    @contextmanager
+    def _tracking_statement(self, query: str, *, is_script: bool = False) -> Generator[None, None, None]:
+        """
+        Keeps the tracked session context and *result_cache* in line with *query*, sent within the block: drops the
+        tracked context when *query* may change it and, unless *query* only reads, the cached results of the tables it
+        refers to, before it is sent and again once it ran, since reads running meanwhile may cache what it replaced.
+        Scripts are never taken as read-only.
+        """
+        if self._session_context is not None and _SESSION_STATEMENT_REGEX.search(query):
+            self._session_context = None
+        is_write: bool = self.result_cache is not None and (is_script or not is_cacheable_statement(query))
+        if is_write:
+            self.result_cache.invalidate_statement(query)
+        try:
+            yield
+        finally:
+            if is_write:
+                self.result_cache.invalidate_statement(query)
+
+    def _fetch_session_parameters(self) -> dict[str, str]:
+        with self.get_cursor() as cursor:
+            cursor.execute(SnowflakeListers.list_parameters(in_session=True))
+            return {row['key'].upper(): row['value'] for row in cursor.fetchall()}
+
+    def execute_batch(
+            self,
+            query: str,
+            rows: Iterable[Sequence[Any]],
+            *,
+            chunk_rows: int = 16_384,
+            chunk_bytes: int | None = 8 * 1024 * 1024,
+            query_name: str | None = None,
+            stop_on_error: bool = True,
+            verbose: bool = True
+    ) -> SFBatchResult:
+        """
+        Executes *query* once per row of *rows* with ``executemany()``, chunk by chunk. With a server-side *paramstyle*
+        (``qmark``/``numeric``), Snowflake binds each chunk as arrays, so values are neither escaped nor rendered into the
+        query text:
+
+            connection.execute_batch('INSERT INTO T (A, B) VALUES (?, ?)', rows)
+
+        With the connector's default (``pyformat``), the connector renders every row into the query text instead; a
+        warning is logged, since that defeats the purpose of batching.
+
+        :param query: The parametrized query, using the connection's *paramstyle*
+        :param rows: The parameters of each execution. Consumed lazily, one chunk at a time.
+        :param chunk_rows: Maximum number of rows per chunk
+        :param chunk_bytes: Approximate maximum payload per chunk, in bytes. None disables the limit.
+        :param query_name: The query name (for logging purposes)
+        :param stop_on_error: When true, stops at the first failed chunk
+        :param verbose: When true, emits logs of executing query and success.
+        :return: A result holding a report per chunk
+        """
+        chunks: list[SFBatchChunk] = []
+        if self._connection.is_pyformat:
+            LOGGER.warn(
+                'execute_batch() runs with client-side binding: the rows are rendered into the query text. '
+                'Connect with paramstyle="qmark" or "numeric" for server-side array binding.'
+            )
+
+        with self._tracking_statement(query), self.get_cursor() as cursor:
+            if verbose:
+                self._log_execution_start(query, query_name)
+
+            for index, (chunk, byte_count) in enumerate(iter_row_chunks(rows, chunk_rows, chunk_bytes)):
+                start: float = time.perf_counter()
+                try:
+                    cursor.executemany(query, chunk)
+                except sf.errors.ProgrammingError as e:
+                    interpret_programming_error(query, e)
+                    chunks.append(SFBatchChunk(index, len(chunk), byte_count, time.perf_counter() - start, None, e.sfqid, e.msg))
+                    if stop_on_error:
+                        break
+                    continue
+
+                chunks.append(SFBatchChunk(index, len(chunk), byte_count, time.perf_counter() - start, cursor.rowcount, cursor.sfqid))
+                LOGGER.debug('Batch chunk %d: %d rows, ~%d bytes in %.3fs', index, len(chunk), byte_count, chunks[-1].elapsed)
+
+        result: SFBatchResult = SFBatchResult(chunks)
+        if verbose and not result.is_errored:
+            self._log_execution_success(query_name)
+        return result
+
+    async def execute_query_async(
+            self,
+            query: str,
+            *query_parameters: Any,
+            query_name: str | None = None,
+            collector_method: Callable[[Any, int], JsonType | JsonListType | Generator[JsonType, Any, None]] = None,
+            batch_size: int = 1,
+            verbose: bool = True,
+            poll_interval: float = 0.05,
+            max_poll_interval: float = 2.0
+    ) -> SFQueryResult:
+        """
+        Submits the query with ``execute_async()`` and awaits its completion by polling its status with an exponential
+        backoff, starting at *poll_interval* seconds and capped at *max_poll_interval*. While the query runs, nothing but
+        the event loop is busy; submission, status polls and result fetching are short calls shared by the
+        *async_io_workers* threads of the connection.
+
+        :param query: The query
+        :param query_parameters: The query parameters
+        :param query_name: The query name (for logging purposes)
+        :param collector_method: The collector method
+        :param batch_size: Batch size, passed to collector method
+        :param verbose: When true, emits logs of executing query and success.
+        :param poll_interval: Delay, in seconds, before the first status poll
+        :param max_poll_interval: Upper bound, in seconds, of the delay between two status polls
+        :return: A result object
+        """
+        if not query:
+            ereport.warn('No query provided')
+            return SFQueryResult(None, None, None)
+
+        collector_method = collector_method or SFQueryCollectors.gather_all_records
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        executor: ThreadPoolExecutor = self.get_io_executor()
+
+        cursor: sf_cursor.SnowflakeCursor = self._connection.cursor(SFQueryCollectors.get_cursor_class(collector_method))  # noqa
+        is_streaming: bool = False
+        try:
+            if verbose:
+                self._log_execution_start(query, query_name)
+
+            started_at: float = time.perf_counter()
+            try:
+                with self._tracking_statement(query):
+                    await loop.run_in_executor(executor, cursor.execute_async, query, query_parameters)
+                    await self.wait_for_query(cursor.sfqid, poll_interval=poll_interval, max_poll_interval=max_poll_interval)
+                # query_result() loads the result (description, row count, first chunk) right away, unlike
+                # get_results_from_sfqid() which defers it to the first fetch
+                await loop.run_in_executor(executor, cursor.query_result, cursor.sfqid)
+            except sf.errors.ProgrammingError as e:
+                interpret_programming_error(query, e)
+                return SFQueryResult(
+                    query_id=e.sfqid,
+                    error_message=e.msg,
+                    results=None
+                )
+
+            statistics: SFQueryStatistics = self._make_statistics(cursor, time.perf_counter() - started_at)
+
+            if verbose:
+                self._log_execution_success(query_name)
+
+            results: Any = await loop.run_in_executor(executor, statistics.run_collector, collector_method, cursor, batch_size)
+            if isinstance(results, GeneratorType):
+                results = self._stream_from_cursor(cursor, statistics.follow(results))
+                is_streaming = True
+
+            return SFQueryResult(
+                query_id=cursor.sfqid,
+                error_message=', '.join(cursor.messages) if cursor.messages else None,
+                results=results,
+                statistics=statistics
+            )
+        finally:
+            if not is_streaming:
+                cursor.close()
+
+    async def wait_for_query(
+            self,
+            sfqid: str,
+            *,
+            poll_interval: float = 0.05,
+            max_poll_interval: float = 2.0,
+            backoff_factor: float = 1.5
+    ) -> sf_constants.QueryStatus:
+        """
+        Awaits the end of the query *sfqid*. The delay between two status polls starts at *poll_interval* and is multiplied
+        by *backoff_factor* after each poll, up to *max_poll_interval*, so short queries are seen finishing quickly while
+        long ones cost few round trips.
+
+        :raise snowflake.connector.errors.ProgrammingError: When the query failed
+        :return: The final status of the query
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        executor: ThreadPoolExecutor = self.get_io_executor()
+        delay: float = poll_interval
+
+        while True:
+            status: sf_constants.QueryStatus = await loop.run_in_executor(
+                executor,
+                self._connection.get_query_status_throw_if_error,
+                sfqid
+            )
+            if not self._connection.is_still_running(status):
+                return status
+
+            await asyncio.sleep(delay)
+            delay = min(delay * backoff_factor, max_poll_interval)
+
+    def close(self):
+        with self._cursors_lock:
+            cursors: list[sf_cursor.SnowflakeCursor] = self._persistent_cursors
+            self._persistent_cursors = []
+            self._idle_cursors = {}
+        for cursor in cursors:
+            try:
+                cursor.close()
+            except sf.errors.Error as error:
+                LOGGER.warn('Failed to close cursor: %s', error)
+
+        super().close()
+        if self._io_executor is not None:
+            self._io_executor.shutdown(wait=False)
+            self._io_executor = None
+
+    def _acquire_persistent_cursor(self, cursor_class: type[sf_cursor.SnowflakeCursor]) -> sf_cursor.SnowflakeCursor:
+        """
+        Takes an idle cursor of class *cursor_class* out of the pool, or opens one when there is none
+        """
+        with self._cursors_lock:
+            idle: list[sf_cursor.SnowflakeCursor] = self._idle_cursors.setdefault(cursor_class, [])
+            while idle:
+                cursor: sf_cursor.SnowflakeCursor = idle.pop()
+                if not cursor.is_closed():
+                    return cursor
+                self._persistent_cursors.remove(cursor)
+
+        cursor = self._connection.cursor(cursor_class)  # noqa
+        with self._cursors_lock:
+            self._persistent_cursors.append(cursor)
+        return cursor
+
+    def _release_persistent_cursor(self, cursor_class: type[sf_cursor.SnowflakeCursor], cursor: sf_cursor.SnowflakeCursor):
+        """
+        Puts *cursor* back in the pool, unless it was detached (see ``_detach_cursor()``) or the pool was emptied meanwhile
+        """
+        with self._cursors_lock:
+            if cursor in self._persistent_cursors:
+                self._idle_cursors.setdefault(cursor_class, []).append(cursor)
+
+    def _make_statistics(self, cursor: sf_cursor.SnowflakeCursor, execute_time: float) -> SFQueryStatistics:
+        statistics: SFQueryStatistics = SFQueryStatistics(self._connection.warehouse)
+        statistics.execute_time = execute_time
+        statistics.row_count = cursor.rowcount
+        return statistics
+
+    def fetch_query_statistics(self, result: SFQueryResult) -> SFQueryStatistics | None:
+        """
+        Completes the statistics of *result* with the compilation, execution and queuing times and the scanned bytes
+        reported by the query history of the session. Costs one query; the history can lag a few seconds behind.
+
+        The history is read through the ``INFORMATION_SCHEMA`` of the current database or, without one, of the
+        ``SNOWFLAKE`` database. When it cannot be read, a warning is logged and the server-side measures stay None.
+        :return: The statistics of *result*, None when it has no query ID or no statistics
+        """
+        if result.query_id is None or result.statistics is None or not _QUERY_ID_REGEX.fullmatch(result.query_id):
+            return None
+
+        database: str = self._connection.database or 'SNOWFLAKE'
+        statistics: SFQueryStatistics = result.statistics
+        # The query ID is inlined rather than bound: its format is checked above, and binding depends on the paramstyle
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(_QUERY_HISTORY_STATEMENT.format(database='"' + database.replace('"', '""') + '"', query_id=result.query_id))
+                row: dict[str, Any] | None = cursor.fetchone()
+        except sf.errors.ProgrammingError as e:
+            LOGGER.warn('Could not read the query history of query %s: %s', result.query_id, e.msg)
+            return statistics
+
+        if row:
+            statistics.compile_time = (row['COMPILATION_TIME'] or 0) / 1000
+            statistics.execution_time = (row['EXECUTION_TIME'] or 0) / 1000
+            statistics.queued_time = ((row['QUEUED_PROVISIONING_TIME'] or 0) + (row['QUEUED_OVERLOAD_TIME'] or 0)) / 1000
+            statistics.bytes_scanned = row['BYTES_SCANNED']
+            statistics.warehouse = row['WAREHOUSE_NAME'] or statistics.warehouse
+        else:
+            LOGGER.debug('Query %s not found in the query history yet', result.query_id)
+        return statistics
+
+    def _stream_from_cursor(self, cursor: sf_cursor.SnowflakeCursor, results: Generator[Any, None, None]) -> Generator[Any, None, None]:
+        """
+        Hands *cursor* over to the lazy *results*: the cursor is not reused nor closed by ``get_cursor()``, and is closed
+        once *results* is exhausted, closed (``close()``) or garbage-collected, even if it was never iterated.
+        """
+        self._detach_cursor(cursor)
+        with self._cursors_lock:
+            self._streaming_cursors.add(cursor)
+
+        def _close_when_exhausted() -> Generator[Any, None, None]:
+            try:
+                yield  # Priming point: closing the generator from here on runs the finally clause
+                yield from results
+            finally:
+                with self._cursors_lock:
+                    self._streaming_cursors.discard(cursor)
+                cursor.close()
+
+        stream: Generator[Any, None, None] = _close_when_exhausted()
+        next(stream)
+        return stream
+
+    def _detach_cursor(self, cursor: sf_cursor.SnowflakeCursor):
+        """
+        Stops reusing a persistent *cursor*, because a lazy result still reads from it
+        """
+        if not self.persistent_cursors:
+            return
+
+        with self._cursors_lock:
+            if cursor in self._persistent_cursors:
+                self._persistent_cursors.remove(cursor)
+
+    def get_io_executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the thread pool running the connection's background I/O (async polling, prefetched pages), created with
+        ``async_io_workers`` threads on first use and shut down by ``close()``
+        """
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=self.async_io_workers, thread_name_prefix='esql-sf-io')
+        return self._io_executor
+
+    @staticmethod
+    def _log_execution_start(query: str, query_name: str | None):
+        if query_name:
+            LOGGER.info('Executing query: %s...', query_name)
+        else:
+            LOGGER.info('Executing query: %s', query.replace('\n', ' ').replace('\t', ' ').replace('  ', ' ')[:500] if query else None)
+
+    @staticmethod
+    def _log_execution_success(query_name: str | None):
+        if query_name:
+            LOGGER.success('Successfully executed query %s', query_name)
+        else:
+            LOGGER.success('Successfully executed query.')
+
     def connect(self) -> SFConnection:
         if self._connection:
             LOGGER.debug('Re-using same connection')
-            return self._connection
+            return self
 
         LOGGER.info('Initiating connection to Snowflake ...')
         LOGGER.info('User = %s, Account = %s, Warehouse = %s, region = %s, database = %s', self.user, self.host, self.warehouse, self.region,
@@ -121,18 +888,95 @@ class SFConnection(BaseConnection[sf, SFQueryResult]):
             user=self.user,
             password=self.password,
             account=self.host,
-            warehouse=self.warehouse.value,
+            warehouse=getattr(self.warehouse, 'value', self.warehouse),
             database=self.database,
             region=self.region,
-            role=self.role
+            role=self.role,
+            client_session_keep_alive=self.client_session_keep_alive,
+            **({'paramstyle': self.paramstyle} if self.paramstyle else {}),
+            **({'client_session_keep_alive_heartbeat_frequency': self.keep_alive_heartbeat_frequency}
+               if self.keep_alive_heartbeat_frequency else {})
         )
 
         if not self._connection:
             raise RuntimeError('Could not establish connection, _connection is None')
 
+        logging.getLogger('snowflake.connector.cursor').setLevel(logging.ERROR)
+
         ereport.success('Successfully connected.')
         return self
 
+    def reconnect(self) -> SFConnection:
+        """
+        Closes the current session, if any, and logs in again
+        """
+        with self._reconnect_lock:
+            self._reset_connection()
+            return self.connect()
+
+    def _reconnect_from(self, failed_connection: sf.SnowflakeConnection):
+        """
+        Logs in again, unless another thread already replaced *failed_connection*
+        """
+        with self._reconnect_lock:
+            if self._connection is not failed_connection and self.is_connected:
+                return
+
+            LOGGER.warn('Session lost, reconnecting ...')
+            context: SFSessionContext | None = self._capture_session_context()
+            self._reset_connection()
+            self.connect()
+            self._restore_session_context(context)
+
+    def _capture_session_context(self) -> SFSessionContext | None:
+        """
+        Returns the tracked session context or, when it was dropped, the role, warehouse, database and schema the
+        connector last reported
+        """
+        with self._session_lock:
+            if self._session_context is not None:
+                return self._session_context
+        if self._connection is None:
+            return None
+        return SFSessionContext(
+            role=self._connection.role,
+            warehouse=self._connection.warehouse,
+            database=self._connection.database,
+            schema=self._connection.schema
+        )
+
+    def _restore_session_context(self, context: SFSessionContext | None):
+        """
+        Moves a new session to *context*, so statements sent again run with the role, warehouse, database, schema and
+        session parameters of the lost session
+        :raise SessionContextLostException: When the context could not be restored
+        """
+        if context is None:
+            return
+
+        result: SFQueryResult = self.set_session_context(
+            role=format_exact_identifier(context.role),
+            warehouse=format_exact_identifier(context.warehouse),
+            database=format_exact_identifier(context.database),
+            schema=format_exact_identifier(context.schema),
+            parameters=context.parameters
+        )
+        if result.is_errored:
+            raise SessionContextLostException(result.error)
+
+    def _reset_connection(self):
+        if self._connection is not None:
+            try:
+                self.close()
+            except sf.errors.Error as error:
+                LOGGER.warn('Failed to close lost connection: %s', error)
+        self._connection = None
+        self._session_context = None
+
+    @staticmethod
+    def _is_session_lost(error: sf.errors.Error) -> bool:
+        return getattr(error, 'errno', None) in _SESSION_LOST_ERROR_CODES
+
     def start_query(self, query: str, *parameters) -> tuple[sf_cursor, str]:
         """
         Starts *query* execution asynchronously and returns the query ID.
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any
+
+from esql._internal.ref import DEFAULT_REPORTER
+from esql.connection.base_connection_pool import BaseConnectionPool
+from esql.connection.snowflake.sf_connection import SFConnection
+
+LOGGER = DEFAULT_REPORTER
+
+
+class SFConnectionPool(BaseConnectionPool[SFConnection]):
+    """
+    Pool of warm :class:`SFConnection`, so concurrent callers reuse sessions instead of paying the login handshake:
+
+        with SFConnectionPool(user, password, account, warehouse=..., max_size=8) as pool:
+            with pool.borrow() as connection:
+                connection.execute_query('SELECT 1')
+
+    Extra keyword arguments are forwarded to every :class:`SFConnection` made by the pool.
+    """
+    __slots__ = (
+        'user',
+        'password',
+        'account',
+        '_connection_kwargs'
+    )
+
+    def __init__(
+            self,
+            user: str,
+            password: str,
+            account: str,
+            *,
+            min_size: int = 1,
+            max_size: int = 10,
+            max_idle_time: float | None = 300.0,
+            health_check_interval: float | None = 30.0,
+            checkout_timeout: float | None = None,
+            **connection_kwargs: Any
+    ):
+        super().__init__(
+            min_size=min_size,
+            max_size=max_size,
+            max_idle_time=max_idle_time,
+            health_check_interval=health_check_interval,
+            checkout_timeout=checkout_timeout
+        )
+        self.user: str = user
+        self.password: str = password
+        self.account: str = account
+        self._connection_kwargs: dict[str, Any] = connection_kwargs
+
+    def _make_connection(self) -> SFConnection:
+        LOGGER.debug('Opening pooled connection (%d / %d)', self.statistics.created + 1, self.max_size)
+        return SFConnection(self.user, self.password, self.account, **self._connection_kwargs).connect()
+
+    def _is_healthy(self, connection: SFConnection, *, ping: bool) -> bool:
+        if not connection.is_connected:
+            return False
+
+        return connection.ping() if ping else True
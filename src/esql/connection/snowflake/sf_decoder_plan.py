@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Final, Sequence
+
+from ejson.facades.orjson_ import loads
+
+from esql.connection.snowflake.sf_columns import SFColumn, get_columns
+from esql.connection.snowflake.sf_lazy_json import SFLazyJson
+from esql.sql_.adapters.snowflake.snowflake_data_types import SnowflakeDataTypes
+
+_WHITESPACE_REGEX: Final[re.Pattern] = re.compile(r'\s{2,}|\n')
+SEMI_STRUCTURED_TYPES: Final[frozenset[SnowflakeDataTypes]] = frozenset({
+    SnowflakeDataTypes.VARIANT,
+    SnowflakeDataTypes.OBJECT,
+    SnowflakeDataTypes.ARRAY
+})
+_BOOLEAN_STRINGS: Final[dict[str, bool]] = {
+    'true': True, 't': True, 'yes': True, 'y': True, 'on': True, '1': True,
+    'false': False, 'f': False, 'no': False, 'n': False, 'off': False, '0': False
+}
+
+
+def normalize_whitespace(value: Any) -> Any:
+    """
+    Replaces new lines and runs of whitespace with a single space
+    """
+    return _WHITESPACE_REGEX.sub(' ', value) if isinstance(value, str) else value
+
+
+def parse_semi_structured(value: Any) -> Any:
+    """
+    Parses the JSON text the connector returns for VARIANT, OBJECT and ARRAY values
+    """
+    return loads(value) if isinstance(value, str) else value
+
+
+def to_date(value: Any) -> date:
+    """
+    Converts a date, a datetime or ISO text to a ``datetime.date``
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
+
+
+def to_bool(value: Any) -> bool:
+    """
+    Converts a value to a bool; text must be one of Snowflake's boolean strings (``'false'``, ``'no'``, ``'0'``...)
+    :raise ValueError: When *value* is text that is not a boolean
+    """
+    if isinstance(value, str):
+        try:
+            return _BOOLEAN_STRINGS[value.strip().lower()]
+        except KeyError:
+            raise ValueError(f'Not a boolean: {value!r}') from None
+    return bool(value)
+
+
+# Types whose initializer (``SnowflakeDataTypes.get_initializer()``) does not convert text to the expected value
+TYPE_CONVERTERS: Final[dict[SnowflakeDataTypes, Callable[[Any], Any]]] = {
+    SnowflakeDataTypes.DATE: to_date,
+    SnowflakeDataTypes.BOOL: to_bool
+}
+
+
+def get_converter(column: SFColumn, *, lazy_json: bool = False) -> Callable[[Any], Any] | None:
+    """
+    Returns the function decoding the values of *column*, or None when the connector already returns them decoded
+    :param lazy_json: When true, semi-structured values are wrapped in a :class:`SFLazyJson` instead of being parsed
+    """
+    if column.data_type in SEMI_STRUCTURED_TYPES:
+        return SFLazyJson if lazy_json else parse_semi_structured
+    if column.data_type == SnowflakeDataTypes.STRING:
+        return normalize_whitespace
+    if column.data_type == SnowflakeDataTypes.BINARY:
+        return None
+
+    initializer: Callable[[Any], Any] = TYPE_CONVERTERS.get(column.data_type) or column.data_type.get_initializer()
+
+    def _convert_text(value: Any) -> Any:
+        return initializer(value) if isinstance(value, str) else value
+
+    return _convert_text
+
+
+class SFDecoderPlan:
+    """
+    How to decode the records of a result, worked out once from its cursor ``description``.
+
+    VARIANT, OBJECT and ARRAY values are parsed from JSON, text values get their whitespace normalized and values of
+    other types, already converted by the connector, are only converted (``TYPE_CONVERTERS``, otherwise
+    ``SnowflakeDataTypes.get_initializer()``) when they come as text. With *lazy_json*, semi-structured values are only
+    parsed when accessed (:class:`SFLazyJson`). Dict records are decoded in place.
+    """
+    __slots__ = (
+        'columns',
+        '_converters',
+        '_indexed_converters'
+    )
+
+    def __init__(self, columns: Sequence[SFColumn], *, lazy_json: bool = False):
+        self.columns: tuple[SFColumn, ...] = tuple(columns)
+        self._indexed_converters: tuple[tuple[int, Callable[[Any], Any]], ...] = tuple(
+            (index, converter) for index, column in enumerate(self.columns)
+            if (converter := get_converter(column, lazy_json=lazy_json)) is not None
+        )
+        self._converters: tuple[tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (self.columns[index].name, converter) for index, converter in self._indexed_converters
+        )
+
+    @property
+    def is_identity(self) -> bool:
+        """
+        Returns true when no column needs decoding
+        """
+        return not self._indexed_converters
+
+    @staticmethod
+    def from_description(description: Sequence[Any] | None, *, lazy_json: bool = False) -> SFDecoderPlan:
+        return SFDecoderPlan(get_columns(description), lazy_json=lazy_json)
+
+    def decode_record(self, record: dict[str, Any]) -> dict[str, Any]:
+        for name, converter in self._converters:
+            value: Any = record[name]
+            if value is not None:
+                record[name] = converter(value)
+        return record
+
+    def decode_records(self, records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        for record in records:
+            self.decode_record(record)
+        return records
+
+    def decode_values(self, values: Sequence[Any]) -> list[Any]:
+        """
+        Decodes a record fetched as a tuple, and returns its values as a new list
+        """
+        decoded: list[Any] = list(values)
+        for index, converter in self._indexed_converters:
+            value: Any = decoded[index]
+            if value is not None:
+                decoded[index] = converter(value)
+        return decoded
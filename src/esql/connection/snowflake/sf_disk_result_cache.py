@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Final, Generator
+
+from esql.connection.base_result_cache import BaseResultCache, CachedResult, normalize_table_name
+from esql.connection.snowflake.sf_result_cache import CACHEABLE_RESULT_TYPES
+
+_ROWS_FORMAT: Final[int] = 0
+_PICKLE_FORMAT: Final[int] = 1
+_TABLE_SEPARATOR: Final[str] = '\x00'
+_SCHEMA: Final[tuple[str, ...]] = (
+    '''CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        query_id TEXT,
+        expires_at REAL NOT NULL,
+        stored_at REAL NOT NULL,
+        size INTEGER NOT NULL,
+        payload BLOB NOT NULL
+    )''',
+    '''CREATE TABLE IF NOT EXISTS result_tables (
+        table_name TEXT NOT NULL,
+        key TEXT NOT NULL REFERENCES results (key) ON DELETE CASCADE,
+        PRIMARY KEY (table_name, key)
+    ) WITHOUT ROWID''',
+    'CREATE INDEX IF NOT EXISTS result_tables_key ON result_tables (key)',
+    'CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)'
+)
+
+
+def encode_results(results: Any, compression_level: int = 6) -> bytes:
+    """
+    Serializes *results* compactly: a list of dicts sharing the same keys is stored as the keys once followed by one
+    tuple of values per record; anything else is pickled as is. The payload is compressed with zlib.
+    """
+    if isinstance(results, list) and results and type(results[0]) is dict:
+        names: tuple[str, ...] = tuple(results[0])
+        if all(type(record) is dict and len(record) == len(names) and tuple(record) == names for record in results):
+            content: tuple[Any, ...] = (_ROWS_FORMAT, names, [tuple(record.values()) for record in results])
+            return zlib.compress(pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL), compression_level)
+    return zlib.compress(pickle.dumps((_PICKLE_FORMAT, results), protocol=pickle.HIGHEST_PROTOCOL), compression_level)
+
+
+def decode_results(payload: bytes) -> Any:
+    content: tuple[Any, ...] = pickle.loads(zlib.decompress(payload))
+    if content[0] == _ROWS_FORMAT:
+        _, names, rows = content
+        return [dict(zip(names, row)) for row in rows]
+    return content[1]
+
+
+class SFDiskResultCache(BaseResultCache):
+    """
+    Query result cache persisted in a SQLite database, shared by every process of the host opening the same *path*
+    and kept across restarts: a new process starts with the entries its predecessors stored.
+
+    The database runs in WAL mode, so readers do not block each other nor the writer. Results are stored compressed,
+    records as one header and value tuples (see ``encode_results()``). Beyond *max_bytes* of payloads, expired entries
+    go first, then the oldest stored. Hit and miss counters are per process.
+
+    Each thread (and each process, forked ones included) uses its own SQLite connection. Results must be picklable;
+    entries are unpickled when read, so the database must only be writable by trusted processes.
+    Plug it into ``SFConnection(result_cache=...)``.
+    """
+    __slots__ = (
+        'path',
+        'max_bytes',
+        'compression_level',
+        'busy_timeout',
+        '_local',
+        '_connections',
+        '_connections_lock'
+    )
+
+    def __init__(
+            self,
+            path: str,
+            max_bytes: int = 256 * 1024 * 1024,
+            default_ttl: float = 300.0,
+            *,
+            compression_level: int = 6,
+            busy_timeout: float = 10.0
+    ):
+        """
+        :param path: Path of the SQLite database, created when missing
+        :param max_bytes: Number of bytes of compressed results kept; larger results are not cached
+        :param default_ttl: See ``BaseResultCache``
+        :param compression_level: zlib compression level, from 1 (fastest) to 9 (smallest)
+        :param busy_timeout: Seconds to wait for another process's write to complete
+        """
+        super().__init__(default_ttl)
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.compression_level: int = compression_level
+        self.busy_timeout: float = busy_timeout
+        self._local: threading.local = threading.local()
+        self._connections: list[tuple[int, sqlite3.Connection]] = []
+        self._connections_lock: threading.Lock = threading.Lock()
+
+        with self._write_transaction() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    @property
+    def size(self) -> int:
+        return self._get_connection().execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def _invalidate(self, table: str) -> int:
+        with self._write_transaction() as connection:
+            return connection.execute(
+                'DELETE FROM results WHERE key IN (SELECT key FROM result_tables WHERE table_name = ?)',
+                (normalize_table_name(table),)
+            ).rowcount
+
+    def purge_expired(self) -> int:
+        """
+        Deletes the expired entries
+        :return: The number of entries deleted
+        """
+        with self._write_transaction() as connection:
+            return connection.execute('DELETE FROM results WHERE expires_at <= ?', (time.time(),)).rowcount
+
+    def _clear(self):
+        with self._write_transaction() as connection:
+            connection.execute('DELETE FROM results')
+
+    def close(self):
+        """
+        Closes the SQLite connections this process opened, in every thread
+        """
+        pid: int = os.getpid()
+        with self._connections_lock:
+            for connection_pid, connection in self._connections:
+                if connection_pid == pid:
+                    connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _load(self, key: str) -> CachedResult | None:
+        row: tuple[Any, ...] | None = self._get_connection().execute(
+            '''SELECT query_id, expires_at, payload,
+                (SELECT GROUP_CONCAT(table_name, ?) FROM result_tables WHERE result_tables.key = results.key)
+            FROM results WHERE key = ?''',
+            (_TABLE_SEPARATOR, key)
+        ).fetchone()
+        if row is None:
+            return None
+
+        query_id, expires_at, payload, tables = row
+        return CachedResult(
+            query_id,
+            decode_results(payload),
+            frozenset(tables.split(_TABLE_SEPARATOR)) if tables else frozenset(),
+            expires_at
+        )
+
+    def _store(self, key: str, entry: CachedResult) -> bool:
+        if not isinstance(entry.results, CACHEABLE_RESULT_TYPES):
+            return False
+        payload: bytes = encode_results(entry.results, self.compression_level)
+        if len(payload) > self.max_bytes:
+            return False
+
+        now: float = time.time()
+        with self._write_transaction() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO results (key, query_id, expires_at, stored_at, size, payload) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, entry.query_id, entry.expires_at, now, len(payload), payload)
+            )
+            connection.executemany(
+                'INSERT OR IGNORE INTO result_tables (table_name, key) VALUES (?, ?)',
+                [(table, key) for table in entry.tables]
+            )
+            self._evict(connection, now)
+        return True
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        excess: int = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+
+        keys: list[str] = []
+        for key, size in connection.execute('SELECT key, size FROM results ORDER BY expires_at > ?, stored_at', (now,)):
+            keys.append(key)
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany('DELETE FROM results WHERE key = ?', [(key,) for key in keys])
+
+    def _discard(self, key: str):
+        with self._write_transaction() as connection:
+            connection.execute('DELETE FROM results WHERE key = ?', (key,))
+
+    @contextmanager
+    def _write_transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        # IMMEDIATE takes the write lock upfront: a deferred transaction upgrading from read to write can fail with
+        # SQLITE_BUSY instead of waiting for the other process
+        connection: sqlite3.Connection = self._get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA foreign_keys=ON')
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        with self._connections_lock:
+            self._connections.append((self._local.pid, connection))
+        return connection
+
+    def __len__(self) -> int:
+        return self._get_connection().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def __repr__(self) -> str:
+        return f'SFDiskResultCache(path={self.path!r}, max_bytes={self.max_bytes}, hits={self.hit_count}, misses={self.miss_count})'
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from ejson.facades.orjson_ import loads
+
+_NOT_PARSED = object()
+
+
+class SFLazyJson:
+    """
+    A VARIANT, OBJECT or ARRAY value kept as the JSON text the connector returned, parsed on first access.
+
+    ``value`` returns the parsed document, cached afterward. Item access, iteration, ``len()``, ``in``, ``get()`` and
+    equality go through it, so the proxy can stand in for the document in most read-only code; ``raw`` gives the text
+    back without parsing it.
+    """
+    __slots__ = (
+        'raw',
+        '_value'
+    )
+
+    def __init__(self, raw: str | bytes):
+        self.raw: str | bytes = raw
+        self._value: Any = _NOT_PARSED
+
+    @property
+    def value(self) -> Any:
+        if self._value is _NOT_PARSED:
+            self._value = loads(self.raw)
+        return self._value
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._value is not _NOT_PARSED
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self.value.get(key, default)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.value[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.value
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SFLazyJson):
+            return self.raw == other.raw or self.value == other.value
+        return self.value == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return SFLazyJson, (self.raw,)
+
+    def __repr__(self) -> str:
+        return f'SFLazyJson({self.value!r})' if self.is_parsed else f'SFLazyJson(raw={self.raw[:80]!r})'
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from typing import Any, Generator, Sequence
+
+from esql.connection.snowflake.sf_columns import SFColumn
+from esql.connection.snowflake.sf_decoder_plan import SFDecoderPlan
+
+
+def decode_result_batch(result_batch: Any, columns: Sequence[SFColumn], lazy_json: bool = False) -> list[dict[str, Any]]:
+    """
+    Downloads a result batch (``cursor.get_result_batches()``) and decodes its records into dicts. Runs in a worker
+    process: the batch and the columns are pickled, the plan is compiled on the worker side.
+    """
+    plan: SFDecoderPlan = SFDecoderPlan(columns, lazy_json=lazy_json)
+    names: list[str] = [column.name for column in columns]
+    return [dict(zip(names, plan.decode_values(row))) for row in result_batch]
+
+
+def iter_decoded_batches(
+        result_batches: Sequence[Any],
+        columns: Sequence[SFColumn],
+        *,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+        ordered: bool = True,
+        lazy_json: bool = False
+) -> Generator[list[dict[str, Any]], None, None]:
+    """
+    Downloads and decodes *result_batches* in parallel and yields their records, one list per batch.
+
+    At most twice as many batches as workers are in flight, so a slow consumer does not make decoded batches pile up.
+
+    :param executor: The pool to use. Defaults to a process pool of *max_workers* created for this call and shut down
+        afterward; pass a long-lived pool to avoid paying its start-up on every query.
+    :param max_workers: Number of worker processes of the default pool, defaults to the number of CPUs
+    :param ordered: When true, batches are yielded in the order of the result; otherwise as soon as they are decoded
+    :param lazy_json: See ``SFDecoderPlan``
+    """
+    owns_executor: bool = executor is None
+    if executor is None:
+        max_workers = max_workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=max_workers)  # pylint: disable=consider-using-with
+    window: int = 2 * (max_workers or os.cpu_count() or 1)
+
+    pending_batches: deque[Any] = deque(result_batches)
+    in_flight: deque[Future] = deque()
+
+    def _submit_up_to_window():
+        while pending_batches and len(in_flight) < window:
+            in_flight.append(executor.submit(decode_result_batch, pending_batches.popleft(), columns, lazy_json))
+
+    try:
+        _submit_up_to_window()
+        while in_flight:
+            if ordered:
+                future: Future = in_flight.popleft()
+            else:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                future = next(iter(done))
+                in_flight.remove(future)
+
+            records: list[dict[str, Any]] = future.result()
+            _submit_up_to_window()
+            yield records
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if owns_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
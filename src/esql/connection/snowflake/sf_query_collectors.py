@@ -1,55 +1,366 @@
 from __future__ import annotations
 
-from typing import Generator
-import re
+from concurrent.futures import Executor
+from typing import Any, Callable, Final, Generator, TYPE_CHECKING
+import functools
+import time
 
 import ereport
 import snowflake.connector as sf
+import snowflake.connector.cursor as sf_cursor
 from empire_commons.types_ import JsonType
-from ejson.facades.orjson_ import loads
 
 from esql._internal.ref import REPORTER_NAME, LOGGING_LEVEL_ENV_VAR_NAME
+from esql.connection.snowflake.sf_columns import SFColumn, get_columns
+from esql.connection.snowflake.sf_decoder_plan import SFDecoderPlan
+from esql.connection.snowflake.sf_parallel_decode import iter_decoded_batches
+from esql.connection.snowflake.sf_query_statistics import record_decode_time
+from esql.connection.snowflake.sf_records import SFHeader, SFRecord, SFRecordList
+from esql.connection.snowflake.sf_row_pipeline import SFCompiledPipeline, SFRowPipeline
+from esql.connection.snowflake.sf_spilled_records import SFSpilledRecords
+from esql.connection.snowflake.sf_struct_converter import SFStructConverter, TypeStruct, get_struct_converter
 
+if TYPE_CHECKING:
+    import numpy
+    import pyarrow
 
 LOGGER = ereport.get_or_make_reporter(REPORTER_NAME, LOGGING_LEVEL_ENV_VAR_NAME)
 
+_PROGRESS_LOG_INTERVAL: Final[float] = 30.0
+_DEFAULT_FETCH_BATCH_SIZE: Final[int] = 10_000
+_DEFAULT_MEMORY_BUDGET: Final[int] = 256 * 1024 * 1024
+
+
+def uses_cursor(cursor_class: type[sf_cursor.SnowflakeCursor]) -> Callable[[Callable], Callable]:
+    """
+    Declares the cursor class a collector expects. Collectors without declaration receive a ``DictCursor``.
+    """
+    def _decorator(collector: Callable) -> Callable:
+        collector.cursor_class = cursor_class
+        return collector
+    return _decorator
+
+
+def uncacheable(collector: Callable) -> Callable:
+    """
+    Declares a collector whose results cannot be shared by result cache hits: lazy results, tied to a cursor or a file,
+    and objects the cache cannot store
+    """
+    collector.is_cacheable = False
+    return collector
+
+
 class SFQueryCollectors:
     @staticmethod
-    def gather_all_records(cursor: sf.DictCursor, unused: int) -> list[JsonType]:
-        return SFQueryCollectors._parse_results_to_json(cursor.fetchall())
+    def get_cursor_class(collector: Callable[[Any, int], Any]) -> type[sf_cursor.SnowflakeCursor]:
+        """
+        Returns the cursor class *collector* expects (see ``uses_cursor()``). ``functools.partial`` objects are unwrapped.
+        """
+        return getattr(getattr(collector, 'func', collector), 'cursor_class', sf.DictCursor)
+
+    @staticmethod
+    def is_cacheable(collector: Callable[[Any, int], Any]) -> bool:
+        """
+        Returns false for collectors declared ``uncacheable()``. ``functools.partial`` objects are unwrapped.
+        """
+        return getattr(getattr(collector, 'func', collector), 'is_cacheable', True)
 
     @staticmethod
-    def make_generator(cursor: sf.DictCursor, batch_size: int) -> Generator[JsonType]:
+    def gather_all_records(cursor: sf.DictCursor, unused: int, *, lazy_json: bool = False) -> list[JsonType]:
+        """
+        Returns all the records as dicts, decoded according to the result's columns (see
+        :class:`esql.connection.snowflake.sf_decoder_plan.SFDecoderPlan`).
+
+        With *lazy_json*, VARIANT, OBJECT and ARRAY values are :class:`esql.connection.snowflake.sf_lazy_json.SFLazyJson`
+        proxies, parsed only when accessed. Other collectors returning decoded records take the same option; bind it with
+        ``functools.partial(SFQueryCollectors.gather_all_records, lazy_json=True)``.
+        """
+        plan: SFDecoderPlan = SFDecoderPlan.from_description(cursor.description, lazy_json=lazy_json)
+        return SFQueryCollectors._parse_results_to_json(cursor.fetchall(), plan)
+
+    @staticmethod
+    @uncacheable
+    def make_generator(cursor: sf.DictCursor, batch_size: int, *, lazy_json: bool = False) -> Generator[list[JsonType], None, None]:
+        """
+        Streams the records in batches of *batch_size*, until the cursor is exhausted. Only the current batch is held in
+        memory: the connector downloads result chunks as they are reached, and a batch is released once the next one is
+        requested. Throughput is logged periodically and at the end.
+
+        Through ``SFConnection.execute_query()``, the cursor stays open until the records are exhausted, the result is
+        closed (``SFQueryResult.close()``) or garbage-collected.
+        """
         LOGGER.info('Using generator collector of size %d', batch_size)
-        buffer: list[JsonType] = []
-        for batch in SFQueryCollectors._parse_results_to_json(cursor.fetchmany(batch_size)):
-            print(len(batch))
-            buffer.append(batch)
-            yield buffer
+        plan: SFDecoderPlan = SFDecoderPlan.from_description(cursor.description, lazy_json=lazy_json)
+        return _stream_batches(cursor, batch_size, lambda batch: SFQueryCollectors._parse_results_to_json(batch, plan))
+
+    @staticmethod
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    def gather_compact_records(cursor: sf_cursor.SnowflakeCursor, unused: int, *, lazy_json: bool = False) -> SFRecordList:
+        """
+        Returns all the records as tuples sharing a single header (``SFQueryResult.header``) instead of one dict each.
+        Values are decoded as with ``gather_all_records()`` and reachable by name: ``record['NAME']``, ``record.to_dict()``.
+        """
+        plan: SFDecoderPlan = SFDecoderPlan.from_description(cursor.description, lazy_json=lazy_json)
+        return SFQueryCollectors._make_record_list(cursor.fetchall(), plan, SFHeader([column.name for column in plan.columns]))
+
+    @staticmethod
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    @uncacheable
+    def make_compact_generator(cursor: sf_cursor.SnowflakeCursor, batch_size: int, *, lazy_json: bool = False) -> Generator[SFRecordList, None, None]:
+        """
+        Streams the records like ``make_generator()``, as batches of ``gather_compact_records()`` records
+        """
+        LOGGER.info('Using compact generator collector of size %d', batch_size)
+        plan: SFDecoderPlan = SFDecoderPlan.from_description(cursor.description, lazy_json=lazy_json)
+        header: SFHeader = SFHeader([column.name for column in plan.columns])
+        return _stream_batches(cursor, batch_size, lambda batch: SFQueryCollectors._make_record_list(batch, plan, header))
+
+    @staticmethod
+    @uncacheable
+    def gather_spilling_records(
+            cursor: sf.DictCursor,
+            batch_size: int,
+            *,
+            memory_budget: int = _DEFAULT_MEMORY_BUDGET,
+            spill_directory: str | None = None,
+            lazy_json: bool = False
+    ) -> SFSpilledRecords:
+        """
+        Returns all the records, decoded as with ``gather_all_records()``, keeping at most about *memory_budget* bytes of
+        them in memory: the following batches of *batch_size* records (10 000 when smaller than 2) are spilled to a
+        memory-mapped temporary file in *spill_directory*. The returned object can be iterated several times; see
+        :class:`esql.connection.snowflake.sf_spilled_records.SFSpilledRecords`.
+        """
+        if batch_size < 2:
+            batch_size = _DEFAULT_FETCH_BATCH_SIZE
+
+        plan: SFDecoderPlan = SFDecoderPlan.from_description(cursor.description, lazy_json=lazy_json)
+        records: SFSpilledRecords = SFSpilledRecords(memory_budget, spill_directory)
+        while batch := cursor.fetchmany(batch_size):
+            records.append_batch(SFQueryCollectors._parse_results_to_json(batch, plan))
 
-            buffer = []
+        if records.is_spilled:
+            LOGGER.info('Spilled %d batches (%d bytes) of %d records to disk', records.spilled_batch_count, records.spilled_bytes, len(records))
+        return records.seal()
 
     @staticmethod
-    def fetch_one_record(cursor: sf.DictCursor, unused: int) -> JsonType:
-        return SFQueryCollectors._parse_results_to_json(cursor.fetchone())
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    @uncacheable
+    def make_parallel_generator(
+            cursor: sf_cursor.SnowflakeCursor,
+            unused: int,
+            *,
+            max_workers: int | None = None,
+            ordered: bool = True,
+            executor: Executor | None = None,
+            lazy_json: bool = False
+    ) -> Generator[list[JsonType], None, None]:
+        """
+        Streams the records as ``make_generator()`` does, one batch per server-side result chunk
+        (``cursor.get_result_batches()``), downloaded and decoded by a pool of worker processes; decoding no longer
+        competes for the GIL of the calling process. See
+        :func:`esql.connection.snowflake.sf_parallel_decode.iter_decoded_batches` for *max_workers*, *ordered* and
+        *executor*.
+        """
+        result_batches: list[Any] = cursor.get_result_batches() or []
+        columns: list[SFColumn] = get_columns(cursor.description)
+        LOGGER.info('Decoding %d result batches in parallel', len(result_batches))
+        return iter_decoded_batches(result_batches, columns, executor=executor, max_workers=max_workers, ordered=ordered, lazy_json=lazy_json)
 
     @staticmethod
-    def fetch_n_records(cursor: sf.DictCursor, quantity: int) -> list[JsonType]:
-        return SFQueryCollectors._parse_results_to_json(cursor.fetchmany(quantity))
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    def gather_structs(cursor: sf_cursor.SnowflakeCursor, unused: int, *, struct: type[TypeStruct]) -> list[TypeStruct]:
+        """
+        Returns all the records as instances of the dataclass *struct* (e.g. ``result_structs.ListTablesInfo``), built
+        straight from the fetched tuples; see :class:`esql.connection.snowflake.sf_struct_converter.SFStructConverter`.
+        Use ``make_struct_collector()`` to bind *struct*.
+        """
+        converter: SFStructConverter[TypeStruct] = get_struct_converter(struct, tuple(column[0] for column in cursor.description or []))
+        rows: list[tuple] = cursor.fetchall()
+        started_at: float = time.perf_counter()
+        structs: list[TypeStruct] = converter.convert_all(rows)
+        record_decode_time(time.perf_counter() - started_at)
+        return structs
 
     @staticmethod
-    def _parse_results_to_json(results: list[dict[str, str]] | dict[str, str] | None) -> list[JsonType] | JsonType | None:
-        def _try_parse(value: str) -> dict | str:
-            try:
-                return loads(value)
-            except Exception:
-                return re.sub(r'\s{2,}', ' ', str(value).replace('\n', ' '))
+    def make_struct_collector(struct: type[TypeStruct]) -> Callable[[Any, int], list[TypeStruct]]:
+        """
+        Returns a collector building instances of *struct*:
 
-        if isinstance(results, (list, tuple)):
-            return [{key: _try_parse(value) for key, value in row.items()} for row in results]
-        elif isinstance(results, dict):
-            return {key: _try_parse(value) for key, value in results.items()}
-        elif results is None:
-            return None
+            connection.execute_query(SnowflakeListers.list_tables(), collector_method=SFQueryCollectors.make_struct_collector(ListTablesInfo))
+        """
+        return functools.partial(SFQueryCollectors.gather_structs, struct=struct)
+
+    @staticmethod
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    def gather_pipeline_records(cursor: sf_cursor.SnowflakeCursor, batch_size: int, *, pipeline: SFRowPipeline) -> list[JsonType]:
+        """
+        Returns all the records, processed by *pipeline* instead of the default decoding, *batch_size* records at a time
+        (10 000 when smaller than 2). Use ``make_pipeline_collector()`` to bind *pipeline*.
+        """
+        if batch_size < 2:
+            batch_size = _DEFAULT_FETCH_BATCH_SIZE
+
+        compiled: SFCompiledPipeline = pipeline.compile_description(cursor.description)
+        records: list[JsonType] = []
+        while batch := cursor.fetchmany(batch_size):
+            records.extend(compiled.process(batch))
+        return records
+
+    @staticmethod
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    @uncacheable
+    def make_pipeline_generator(cursor: sf_cursor.SnowflakeCursor, batch_size: int, *, pipeline: SFRowPipeline) -> Generator[list[JsonType], None, None]:
+        """
+        Streams the records like ``make_generator()``, processed by *pipeline* instead of the default decoding
+        """
+        LOGGER.info('Using pipeline generator collector of size %d', batch_size)
+        return _stream_batches(cursor, batch_size, pipeline.compile_description(cursor.description).process)
+
+    @staticmethod
+    def make_pipeline_collector(pipeline: SFRowPipeline, *, streaming: bool = False) -> Callable[[Any, int], Any]:
+        """
+        Returns a collector processing records with *pipeline*, streaming them in batches when *streaming* is true:
+
+            pipeline = SFRowPipeline([Parse(), Drop(('RAW',)), Rename({'ID': 'id'})])
+            connection.execute_query(query, collector_method=SFQueryCollectors.make_pipeline_collector(pipeline))
+        """
+        collector: Callable[..., Any] = SFQueryCollectors.make_pipeline_generator if streaming else SFQueryCollectors.gather_pipeline_records
+        return functools.partial(collector, pipeline=pipeline)
+
+    @staticmethod
+    def fetch_one_record(cursor: sf.DictCursor, unused: int, *, lazy_json: bool = False) -> JsonType:
+        plan: SFDecoderPlan = SFDecoderPlan.from_description(cursor.description, lazy_json=lazy_json)
+        return SFQueryCollectors._parse_results_to_json(cursor.fetchone(), plan)
+
+    @staticmethod
+    def fetch_n_records(cursor: sf.DictCursor, quantity: int, *, lazy_json: bool = False) -> list[JsonType]:
+        plan: SFDecoderPlan = SFDecoderPlan.from_description(cursor.description, lazy_json=lazy_json)
+        return SFQueryCollectors._parse_results_to_json(cursor.fetchmany(quantity), plan)
+
+    @staticmethod
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    def fetch_scalar(cursor: sf_cursor.SnowflakeCursor, unused: int) -> Any:
+        """
+        Returns the first column of the first record, as returned by the connector, or None when there is no record.
+        Meant for short lookups (``SELECT CURRENT_ROLE()``, ``SELECT COUNT(*) ...``).
+        """
+        row: tuple | None = cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    @uncacheable
+    def fetch_arrow_batches(cursor: sf_cursor.SnowflakeCursor, unused: int) -> Generator[pyarrow.RecordBatch, None, None]:
+        """
+        Streams the records as ``pyarrow.RecordBatch`` objects, decoded by the connector straight from the Arrow result
+        chunks Snowflake sends: no Python object is built per record, and only the current chunk is held in memory.
+
+        Requires ``pyarrow`` (``snowflake-connector-python[pandas]``) and the Arrow result format, Snowflake's default.
+        """
+        for table in cursor.fetch_arrow_batches():
+            yield from table.to_batches()
+
+    @staticmethod
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    @uncacheable
+    def fetch_arrow_table(cursor: sf_cursor.SnowflakeCursor, unused: int) -> pyarrow.Table:
+        """
+        Returns all the records as a single ``pyarrow.Table``, see ``fetch_arrow_batches()``. An empty result gives an empty
+        table with the result's column names.
+        """
+        table: pyarrow.Table | None = cursor.fetch_arrow_all()
+        if table is None:
+            import pyarrow  # pylint: disable=import-outside-toplevel,redefined-outer-name
+            table = pyarrow.table({column[0]: [] for column in cursor.description or []})
+        return table
+
+    @staticmethod
+    @uses_cursor(sf_cursor.SnowflakeCursor)
+    def fetch_numpy_columns(cursor: sf_cursor.SnowflakeCursor, batch_size: int) -> dict[str, numpy.ndarray]:
+        """
+        Returns the records as one ``numpy.ndarray`` per column, by column name. Records are fetched as tuples, *batch_size*
+        at a time (10 000 when smaller than 2), and each batch is converted column by column.
+
+        Dtypes come from the result description, see ``SnowflakeDataTypes.to_numpy_dtype()``. An INTEGER column holding NULL
+        becomes ``float64`` (NaN), a BOOLEAN one ``object``; values a dtype cannot hold (e.g. NUMBER(38, 0) beyond
+        64 bits) make the column ``object``.
+
+        Requires ``numpy``.
+        """
+        import numpy  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        if batch_size < 2:
+            batch_size = _DEFAULT_FETCH_BATCH_SIZE
+
+        columns: list[SFColumn] = get_columns(cursor.description)
+        dtypes: list[str] = [column.data_type.to_numpy_dtype() for column in columns]
+        chunks: list[list[numpy.ndarray]] = [[] for _ in columns]
+        while batch := cursor.fetchmany(batch_size):
+            started_at: float = time.perf_counter()
+            for index, values in enumerate(zip(*batch)):
+                chunks[index].append(_make_numpy_array(values, dtypes[index]))
+            record_decode_time(time.perf_counter() - started_at)
+
+        return {
+            column.name: numpy.concatenate(column_chunks) if column_chunks else numpy.empty(0, dtype=dtype)
+            for column, dtype, column_chunks in zip(columns, dtypes, chunks)
+        }
+
+    @staticmethod
+    def _make_record_list(rows: list[tuple], plan: SFDecoderPlan, header: SFHeader) -> SFRecordList:
+        started_at: float = time.perf_counter()
+        record_class: type[SFRecord] = header.record_class
+        if plan.is_identity:
+            records: SFRecordList = SFRecordList(header, [record_class(row) for row in rows])
         else:
-            return results
+            records = SFRecordList(header, [record_class(plan.decode_values(row)) for row in rows])
+        record_decode_time(time.perf_counter() - started_at)
+        return records
+
+    @staticmethod
+    def _parse_results_to_json(
+            results: list[dict[str, Any]] | dict[str, Any] | None,
+            plan: SFDecoderPlan
+    ) -> list[JsonType] | JsonType | None:
+        started_at: float = time.perf_counter()
+        if isinstance(results, list):
+            results = plan.decode_records(results)
+        elif isinstance(results, dict):
+            results = plan.decode_record(results)
+        record_decode_time(time.perf_counter() - started_at)
+        return results
+
+
+def _stream_batches(cursor: sf_cursor.SnowflakeCursor, batch_size: int, decode_batch: Callable[[list], Any]) -> Generator[Any, None, None]:
+    batch_size = max(batch_size, 1)
+    row_count: int = 0
+    started_at: float = time.perf_counter()
+    last_logged_at: float = started_at
+    while True:
+        batch: list = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+
+        row_count += len(batch)
+        yield decode_batch(batch)
+
+        now: float = time.perf_counter()
+        if now - last_logged_at >= _PROGRESS_LOG_INTERVAL:
+            LOGGER.info('Streamed %d rows (%.0f rows/s)', row_count, row_count / (now - started_at))
+            last_logged_at = now
+
+    elapsed: float = time.perf_counter() - started_at
+    LOGGER.info('Streamed %d rows in %.2fs (%.0f rows/s)', row_count, elapsed, row_count / elapsed if elapsed > 0 else 0.0)
+
+
+def _make_numpy_array(values: tuple[Any, ...], dtype: str) -> numpy.ndarray:
+    import numpy  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    if dtype in ('int64', 'bool') and None in values:
+        dtype = 'float64' if dtype == 'int64' else 'object'
+
+    try:
+        return numpy.array(values, dtype=dtype)
+    except (TypeError, ValueError, OverflowError):
+        return numpy.array(values, dtype='object')
@@ -5,18 +5,62 @@ from typing import Any, Generator
 from empire_commons.types_ import JsonType
 
 from esql.connection.base_query_result import BaseQueryResult
+from esql.connection.snowflake.sf_query_statistics import SFQueryStatistics
+from esql.connection.snowflake.sf_records import SFHeader, SFRecordList
 
 
 class SFQueryResult(BaseQueryResult):
     __slots__ = (
         'query_id',
+        'statistics'
     )
 
     def __init__(
             self,
             query_id: str | None,
             error_message: str | None,
-            results: JsonType | Generator[JsonType, Any, None] | None
+            results: JsonType | Generator[JsonType, Any, None] | None,
+            statistics: SFQueryStatistics | None = None
     ):
+        """
+        :param statistics: Execution statistics, see :class:`esql.connection.snowflake.sf_query_statistics.SFQueryStatistics`.
+            For lazy results, fetching and decoding times grow as the results are consumed.
+        """
         super().__init__(error_message, results)
         self.query_id: str = query_id
+        self.statistics: SFQueryStatistics | None = statistics
+
+    @property
+    def query_ids(self) -> list[str | None]:
+        """
+        Returns the query ID of each merged result, in order; for a result that was not merged, its own query ID
+        """
+        if self.parts:
+            return [query_id for part in self.parts for query_id in getattr(part, 'query_ids', [None])]
+        return [self.query_id]
+
+    @classmethod
+    def _concatenate(cls, results: list[Any]) -> list[Any]:
+        """
+        Keeps compact records in an ``SFRecordList`` when every result shares the same header
+        """
+        records: list[Any] = super()._concatenate(results)
+        headers: set[SFHeader | None] = {getattr(part, 'header', None) for part in results}
+        if len(headers) == 1 and None not in headers:
+            return SFRecordList(headers.pop(), records)
+        return records
+
+    @classmethod
+    def _make_merged(cls, error: str | None, results: Any, parts: tuple[BaseQueryResult, ...]) -> SFQueryResult:
+        query_ids: set[str | None] = {getattr(part, 'query_id', None) for part in parts}
+        merged: SFQueryResult = SFQueryResult(query_ids.pop() if len(query_ids) == 1 else None, error, results)
+        merged.parts = parts
+        return merged
+
+    @property
+    def header(self) -> SFHeader | None:
+        """
+        Returns the column names shared by compact records (see ``SFQueryCollectors.gather_compact_records()``), None for
+        other results
+        """
+        return getattr(self.results, 'header', None)
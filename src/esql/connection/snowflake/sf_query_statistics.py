@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Generator
+
+_CURRENT_STATISTICS: ContextVar[SFQueryStatistics | None] = ContextVar('esql_sf_query_statistics', default=None)
+
+
+class SFQueryStatistics:
+    """
+    Where the time of a query went.
+
+    Client-side measures are always captured, at the cost of a few clock reads per query and per fetched batch:
+
+    - execute_time: Seconds spent in ``cursor.execute()``: submission, compilation, execution and first result chunk
+    - fetch_time: Seconds spent in the collector, decoding excluded: mostly downloading result chunks
+    - decode_time: Seconds spent decoding records (JSON parsing, conversions, pipelines, structs)
+    - row_count: Number of rows of the result, as reported by Snowflake
+    - warehouse: Warehouse of the session when the query was sent
+
+    Server-side measures are None until ``SFConnection.fetch_query_statistics()`` reads them from the query history:
+    compile_time, execution_time, queued_time (seconds) and bytes_scanned.
+    """
+    __slots__ = (
+        'warehouse',
+        'row_count',
+        'execute_time',
+        'fetch_time',
+        'decode_time',
+        'compile_time',
+        'execution_time',
+        'queued_time',
+        'bytes_scanned'
+    )
+
+    def __init__(self, warehouse: str | None = None):
+        self.warehouse: str | None = warehouse
+        self.row_count: int | None = None
+        self.execute_time: float = 0.0
+        self.fetch_time: float = 0.0
+        self.decode_time: float = 0.0
+        self.compile_time: float | None = None
+        self.execution_time: float | None = None
+        self.queued_time: float | None = None
+        self.bytes_scanned: int | None = None
+
+    @property
+    def client_time(self) -> float:
+        return self.execute_time + self.fetch_time + self.decode_time
+
+    def run_collector(self, collector_method: Callable[[Any, int], Any], cursor: Any, batch_size: int) -> Any:
+        """
+        Calls *collector_method*, accounting its time as fetching and decoding
+        """
+        token: Token = _CURRENT_STATISTICS.set(self)
+        decode_time: float = self.decode_time
+        started_at: float = time.perf_counter()
+        try:
+            return collector_method(cursor, batch_size)
+        finally:
+            self.fetch_time += time.perf_counter() - started_at - (self.decode_time - decode_time)
+            _CURRENT_STATISTICS.reset(token)
+
+    def follow(self, results: Generator[Any, None, None]) -> Generator[Any, None, None]:
+        """
+        Wraps lazy *results* so the time spent producing each item is accounted as fetching and decoding
+        """
+        while True:
+            token: Token = _CURRENT_STATISTICS.set(self)
+            decode_time: float = self.decode_time
+            started_at: float = time.perf_counter()
+            try:
+                item: Any = next(results)
+            except StopIteration:
+                return
+            finally:
+                self.fetch_time += time.perf_counter() - started_at - (self.decode_time - decode_time)
+                _CURRENT_STATISTICS.reset(token)
+            yield item
+
+    def __repr__(self) -> str:
+        return f'''SFQueryStatistics(
+    warehouse={self.warehouse},
+    row_count={self.row_count},
+    execute_time={self.execute_time:.3f},
+    fetch_time={self.fetch_time:.3f},
+    decode_time={self.decode_time:.3f},
+    compile_time={self.compile_time},
+    execution_time={self.execution_time},
+    queued_time={self.queued_time},
+    bytes_scanned={self.bytes_scanned}
+)'''
+
+
+def record_decode_time(elapsed: float):
+    """
+    Adds *elapsed* seconds of decoding to the statistics of the query being collected, if any
+    """
+    statistics: SFQueryStatistics | None = _CURRENT_STATISTICS.get()
+    if statistics is not None:
+        statistics.decode_time += elapsed
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+
+class SFHeader:
+    """
+    Column names of a result, shared by all its records
+    """
+    __slots__ = (
+        'names',
+        '_indexes',
+        '_record_class'
+    )
+
+    def __init__(self, names: Sequence[str]):
+        self.names: tuple[str, ...] = tuple(names)
+        self._indexes: dict[str, int] = {name: index for index, name in enumerate(self.names)}
+        self._record_class: type[SFRecord] | None = None
+
+    @property
+    def record_class(self) -> type[SFRecord]:
+        """
+        Returns the ``SFRecord`` subclass bound to this header
+        """
+        if self._record_class is None:
+            self._record_class = type('SFRecord', (SFRecord,), {'__slots__': (), 'header': self})
+        return self._record_class
+
+    def index(self, name: str) -> int:
+        """
+        Returns the position of column *name*. With duplicated names, the last column wins, as with ``DictCursor``.
+        :raises KeyError: When there is no such column
+        """
+        return self._indexes[name]
+
+    def make_record(self, values: Iterable[Any]) -> SFRecord:
+        return self.record_class(values)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._indexes
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SFHeader) and self.names == other.names
+
+    def __hash__(self) -> int:
+        return hash(self.names)
+
+    def __reduce__(self):
+        return SFHeader, (self.names,)
+
+    def __repr__(self) -> str:
+        return f'SFHeader({", ".join(self.names)})'
+
+
+class SFRecord(tuple):
+    """
+    A record stored as a plain tuple. Column names live in the shared ``header``; values are reachable by position or by
+    name (``record['NAME']``, ``record.get('NAME')``), and ``to_dict()`` builds the equivalent ``DictCursor`` row.
+    """
+    __slots__ = ()
+
+    header: SFHeader
+
+    def __getitem__(self, key: int | slice | str) -> Any:
+        if isinstance(key, str):
+            key = self.header.index(key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name not in self.header:
+            return default
+        return tuple.__getitem__(self, self.header.index(name))
+
+    def to_dict(self) -> dict[str, Any]:
+        return dict(zip(self.header.names, self))
+
+    def __reduce__(self):
+        return _rebuild_record, (self.header, tuple(self))
+
+    def __repr__(self) -> str:
+        return f'SFRecord({", ".join(f"{name}={value!r}" for name, value in zip(self.header.names, self))})'
+
+
+class SFRecordList(list):
+    """
+    Records sharing the same *header*
+    """
+    __slots__ = (
+        'header',
+    )
+
+    def __init__(self, header: SFHeader, records: Iterable[SFRecord] = ()):
+        super().__init__(records)
+        self.header: SFHeader = header
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        names: tuple[str, ...] = self.header.names
+        return [dict(zip(names, record)) for record in self]
+
+    def __reduce__(self):
+        return SFRecordList, (self.header, list(self))
+
+
+def _rebuild_record(header: SFHeader, values: tuple[Any, ...]) -> SFRecord:
+    return header.make_record(values)
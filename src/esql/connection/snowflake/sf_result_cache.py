@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Final
+
+from esql.connection.base_result_cache import BaseResultCache, CachedResult, normalize_table_name
+from esql.connection.snowflake.sf_spilled_records import estimate_record_size, estimate_value_size
+
+CACHEABLE_RESULT_TYPES: Final[tuple[type, ...]] = (list, tuple, dict, str, int, float, bool)
+
+
+def describe_collector(collector_method: Callable[[Any, int], Any]) -> str:
+    """
+    Returns a description of *collector_method* and of the options bound with ``functools.partial``, stable across
+    processes, to key cached results with
+    """
+    function: Callable[..., Any] = getattr(collector_method, 'func', collector_method)
+    description: str = f'{getattr(function, "__module__", "")}.{getattr(function, "__qualname__", repr(function))}'
+    arguments: tuple[Any, ...] = getattr(collector_method, 'args', ())
+    keywords: dict[str, Any] = getattr(collector_method, 'keywords', {})
+    if arguments or keywords:
+        description += repr((arguments, sorted(keywords.items())))
+    return description
+
+
+def estimate_result_size(results: Any) -> int:
+    """
+    Estimation of the memory held by *results*, object headers included. Dict records of a list are sized by
+    ``sf_spilled_records.estimate_record_size()`` (their keys are shared), arrays (columnar results) by their ``nbytes``
+    and their items when they hold objects, everything else by ``sf_spilled_records.estimate_value_size()``.
+    """
+    if isinstance(results, list):
+        return sys.getsizeof(results) + sum(
+            estimate_record_size(item) if isinstance(item, dict) else estimate_result_size(item) for item in results
+        )
+    if isinstance(results, tuple):
+        return sys.getsizeof(results) + sum(estimate_result_size(item) for item in results)
+    if isinstance(results, dict):
+        return sys.getsizeof(results) + sum(estimate_value_size(key) + estimate_result_size(value) for key, value in results.items())
+
+    nbytes: Any = getattr(results, 'nbytes', None)
+    if isinstance(nbytes, int):
+        size: int = max(sys.getsizeof(results), nbytes)  # getsizeof() counts the buffer of arrays owning it only
+        if getattr(getattr(results, 'dtype', None), 'hasobject', False):
+            size += sum(estimate_value_size(item) for item in results.flat)
+        return size
+    return estimate_value_size(results)
+
+
+class SFResultCache(BaseResultCache):
+    """
+    In-memory query result cache, bounded by the estimated size of the results and evicting the least recently used
+    entries first. A hit is a dictionary lookup: results are shared, not copied.
+
+    Plug it into ``SFConnection(result_cache=...)``.
+    """
+    __slots__ = (
+        'max_bytes',
+        'size',
+        'eviction_count',
+        '_entries',
+        '_table_keys',
+        '_lock'
+    )
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, default_ttl: float = 60.0):
+        """
+        :param max_bytes: Estimated number of bytes of results kept; larger results are not cached
+        :param default_ttl: See ``BaseResultCache``
+        """
+        super().__init__(default_ttl)
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+        self.eviction_count: int = 0
+        self._entries: OrderedDict[str, tuple[CachedResult, int]] = OrderedDict()
+        self._table_keys: dict[str, set[str]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _invalidate(self, table: str) -> int:
+        with self._lock:
+            keys: set[str] = self._table_keys.pop(normalize_table_name(table), set())
+            for key in keys:
+                self._discard_locked(key)
+            return len(keys)
+
+    def _clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._table_keys.clear()
+            self.size = 0
+
+    def _load(self, key: str) -> CachedResult | None:
+        with self._lock:
+            item: tuple[CachedResult, int] | None = self._entries.get(key)
+            if item is None:
+                return None
+            self._entries.move_to_end(key)
+            return item[0]
+
+    def _store(self, key: str, entry: CachedResult) -> bool:
+        if not isinstance(entry.results, CACHEABLE_RESULT_TYPES):
+            return False
+        entry_size: int = estimate_result_size(entry.results)
+        if entry_size > self.max_bytes:
+            return False
+
+        with self._lock:
+            self._discard_locked(key)
+            self._entries[key] = (entry, entry_size)
+            self.size += entry_size
+            for table in entry.tables:
+                self._table_keys.setdefault(table, set()).add(key)
+
+            while self.size > self.max_bytes:
+                self._discard_locked(next(iter(self._entries)))
+                self.eviction_count += 1
+        return True
+
+    def _discard(self, key: str):
+        with self._lock:
+            self._discard_locked(key)
+
+    def _discard_locked(self, key: str):
+        item: tuple[CachedResult, int] | None = self._entries.pop(key, None)
+        if item is None:
+            return
+
+        entry, entry_size = item
+        self.size -= entry_size
+        for table in entry.tables:
+            keys: set[str] | None = self._table_keys.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._table_keys[table]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f'SFResultCache(entries={len(self._entries)}, size={self.size}, max_bytes={self.max_bytes}, '
+            f'hits={self.hit_count}, misses={self.miss_count})'
+        )
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from esql.connection.snowflake.sf_columns import SFColumn, get_columns
+from esql.connection.snowflake.sf_decoder_plan import SEMI_STRUCTURED_TYPES, TYPE_CONVERTERS, normalize_whitespace, parse_semi_structured
+from esql.connection.snowflake.sf_lazy_json import SFLazyJson
+from esql.connection.snowflake.sf_query_statistics import record_decode_time
+from esql.sql_.adapters.snowflake.snowflake_data_types import SnowflakeDataTypes
+
+_CONVERSION_TIMING: str = 'convert'
+
+
+@dataclass(frozen=True, slots=True)
+class Normalize:
+    """
+    Replaces new lines and runs of whitespace with a single space. Defaults to all the text columns.
+    """
+    columns: tuple[str, ...] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Parse:
+    """
+    Parses JSON text; with *lazy*, wraps it in a :class:`SFLazyJson` instead. Defaults to all the VARIANT, OBJECT and ARRAY
+    columns.
+    """
+    columns: tuple[str, ...] | None = None
+    lazy: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Cast:
+    """
+    Converts the values of *columns* with *to*: a Snowflake type (its ``get_initializer()``, values already of the matching
+    Python type are kept) or any callable. DATE gives ``datetime.date`` values (from dates, datetimes or ISO text) and
+    BOOLEAN parses text such as ``'true'`` / ``'false'``.
+    """
+    columns: tuple[str, ...]
+    to: SnowflakeDataTypes | Callable[[Any], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class Drop:
+    """
+    Removes *columns* from the output records
+    """
+    columns: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Rename:
+    """
+    Renames columns in the output records, by current name
+    """
+    mapping: dict[str, str] = field(default_factory=dict)
+
+
+PipelineStage = Normalize | Parse | Cast | Drop | Rename
+
+
+class SFRowPipeline:
+    """
+    Declarative post-processing of result records: a sequence of per-column stages, applied in order and referring to
+    columns by their name at that point of the pipeline:
+
+        SFRowPipeline([Parse(), Cast(('AMOUNT',), SnowflakeDataTypes.FLOAT), Drop(('RAW',)), Rename({'ID': 'id'})])
+
+    The pipeline is compiled once per result schema (``compile()``, cached) into a single row function, generated for
+    that schema: stages with nothing to do disappear, the functions of the remaining ones are inlined column by column,
+    and dropped or renamed columns fold into the record it builds, so only the requested work runs on each record. Time
+    spent converting records is accumulated in ``timings``, under ``'convert'``.
+
+    Use it with ``SFQueryCollectors.make_pipeline_collector()``; it then replaces the default decoding.
+    """
+    __slots__ = (
+        'stages',
+        'timings',
+        'row_count',
+        '_compiled',
+        '_lock'
+    )
+
+    def __init__(self, stages: Sequence[PipelineStage]):
+        self.stages: tuple[PipelineStage, ...] = tuple(stages)
+        self.timings: dict[str, float] = {}
+        self.row_count: int = 0
+        self._compiled: OrderedDict[tuple[SFColumn, ...], SFCompiledPipeline] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def default(*, lazy_json: bool = False) -> SFRowPipeline:
+        """
+        Returns the pipeline equivalent to the default decoding (see ``SFDecoderPlan``)
+        """
+        return SFRowPipeline([Normalize(), Parse(lazy=lazy_json)])
+
+    def compile(self, columns: Sequence[SFColumn]) -> SFCompiledPipeline:
+        key: tuple[SFColumn, ...] = tuple(columns)
+        with self._lock:
+            compiled: SFCompiledPipeline | None = self._compiled.get(key)
+            if compiled is None:
+                compiled = self._compiled[key] = SFCompiledPipeline(self, key)
+                while len(self._compiled) > 32:
+                    self._compiled.popitem(last=False)
+            return compiled
+
+    def compile_description(self, description: Sequence[Any] | None) -> SFCompiledPipeline:
+        return self.compile(get_columns(description))
+
+    def _record_timings(self, timings: dict[str, float], row_count: int):
+        with self._lock:
+            for label, elapsed in timings.items():
+                self.timings[label] = self.timings.get(label, 0.0) + elapsed
+            self.row_count += row_count
+
+    def __repr__(self) -> str:
+        return f'SFRowPipeline({", ".join(repr(stage) for stage in self.stages)})'
+
+
+class SFCompiledPipeline:
+    """
+    A pipeline specialized for one result schema, see :class:`SFRowPipeline`. Records are built by ``convert_row()``, a
+    function generated for the schema: each output column is read at its position and goes through the functions of
+    its stages, inlined in order, without looping over columns or stages.
+    """
+    __slots__ = (
+        'pipeline',
+        'columns',
+        'output_names',
+        'stage_labels',
+        'convert_row'
+    )
+
+    def __init__(self, pipeline: SFRowPipeline, columns: tuple[SFColumn, ...]):
+        self.pipeline: SFRowPipeline = pipeline
+        self.columns: tuple[SFColumn, ...] = columns
+
+        names: list[str | None] = [column.name for column in columns]
+        functions: list[list[Callable[[Any], Any]]] = [[] for _ in columns]
+        stage_labels: list[str] = []
+        for position, stage in enumerate(pipeline.stages):
+            label: str = f'{position}:{type(stage).__name__.lower()}'
+            if isinstance(stage, Drop):
+                for index in _resolve(names, stage.columns, label):
+                    names[index] = None
+                    functions[index] = []
+            elif isinstance(stage, Rename):
+                for index in _resolve(names, tuple(stage.mapping), label):
+                    names[index] = stage.mapping[names[index]]
+            else:
+                operations: tuple[tuple[int, Callable[[Any], Any]], ...] = self._compile_value_stage(stage, names, label)
+                for index, function in operations:
+                    functions[index].append(function)
+                if operations:
+                    stage_labels.append(label)
+
+        output_indexes: tuple[int, ...] = tuple(index for index, name in enumerate(names) if name is not None)
+        self.output_names: tuple[str, ...] = tuple(names[index] for index in output_indexes)
+        self.stage_labels: tuple[str, ...] = tuple(stage_labels)
+        self.convert_row: Callable[[Sequence[Any]], dict[str, Any]] = _make_row_converter(
+            [(names[index], index, tuple(functions[index])) for index in output_indexes]
+        )
+
+    def _compile_value_stage(
+            self,
+            stage: Normalize | Parse | Cast,
+            names: list[str | None],
+            label: str
+    ) -> tuple[tuple[int, Callable[[Any], Any]], ...]:
+        if isinstance(stage, Normalize):
+            indexes: list[int] = _resolve(names, stage.columns, label) if stage.columns is not None else [
+                index for index, column in enumerate(self.columns) if names[index] is not None and column.data_type == SnowflakeDataTypes.STRING
+            ]
+            return tuple((index, normalize_whitespace) for index in indexes)
+
+        if isinstance(stage, Parse):
+            indexes = _resolve(names, stage.columns, label) if stage.columns is not None else [
+                index for index, column in enumerate(self.columns) if names[index] is not None and column.data_type in SEMI_STRUCTURED_TYPES
+            ]
+            return tuple((index, SFLazyJson if stage.lazy else parse_semi_structured) for index in indexes)
+
+        converter: Callable[[Any], Any] = _make_cast(stage.to)
+        return tuple((index, converter) for index in _resolve(names, stage.columns, label))
+
+    def process(self, rows: Sequence[Sequence[Any]]) -> list[dict[str, Any]]:
+        """
+        Runs the pipeline on a batch of records fetched as tuples and returns the output records
+        """
+        started_at: float = time.perf_counter()
+        convert_row: Callable[[Sequence[Any]], dict[str, Any]] = self.convert_row
+        records: list[dict[str, Any]] = [convert_row(row) for row in rows]
+        elapsed: float = time.perf_counter() - started_at
+        record_decode_time(elapsed)
+
+        self.pipeline._record_timings({_CONVERSION_TIMING: elapsed}, len(records))  # pylint: disable=protected-access
+        return records
+
+
+def _make_row_converter(output: Sequence[tuple[str, int, tuple[Callable[[Any], Any], ...]]]) -> Callable[[Sequence[Any]], dict[str, Any]]:
+    """
+    Generates the function turning a row into a record whose keys are the names of *output*, each value read at its
+    index and, unless None, passed through its functions in order (a function returning None ends the chain)
+    """
+    namespace: dict[str, Any] = {}
+    lines: list[str] = ['def convert_row(row):']
+    items: list[str] = []
+    for position, (name, index, functions) in enumerate(output):
+        if not functions:
+            items.append(f'{name!r}: row[{index}]')
+            continue
+
+        variable: str = f'v{position}'
+        lines.append(f'    {variable} = row[{index}]')
+        indent: str = '    '
+        for function_position, function in enumerate(functions):
+            function_name: str = f'f{position}_{function_position}'
+            namespace[function_name] = function
+            lines.append(f'{indent}if {variable} is not None:')
+            indent += '    '
+            lines.append(f'{indent}{variable} = {function_name}({variable})')
+        items.append(f'{name!r}: {variable}')
+    lines.append(f'    return {{{", ".join(items)}}}')
+
+    exec('\n'.join(lines), namespace)  # pylint: disable=exec-used
+    return namespace['convert_row']
+
+
+def _resolve(names: list[str | None], columns: Sequence[str] | str, label: str) -> list[int]:
+    if isinstance(columns, str):
+        columns = (columns,)
+
+    indexes: list[int] = []
+    for name in columns:
+        try:
+            indexes.append(names.index(name))
+        except ValueError:
+            raise ValueError(f'Pipeline stage {label}: no column named {name} at this point') from None
+    return indexes
+
+
+def _make_cast(to: SnowflakeDataTypes | Callable[[Any], Any]) -> Callable[[Any], Any]:
+    if not isinstance(to, SnowflakeDataTypes):
+        return to
+    if to in TYPE_CONVERTERS:
+        return TYPE_CONVERTERS[to]
+
+    initializer: Callable[[Any], Any] = to.get_initializer()
+    python_type: Any = to.to_python()
+    if not isinstance(python_type, type):
+        return initializer
+
+    def _cast(value: Any) -> Any:
+        return value if isinstance(value, python_type) else initializer(value)
+    return _cast
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Final
+
+from esql.sql_.adapters.snowflake.stmt_components.snowflake_identifiers import SnowflakeIdentifiers
+from esql.sql_.adapters.snowflake.stmt_components.snowflake_values import SnowflakeValues
+
+_DEFAULT_SCHEMA: str = 'PUBLIC'
+_PLAIN_IDENTIFIER_REGEX: Final[re.Pattern] = re.compile(r'[A-Z_][A-Z0-9_$]*')
+
+
+def _resolve_identifier(identifier: str | None) -> str | None:
+    """
+    Returns the name *identifier* resolves to, as the connector reports it: the content of a quoted identifier, otherwise
+    the identifier in uppercase (see ``SnowflakeIdentifiers.format_identifier()``)
+    """
+    if not identifier:
+        return None
+    if len(identifier) > 1 and identifier.startswith('"') and identifier.endswith('"'):
+        return identifier[1:-1].replace('""', '"')
+    return identifier.upper()
+
+
+def format_exact_identifier(name: str | None) -> str | None:
+    """
+    Returns the identifier of the object named exactly *name*, as the connector reports it: *name* itself when it is a
+    plain uppercase identifier, otherwise *name* quoted, so that its case and special characters are kept
+    """
+    if not name or _PLAIN_IDENTIFIER_REGEX.fullmatch(name):
+        return name
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _normalize_parameter_value(value: Any) -> str:
+    """
+    ``SHOW PARAMETERS`` reports every value as a string, booleans in lowercase
+    """
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+class SFSessionContext:
+    """
+    Last known role, warehouse, database, schema and session parameters of a Snowflake session. Role, warehouse,
+    database and schema are the names the objects resolve to, as the connector reports them (``"My_Db"`` is ``My_Db``,
+    ``my_db`` is ``MY_DB``).
+
+    ``plan()`` turns a requested context into the ``USE`` / ``ALTER SESSION`` statements that actually change something,
+    ``apply()`` records the requested context once those statements succeeded. *parameters* is None until it has been
+    seeded from ``SHOW PARAMETERS IN SESSION``; as long as it is None, parameter changes cannot be elided.
+    """
+    __slots__ = (
+        'role',
+        'warehouse',
+        'database',
+        'schema',
+        'parameters'
+    )
+
+    def __init__(
+            self,
+            role: str | None = None,
+            warehouse: str | None = None,
+            database: str | None = None,
+            schema: str | None = None,
+            parameters: dict[str, str] | None = None
+    ):
+        self.role: str | None = role
+        self.warehouse: str | None = warehouse
+        self.database: str | None = database
+        self.schema: str | None = schema
+        self.parameters: dict[str, str] | None = parameters
+
+    def plan(
+            self,
+            *,
+            role: str | None = None,
+            warehouse: str | None = None,
+            database: str | None = None,
+            schema: str | None = None,
+            parameters: dict[str, Any] | None = None
+    ) -> list[str]:
+        """
+        Returns the statements needed to move the session to the requested context, in the order they must run.
+        Arguments left to None are not changed.
+        """
+        statements: list[str] = []
+
+        if role and _resolve_identifier(role) != self.role:
+            statements.append(f'USE ROLE {SnowflakeIdentifiers.format_identifier(role)}')
+        if warehouse and _resolve_identifier(warehouse) != self.warehouse:
+            statements.append(f'USE WAREHOUSE {SnowflakeIdentifiers.format_identifier(warehouse)}')
+
+        changes_database: bool = bool(database) and _resolve_identifier(database) != self.database
+        if changes_database:
+            statements.append(f'USE DATABASE {SnowflakeIdentifiers.format_identifier(database)}')
+        if schema and (changes_database or _resolve_identifier(schema) != self.schema):
+            statements.append(f'USE SCHEMA {SnowflakeIdentifiers.format_identifier(schema)}')
+
+        changed_parameters: dict[str, Any] = self._get_changed_parameters(parameters)
+        if changed_parameters:
+            statements.append('ALTER SESSION SET ' + ', '.join(
+                f'{key} = {SnowflakeValues.prepare_value_by_deducing_python_type(value)}' for key, value in changed_parameters.items()
+            ))
+
+        return statements
+
+    def apply(
+            self,
+            *,
+            role: str | None = None,
+            warehouse: str | None = None,
+            database: str | None = None,
+            schema: str | None = None,
+            parameters: dict[str, Any] | None = None
+    ):
+        """
+        Records the requested context as the current one
+        """
+        if role:
+            self.role = _resolve_identifier(role)
+        if warehouse:
+            self.warehouse = _resolve_identifier(warehouse)
+        if database and _resolve_identifier(database) != self.database:
+            self.database = _resolve_identifier(database)
+            self.schema = _DEFAULT_SCHEMA  # USE DATABASE resets the current schema
+        if schema:
+            self.schema = _resolve_identifier(schema)
+        if parameters and self.parameters is not None:
+            self.parameters.update({key.upper(): _normalize_parameter_value(value) for key, value in parameters.items()})
+
+    def _get_changed_parameters(self, parameters: dict[str, Any] | None) -> dict[str, Any]:
+        if not parameters:
+            return {}
+        if self.parameters is None:
+            return {key.upper(): value for key, value in parameters.items()}
+
+        return {
+            key.upper(): value for key, value in parameters.items()
+            if self.parameters.get(key.upper()) != _normalize_parameter_value(value)
+        }
+
+    def __repr__(self) -> str:
+        return f'''SFSessionContext(
+    role={self.role},
+    warehouse={self.warehouse},
+    database={self.database},
+    schema={self.schema},
+    parameters={len(self.parameters) if self.parameters is not None else None}
+)'''
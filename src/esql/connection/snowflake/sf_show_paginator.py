@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Any, Callable, Final, Generator, Iterator, TYPE_CHECKING
+
+from esql._internal.ref import DEFAULT_REPORTER
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+
+if TYPE_CHECKING:
+    from esql.connection.snowflake.sf_connection import SFConnection
+
+LOGGER = DEFAULT_REPORTER
+
+_IDENTITY_COLUMNS: Final[tuple[str, ...]] = ('database_name', 'schema_name', 'name')
+
+
+class SFShowPaginator:
+    """
+    Walks the output of a SHOW command page by page, with ``LIMIT <page_size> FROM '<last name>'``:
+
+        for table in connection.paginate_show(SnowflakeListers.list_tables, in_schema='DB.SCHEMA'):
+            ...
+
+    *lister* is a ``SnowflakeListers`` method accepting *limit* and *limit_filter*. SHOW sorts its output by name
+    within the container listed, so the name of the last row of a page is the cursor of the next one; rows of the
+    previous page the cursor returns again are skipped. With *prefetch*, the next page is requested, on the connection's
+    I/O threads, as soon as the current one arrives, so it downloads while the current page is consumed. At most two
+    pages are held in memory.
+
+    Iteration stops at the first failed page; ``error`` and ``query_id`` then describe the failure.
+    """
+    __slots__ = (
+        'page_size',
+        'prefetch',
+        'verbose',
+        'page_count',
+        'row_count',
+        'query_id',
+        'error',
+        '_connection',
+        '_lister',
+        '_lister_parameters'
+    )
+
+    def __init__(
+            self,
+            connection: SFConnection,
+            lister: Callable[..., str],
+            *,
+            page_size: int = 1000,
+            prefetch: bool = True,
+            verbose: bool = False,
+            **lister_parameters: Any
+    ):
+        """
+        :param lister: Builds the SHOW command, called with *limit*, *limit_filter* and *lister_parameters*
+        :param page_size: Number of rows per page; SHOW accepts at most 10000
+        :param prefetch: When true, requests the next page while the current one is consumed
+        :param verbose: When true, logs the execution of each page
+        """
+        if page_size < 2:
+            raise ValueError(f'page_size must be at least 2, got {page_size}')
+
+        self.page_size: int = page_size
+        self.prefetch: bool = prefetch
+        self.verbose: bool = verbose
+        self.page_count: int = 0
+        self.row_count: int = 0
+        self.query_id: str | None = None
+        self.error: str | None = None
+        self._connection: SFConnection = connection
+        self._lister: Callable[..., str] = lister
+        self._lister_parameters: dict[str, Any] = lister_parameters
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return self.iter_records()
+
+    def iter_pages(self) -> Generator[list[dict[str, Any]], None, None]:
+        """
+        Yields the rows of each page, without the rows already yielded with the previous page
+        """
+        next_page: Future | None = None
+        try:
+            page: list[dict[str, Any]] | None = self._fetch_page(None)
+            previous_keys: set[tuple[Any, ...]] = set()
+            while page is not None:
+                new_rows: list[dict[str, Any]] = [row for row in page if _get_identity(row) not in previous_keys]
+                is_last: bool = len(page) < self.page_size
+                if not is_last and not new_rows:
+                    self.error = (
+                        f'More than {self.page_size} rows share the name {page[-1].get("name")!r}: '
+                        f'increase page_size to page past them'
+                    )
+                    LOGGER.warn('SHOW pagination stopped: %s', self.error)
+                    return
+
+                cursor: str | None = None if is_last else page[-1].get('name')
+                if cursor is not None and self.prefetch:
+                    next_page = self._connection.get_io_executor().submit(self._fetch_page, cursor)
+
+                if new_rows:
+                    self.row_count += len(new_rows)
+                    yield new_rows
+
+                if cursor is None:
+                    return
+                previous_keys = {_get_identity(row) for row in page if row.get('name') == cursor}
+                if next_page is not None:
+                    page, next_page = next_page.result(), None
+                else:
+                    page = self._fetch_page(cursor)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    def iter_records(self) -> Generator[dict[str, Any], None, None]:
+        for rows in self.iter_pages():
+            yield from rows
+
+    def _fetch_page(self, cursor: str | None) -> list[dict[str, Any]] | None:
+        query: str = self._lister(limit=self.page_size, limit_filter=cursor, **self._lister_parameters)
+        result: SFQueryResult = self._connection.execute_query(
+            query,
+            collector_method=SFQueryCollectors.gather_all_records,
+            verbose=self.verbose,
+            idempotent=True
+        )
+        self.page_count += 1
+        self.query_id = result.query_id
+        if result.is_errored:
+            self.error = result.error
+            LOGGER.warn('SHOW pagination stopped at page %d: %s', self.page_count, result.error)
+            return None
+        return result.results
+
+    def __repr__(self) -> str:
+        return f'SFShowPaginator(page_size={self.page_size}, pages={self.page_count}, rows={self.row_count})'
+
+
+def _get_identity(row: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(row.get(column) for column in _IDENTITY_COLUMNS)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import mmap
+import pickle
+import struct
+import sys
+import tempfile
+from typing import IO, Any, Final, Generator, Iterator
+
+_LENGTH_PREFIX: Final[struct.Struct] = struct.Struct('<Q')
+
+
+def estimate_value_size(value: Any) -> int:
+    """
+    Estimation of the memory held by *value*, object headers included: ``sys.getsizeof()`` of the value and, for lists,
+    tuples, sets and dicts, of their items, recursively. Objects shared between values (small ints, interned strings)
+    are counted each time.
+    """
+    size: int = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(estimate_value_size(key) + estimate_value_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_value_size(item) for item in value)
+    return size
+
+
+def estimate_record_size(record: Any) -> int:
+    """
+    Estimation of the memory held by a record (dict or tuple), see ``estimate_value_size()``. The keys of a dict record
+    are the column names every record shares: only the dict itself and its values are counted.
+    """
+    if isinstance(record, dict):
+        return sys.getsizeof(record) + sum(estimate_value_size(value) for value in record.values())
+    return estimate_value_size(record)
+
+
+class SFSpilledRecords:
+    """
+    Records kept in memory up to *memory_budget* bytes (estimated), then spilled to an anonymous temporary file.
+
+    Batches are appended in order; once the budget is exceeded, every following batch is pickled to the file, prefixed
+    by its length. ``seal()`` maps the file in memory: each batch is unpickled from a slice of the mapping, the file is
+    not read into intermediate buffers, but its records are rebuilt as new objects on every iteration. The records can be
+    iterated any number of times, in their original order.
+
+    Call ``close()`` (or use the object as a context manager) to release the file early; otherwise it is released when
+    the object is garbage-collected.
+    """
+    __slots__ = (
+        'memory_budget',
+        'spill_directory',
+        '_memory_batches',
+        '_memory_size',
+        '_file',
+        '_mapping',
+        '_spans',
+        '_record_count',
+        '_is_sealed'
+    )
+
+    def __init__(self, memory_budget: int, spill_directory: str | None = None):
+        """
+        :param memory_budget: Estimated number of bytes of records kept in memory
+        :param spill_directory: Directory of the temporary file, defaults to the system's
+        """
+        self.memory_budget: int = memory_budget
+        self.spill_directory: str | None = spill_directory
+        self._memory_batches: list[list[Any]] = []
+        self._memory_size: int = 0
+        self._file: IO[bytes] | None = None
+        self._mapping: mmap.mmap | None = None
+        self._spans: list[tuple[int, int]] = []
+        self._record_count: int = 0
+        self._is_sealed: bool = False
+
+    @property
+    def is_spilled(self) -> bool:
+        return self._file is not None
+
+    @property
+    def spilled_bytes(self) -> int:
+        return sum(length for _, length in self._spans) + _LENGTH_PREFIX.size * len(self._spans)
+
+    @property
+    def spilled_batch_count(self) -> int:
+        return len(self._spans)
+
+    def append_batch(self, records: list[Any]):
+        if self._is_sealed:
+            raise RuntimeError('Cannot append records once sealed')
+        if not records:
+            return
+
+        self._record_count += len(records)
+        if self._file is None:
+            batch_size: int = sum(estimate_record_size(record) for record in records)
+            if self._memory_size + batch_size <= self.memory_budget:
+                self._memory_batches.append(records)
+                self._memory_size += batch_size
+                return
+            self._file = tempfile.TemporaryFile(prefix='esql-spill-', dir=self.spill_directory)  # pylint: disable=consider-using-with
+
+        payload: bytes = pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)
+        offset: int = self._file.tell() + _LENGTH_PREFIX.size
+        self._file.write(_LENGTH_PREFIX.pack(len(payload)))
+        self._file.write(payload)
+        self._spans.append((offset, len(payload)))
+
+    def seal(self) -> SFSpilledRecords:
+        """
+        Ends the appending and maps the spill file for reading
+        """
+        if not self._is_sealed:
+            self._is_sealed = True
+            if self._file is not None:
+                self._file.flush()
+                self._mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def iter_batches(self) -> Generator[list[Any], None, None]:
+        self.seal()
+        yield from self._memory_batches
+        if self._spans:
+            if self._mapping is None:
+                raise ValueError('The spilled records are closed')
+            view: memoryview = memoryview(self._mapping)
+            try:
+                for offset, length in self._spans:
+                    yield pickle.loads(view[offset:offset + length])
+            finally:
+                view.release()
+
+    def close(self):
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+        if self._file is not None:
+            self._file.close()
+
+    def __iter__(self) -> Iterator[Any]:
+        for batch in self.iter_batches():
+            yield from batch
+
+    def __len__(self) -> int:
+        return self._record_count
+
+    def __enter__(self) -> SFSpilledRecords:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'SFSpilledRecords(records={self._record_count}, in_memory_batches={len(self._memory_batches)}, spilled_batches={len(self._spans)})'
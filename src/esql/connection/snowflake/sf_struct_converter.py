@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import re
+import types
+import typing
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Callable, Final, Generic, Literal, Sequence, TypeVar
+
+TypeStruct = TypeVar('TypeStruct')
+
+_TRUE_STRINGS: Final[frozenset[str]] = frozenset({'true', 't', 'yes', 'y', 'on', '1'})
+_NON_IDENTIFIER_REGEX: Final[re.Pattern] = re.compile(r'\W')
+
+
+def _normalize_name(name: str) -> str:
+    """
+    ``SHOW`` output columns are lowercase and some carry punctuation (``null?``)
+    """
+    return _NON_IDENTIFIER_REGEX.sub('', name.casefold())
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE_STRINGS
+    return bool(value)
+
+
+def _to_int(value: Any) -> int | None:
+    if isinstance(value, str) and not value.strip():
+        return None
+    return int(value)
+
+
+def _to_float(value: Any) -> float | None:
+    if isinstance(value, str) and not value.strip():
+        return None
+    return float(value)
+
+
+def _to_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
+
+
+def _to_time(value: Any) -> time:
+    return value if isinstance(value, time) else time.fromisoformat(str(value))
+
+
+def _make_enum_coercer(enum_class: type[Enum]) -> Callable[[Any], Any]:
+    by_folded_value: dict[str, Enum] = {str(member.value).casefold(): member for member in enum_class}
+    by_folded_value.update({member.name.casefold(): member for member in enum_class})
+
+    def _to_enum(value: Any) -> Any:
+        if isinstance(value, enum_class):
+            return value
+        return by_folded_value.get(str(value).casefold(), value)
+    return _to_enum
+
+
+_SCALAR_COERCERS: Final[dict[Any, Callable[[Any], Any]]] = {
+    bool: _to_bool,
+    int: _to_int,
+    float: _to_float,
+    datetime: _to_datetime,
+    time: _to_time,
+    str: str
+}
+
+
+def get_coercer(annotation: Any) -> Callable[[Any], Any] | None:
+    """
+    Returns the function converting a column value to a field annotated *annotation*, or None when values are kept as
+    they are. ``X | None`` is handled as ``X``; literals of strings as ``str``.
+    """
+    origin: Any = typing.get_origin(annotation)
+    if origin in (types.UnionType, typing.Union):
+        arguments: list[Any] = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        if len(arguments) != 1 and not all(typing.get_origin(argument) is Literal for argument in arguments):
+            return None
+        annotation = arguments[0]
+        origin = typing.get_origin(annotation)
+
+    if origin is Literal:
+        return str if all(isinstance(argument, str) for argument in typing.get_args(annotation)) else None
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _make_enum_coercer(annotation)
+    return _SCALAR_COERCERS.get(annotation)
+
+
+class SFStructConverter(Generic[TypeStruct]):
+    """
+    Turns records fetched as tuples into instances of the dataclass *struct*, for a given column layout.
+
+    Columns are matched to fields by name, ignoring case and punctuation, compiled once: unknown columns are ignored, fields without a
+    column get None, and each field gets the coercer of its annotation (``datetime``, ``bool``, ``int``, enumerations
+    such as ``WarehouseSizes``, ...). NULL values stay None. Use ``get_struct_converter()`` to share converters.
+    """
+    __slots__ = (
+        'struct',
+        'column_names',
+        '_getters'
+    )
+
+    def __init__(self, struct: type[TypeStruct], column_names: Sequence[str]):
+        if not dataclasses.is_dataclass(struct):
+            raise TypeError(f'{struct.__name__} is not a dataclass')
+
+        self.struct: type[TypeStruct] = struct
+        self.column_names: tuple[str, ...] = tuple(column_names)
+
+        indexes: dict[str, int] = {_normalize_name(name): index for index, name in enumerate(self.column_names)}
+        hints: dict[str, Any] = typing.get_type_hints(struct)
+        self._getters: tuple[tuple[int | None, Callable[[Any], Any] | None], ...] = tuple(
+            (indexes.get(_normalize_name(field.name)), get_coercer(hints.get(field.name)))
+            for field in dataclasses.fields(struct) if field.init
+        )
+
+    def convert(self, record: Sequence[Any]) -> TypeStruct:
+        values: list[Any] = []
+        for index, coercer in self._getters:
+            value: Any = None if index is None else record[index]
+            if coercer is not None and value is not None:
+                value = coercer(value)
+            values.append(value)
+        return self.struct(*values)
+
+    def convert_all(self, records: Sequence[Sequence[Any]]) -> list[TypeStruct]:
+        convert: Callable[[Sequence[Any]], TypeStruct] = self.convert
+        return [convert(record) for record in records]
+
+
+@functools.lru_cache(maxsize=128)
+def get_struct_converter(struct: type[TypeStruct], column_names: tuple[str, ...]) -> SFStructConverter[TypeStruct]:
+    """
+    Returns the converter of *struct* for records made of *column_names*, compiled on first use
+    """
+    return SFStructConverter(struct, column_names)
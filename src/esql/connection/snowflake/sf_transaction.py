@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Final, Generator, TYPE_CHECKING
+
+from empire_commons.types_ import JsonType, JsonListType
+
+from esql._internal.ref import DEFAULT_REPORTER
+from esql.connection.base_result_cache import get_referenced_tables
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+from esql.exceptions import TransactionFailedException
+
+if TYPE_CHECKING:
+    from esql.connection.snowflake.sf_connection import SFConnection
+
+LOGGER = DEFAULT_REPORTER
+
+_DML_STATEMENT_REGEX: Final[re.Pattern] = re.compile(r'^\s*(INSERT|UPDATE|DELETE|MERGE)\b', re.IGNORECASE)
+
+
+class SFTransaction:
+    """
+    Explicit transaction whose DML statements can be deferred.
+
+    With *buffer_dml*, ``INSERT``/``UPDATE``/``DELETE``/``MERGE`` statements are not sent when executed: they are sent
+    together, in a single multi-statement request, when *flush_size* of them are pending, before any other statement
+    (so reads see them) and at commit. ``BEGIN`` and ``COMMIT`` travel with them, so a unit of work made of writes only
+    costs one round trip. Deferred statements report their errors when they are sent, as a
+    :class:`esql.exceptions.TransactionFailedException`.
+
+    Obtained from ``SFConnection.transaction()``. Statements sent on the same connection outside this object, from any
+    thread, are part of the transaction as well. The statements sent invalidate the connection's *result_cache* as any
+    other; a rollback invalidates the tables they refer to again, since results cached meanwhile may hold rolled back rows.
+    """
+    __slots__ = (
+        'buffer_dml',
+        'flush_size',
+        'verbose',
+        'statement_count',
+        'round_trips',
+        '_connection',
+        '_pending',
+        '_pending_parameters',
+        '_sent_tables',
+        '_is_begun',
+        '_is_finished'
+    )
+
+    def __init__(self, connection: SFConnection, *, buffer_dml: bool = True, flush_size: int = 100, verbose: bool = False):
+        if flush_size < 1:
+            raise ValueError(f'flush_size must be at least 1, got {flush_size}')
+
+        self.buffer_dml: bool = buffer_dml
+        self.flush_size: int = flush_size
+        self.verbose: bool = verbose
+        self.statement_count: int = 0
+        self.round_trips: int = 0
+        self._connection: SFConnection = connection
+        self._pending: list[str] = []
+        self._pending_parameters: list[Any] = []
+        self._sent_tables: set[str] = set()
+        self._is_begun: bool = False
+        self._is_finished: bool = False
+
+    @property
+    def round_trips_saved(self) -> int:
+        """
+        Number of statements (``BEGIN`` and ``COMMIT`` included) that did not need their own round trip
+        """
+        return self.statement_count - self.round_trips
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def execute(
+            self,
+            query: str,
+            *query_parameters: Any,
+            collector_method: Callable[[Any, int], JsonType | JsonListType | Generator[JsonType, Any, None]] = SFQueryCollectors.gather_all_records,
+            batch_size: int = 1
+    ) -> SFQueryResult | None:
+        """
+        Executes *query* in the transaction.
+        :return: The result of the query, or None when the query was deferred
+        """
+        if self._is_finished:
+            raise RuntimeError('The transaction is already committed or rolled back')
+
+        if self.buffer_dml and _DML_STATEMENT_REGEX.match(query):
+            self._pending.append(query)
+            self._pending_parameters.extend(query_parameters)
+            if len(self._pending) >= self.flush_size:
+                self.flush()
+            return None
+
+        return self._send([query], query_parameters, collector_method, batch_size)[-1]
+
+    def flush(self):
+        """
+        Sends the deferred statements
+        """
+        if self._pending:
+            self._send([], ())
+
+    def commit(self):
+        """
+        Sends the deferred statements and commits. When nothing was executed, nothing is sent.
+        """
+        if self._is_finished:
+            return
+
+        if self._is_begun or self._pending:
+            try:
+                self._send(['COMMIT'], ())
+            except TransactionFailedException:
+                self.rollback()
+                raise
+
+        self._is_finished = True
+        LOGGER.debug('Transaction committed: %d statements in %d round trips (%d saved)', self.statement_count, self.round_trips,
+                     self.round_trips_saved)
+
+    def rollback(self):
+        """
+        Discards the deferred statements and, if anything was sent, rolls the transaction back
+        """
+        if self._is_finished:
+            return
+
+        discarded: int = len(self._pending)
+        self._pending = []
+        self._pending_parameters = []
+        self._is_finished = True
+
+        if self._is_begun:
+            self._connection.execute_query('ROLLBACK', verbose=self.verbose)
+            self.round_trips += 1
+            self.statement_count += 1
+            if self._connection.result_cache is not None:
+                for table in self._sent_tables:
+                    self._connection.result_cache.invalidate(table)
+        LOGGER.debug('Transaction rolled back, %d deferred statement(s) discarded', discarded)
+
+    def _send(
+            self,
+            statements: list[str],
+            query_parameters: tuple[Any, ...],
+            collector_method: Callable[[Any, int], Any] = SFQueryCollectors.gather_all_records,
+            batch_size: int = 1
+    ) -> list[SFQueryResult]:
+        script: list[str] = (['BEGIN'] if not self._is_begun else []) + self._pending + statements
+        script_parameters: tuple[Any, ...] = (*self._pending_parameters, *query_parameters)
+        self._pending = []
+        self._pending_parameters = []
+        self._is_begun = True
+        for statement in script:
+            self._sent_tables.update(get_referenced_tables(statement))
+
+        results: list[SFQueryResult] = self._connection.execute_script(
+            script,
+            *script_parameters,
+            collector_method=collector_method,
+            batch_size=batch_size,
+            verbose=self.verbose
+        )
+        self.round_trips += 1
+        self.statement_count += len(script)
+
+        if not results or results[-1].is_errored or len(results) < len(script):
+            raise TransactionFailedException(
+                results[-1].query_id if results else None,
+                results[-1].error if results else 'No result returned'
+            )
+        return results
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import snowflake.connector as sf
+from ejson.facades.orjson_ import loads
+
+from esql._internal.ref import DEFAULT_REPORTER
+from esql.connection.snowflake.sf_connection import SFConnection
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+from esql.connection.snowflake.sf_warehouses import SFWarehouses
+from esql.sql_.adapters.snowflake.enums.warehouse_sizes import WarehouseSizes
+from esql.sql_.adapters.snowflake.snowflake_listers import SnowflakeListers
+
+LOGGER = DEFAULT_REPORTER
+
+_GIGABYTE: int = 1024 ** 3
+_SIZE_ORDER: dict[WarehouseSizes, int] = {size: index for index, size in enumerate(WarehouseSizes)}
+
+
+@dataclass(frozen=True, slots=True)
+class SFWarehouseTier:
+    """
+    A warehouse queries can be routed to
+
+    - warehouse: Name of the warehouse
+    - size: Size of the warehouse, used to order tiers
+    - max_scanned_bytes: Largest estimated scan this warehouse should take. None means no limit.
+    """
+    warehouse: str
+    size: WarehouseSizes
+    max_scanned_bytes: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class SFWarehouseLoad:
+    running: int
+    queued: int
+
+
+class SFWarehouseRouter:
+    """
+    Chooses, per query, the warehouse to run it on.
+
+    A query is eligible to the tiers whose *max_scanned_bytes* covers its estimated scan (``EXPLAIN``), so heavy scans
+    never land on a warehouse that is too small. Among eligible tiers, at most *max_escalation* sizes above the smallest
+    one, the least queued warehouse (``SHOW WAREHOUSES``) wins, the smallest on ties: cheap lookups move up a size
+    rather than waiting behind heavy scans. Queries that cannot be estimated (DML, DDL, ...) are eligible to every tier,
+    regardless of *max_escalation*.
+
+    Routing switches the warehouse of the connection's session; use a connection per thread (see
+    :class:`esql.connection.snowflake.sf_connection_pool.SFConnectionPool`).
+    """
+    __slots__ = (
+        'tiers',
+        'max_escalation',
+        'load_ttl',
+        'estimate_cache_size',
+        '_loads',
+        '_loads_fetched_at',
+        '_estimates',
+        '_lock'
+    )
+
+    def __init__(
+            self,
+            tiers: Sequence[SFWarehouseTier] | None = None,
+            *,
+            max_escalation: int = 1,
+            load_ttl: float = 10.0,
+            estimate_cache_size: int = 256
+    ):
+        """
+        :param tiers: The warehouses to route to, defaults to ``default_tiers()``
+        :param max_escalation: Number of sizes a query may be moved up to avoid a queue
+        :param load_ttl: Seconds during which the result of ``SHOW WAREHOUSES`` is reused
+        :param estimate_cache_size: Number of scan estimations kept, by query and parameters
+        """
+        if tiers is not None and not tiers:
+            raise ValueError('At least one tier must be provided')
+
+        self.tiers: tuple[SFWarehouseTier, ...] = tuple(sorted(tiers or self.default_tiers(), key=lambda tier: _SIZE_ORDER[tier.size]))
+        self.max_escalation: int = max_escalation
+        self.load_ttl: float = load_ttl
+        self.estimate_cache_size: int = estimate_cache_size
+        self._loads: dict[str, SFWarehouseLoad] = {}
+        self._loads_fetched_at: float | None = None
+        self._estimates: OrderedDict[tuple[str, tuple[Any, ...]], int | None] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def default_tiers() -> list[SFWarehouseTier]:
+        return [
+            SFWarehouseTier(SFWarehouses.X_SMALL.value, WarehouseSizes.X_SMALL, _GIGABYTE),
+            SFWarehouseTier(SFWarehouses.SMALL.value, WarehouseSizes.SMALL, 10 * _GIGABYTE),
+            SFWarehouseTier(SFWarehouses.MEDIUM.value, WarehouseSizes.MEDIUM, None)
+        ]
+
+    def execute_query(self, connection: SFConnection, query: str, *query_parameters: Any, **kwargs: Any) -> SFQueryResult:
+        """
+        Routes *query*, moves *connection* to the chosen warehouse and executes the query there. Keyword arguments are
+        passed to ``SFConnection.execute_query()``.
+        """
+        tier: SFWarehouseTier = self.choose(connection, query, *query_parameters)
+        switch_result: SFQueryResult = connection.set_session_context(warehouse=tier.warehouse)
+        if switch_result.is_errored:
+            return switch_result
+
+        return connection.execute_query(query, *query_parameters, **kwargs)
+
+    def choose(self, connection: SFConnection, query: str, *query_parameters: Any) -> SFWarehouseTier:
+        """
+        Returns the tier *query* should run on
+        """
+        tier: SFWarehouseTier = self.select_tier(
+            self.estimate_scanned_bytes(connection, query, *query_parameters),
+            self.get_loads(connection)
+        )
+        LOGGER.debug('Routing query to %s (%s)', tier.warehouse, tier.size)
+        return tier
+
+    def select_tier(self, estimated_bytes: int | None, warehouse_loads: dict[str, SFWarehouseLoad]) -> SFWarehouseTier:
+        """
+        Applies the routing rules to an estimation and to the current warehouse loads
+        :param estimated_bytes: Estimated number of scanned bytes, None when unknown: every tier is then eligible, whatever
+            *max_escalation*
+        :param warehouse_loads: Warehouse loads, by upper-cased warehouse name. Missing warehouses are considered idle.
+        """
+        candidates: tuple[SFWarehouseTier, ...] = self.tiers
+        if estimated_bytes is not None:
+            first_eligible: int = next(
+                (index for index, tier in enumerate(self.tiers) if tier.max_scanned_bytes is None or tier.max_scanned_bytes >= estimated_bytes),
+                len(self.tiers) - 1
+            )
+            candidates = self.tiers[first_eligible:first_eligible + self.max_escalation + 1]
+
+        return min(
+            candidates,
+            key=lambda tier: (warehouse_loads.get(tier.warehouse.upper(), SFWarehouseLoad(0, 0)).queued, _SIZE_ORDER[tier.size])
+        )
+
+    def estimate_scanned_bytes(self, connection: SFConnection, query: str, *query_parameters: Any) -> int | None:
+        """
+        Returns the number of bytes Snowflake plans to scan for *query* (``EXPLAIN``), or None when the query cannot be
+        explained. Estimations are cached.
+        """
+        key: tuple[str, tuple[Any, ...]] = (query, query_parameters)
+        with self._lock:
+            if key in self._estimates:
+                self._estimates.move_to_end(key)
+                return self._estimates[key]
+
+        estimate: int | None = None
+        try:
+            with connection.get_cursor() as cursor:
+                cursor.execute(f'EXPLAIN USING JSON {query}', query_parameters)
+                row: dict[str, Any] | None = cursor.fetchone()
+            if row:
+                plan: dict[str, Any] = loads(next(iter(row.values())))
+                estimate = plan.get('GlobalStats', {}).get('bytesAssigned')
+        except (sf.errors.Error, ValueError) as error:
+            LOGGER.debug('Could not estimate query cost: %s', error)
+
+        with self._lock:
+            self._estimates[key] = estimate
+            while len(self._estimates) > self.estimate_cache_size:
+                self._estimates.popitem(last=False)
+        return estimate
+
+    def get_loads(self, connection: SFConnection) -> dict[str, SFWarehouseLoad]:
+        """
+        Returns the running and queued statement counts of the warehouses, by upper-cased name. Refreshed every
+        *load_ttl* seconds.
+        """
+        with self._lock:
+            if self._loads_fetched_at is not None and time.monotonic() - self._loads_fetched_at < self.load_ttl:
+                return self._loads
+
+        warehouse_loads: dict[str, SFWarehouseLoad] = {}
+        try:
+            with connection.get_cursor() as cursor:
+                cursor.execute(SnowflakeListers.list_warehouses())
+                for row in cursor.fetchall():
+                    warehouse_loads[str(row['name']).upper()] = SFWarehouseLoad(int(row.get('running') or 0), int(row.get('queued') or 0))
+        except sf.errors.Error as error:
+            LOGGER.warn('Could not list warehouses: %s', error)
+
+        with self._lock:
+            self._loads = warehouse_loads
+            self._loads_fetched_at = time.monotonic()
+        return warehouse_loads
@@ -4,3 +4,16 @@ from __future__ import annotations
 class BadIdentifierException(Exception):
     def __init__(self, identifier: str, reason: str):
         super().__init__(f'Bad identifier: {reason}. Identifier = {identifier}')
+
+
+class TransactionFailedException(Exception):
+    def __init__(self, query_id: str | None, reason: str | None):
+        super().__init__(f'Transaction failed: {reason}. Query ID = {query_id}')
+        self.query_id: str | None = query_id
+        self.reason: str | None = reason
+
+
+class SessionContextLostException(Exception):
+    def __init__(self, reason: str | None):
+        super().__init__(f'Could not restore the session context after reconnecting: {reason}')
+        self.reason: str | None = reason
@@ -40,7 +40,7 @@ class SnowflakeDataTypes(Enum):
             raise UnknownValueException(_type)
 
     def to_python(self) -> type:
-        return _PYTHON_MAPPING[self.value]
+        return _PYTHON_MAPPING[self]
 
     def get_initializer(self) -> Callable[[Any], Any]:
         """
@@ -49,7 +49,13 @@ class SnowflakeDataTypes(Enum):
         Example: type is TIMESTAMP_NO_TIMEZONE, this function will return
             ``datetime.fromisoformat()``
         """
-        return _INITIALIZER_MAPPING[self.value]
+        return _INITIALIZER_MAPPING[self]
+
+    def to_numpy_dtype(self) -> str:
+        """
+        Returns the NumPy dtype holding values of this type, ``object`` when there is no native one
+        """
+        return _NUMPY_DTYPE_MAPPING.get(self, 'object')
 
     def get_emptiness_evaluation_expression(self) -> str:
         return _DEFAULT_EMPTINESS_EVALUATION_MAPPING.get(self, '{value} IS NULL')
@@ -144,6 +150,14 @@ _INITIALIZER_MAPPING = {
     SnowflakeDataTypes.VARIANT: loads
 }
 
+_NUMPY_DTYPE_MAPPING = {
+    SnowflakeDataTypes.BOOL: 'bool',
+    SnowflakeDataTypes.DATE: 'datetime64[D]',
+    SnowflakeDataTypes.FLOAT: 'float64',
+    SnowflakeDataTypes.INTEGER: 'int64',
+    SnowflakeDataTypes.TIMESTAMP_NO_TIMEZONE: 'datetime64[us]'
+}
+
 _DEFAULT_EMPTINESS_EVALUATION_MAPPING = {
     SnowflakeDataTypes.ARRAY: '{value}::string IS NULL OR ARRAY_SIZE({value}) = 0',
     SnowflakeDataTypes.OBJECT: '{value}::string IS NULL OR {value} = PARSE_JSON(\'{{}}\')',
@@ -65,11 +65,16 @@ class StatementElement:
         self._value_type: SnowflakeValueTypes = value_type
 
     def get(self) -> Any:
+        if not self._value:
+            return self._element_on_not_value
+        elif '%%' not in self._element_string:
+            return self._element_string
+
         return self._element_string.replace(
             '%%',
             prepare_value(self._value, self._value_type),
             1
-        ) if self._value else self._element_on_not_value
+        )
 
 
 class StatementElementMulti:
@@ -171,10 +176,10 @@ class StatementElementFirst:
 
 def build_statement(*args: StatementProtocol | str, indent_level: int) -> str:
     def _handle_arg(an_arg: StatementProtocol | str) -> Any:
-        if isinstance(an_arg, StatementElement):
-            return an_arg.get()
-        else:
+        if isinstance(an_arg, str):
             return an_arg
+        else:
+            return an_arg.get()
 
     return format_query(
         ' '.join(filter(None, [
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import itertools
+from typing import Any, Callable, Iterator
+
+import snowflake.connector as sf
+
+from esql.connection.snowflake.sf_connection import SFConnection
+
+_FIXED, _TEXT = 0, 2
+
+DEFAULT_DESCRIPTION: list[tuple] = [
+    ('ID', _FIXED, None, None, 38, 0, False),
+    ('NAME', _TEXT, None, None, None, None, True)
+]
+
+
+class FakeCursor:
+    """
+    Stands for a connector cursor: serves the rows *connector* returns for each statement, as dicts for a ``DictCursor``
+    and as tuples otherwise
+    """
+    def __init__(self, connector: FakeConnector, cursor_class: type):
+        self.connector: FakeConnector = connector
+        self.cursor_class: type = cursor_class
+        self.sfqid: str | None = None
+        self.messages: list[str] = []
+        self.rowcount: int | None = None
+        self.description: list[tuple] | None = None
+        self.fetch_sizes: list[int] = []
+        self.closed: bool = False
+        self._rows: list[Any] = []
+        self._pending_sets: list[list[Any]] = []
+
+    def execute(self, query: str, params: Any = None, num_statements: int | None = None, **kwargs: Any) -> FakeCursor:
+        self.connector.queries.append(query)
+        self.connector.parameters.append(params)
+        error: Exception | None = self.connector.errors.pop(query, None)
+        if error is not None:
+            raise error
+
+        statements: list[str] = query.split(';\n') if num_statements is not None else [query]
+        sets: list[list[Any]] = [self.connector.rows_for(statement) for statement in statements]
+        self._load(sets[0])
+        self._pending_sets = sets[1:]
+        return self
+
+    def execute_async(self, query: str, params: Any = None, **kwargs: Any):
+        self.execute(query, params)
+        self.connector.pending_results[self.sfqid] = self._rows
+        self._rows = []
+        self.rowcount = None
+        self.description = None
+
+    def query_result(self, sfqid: str) -> FakeCursor:
+        self._rows = self.connector.pending_results.pop(sfqid)
+        self.rowcount = len(self._rows)
+        self.description = self.connector.description
+        return self
+
+    def executemany(self, query: str, rows: list[Any]) -> FakeCursor:
+        self.connector.queries.append(query)
+        self.connector.parameters.append(list(rows))
+        error: Exception | None = self.connector.errors.pop(query, None)
+        if error is not None:
+            raise error
+
+        self.sfqid = f'q{next(self.connector.query_ids)}'
+        self.rowcount = len(rows)
+        return self
+
+    def nextset(self) -> FakeCursor | None:
+        if not self._pending_sets:
+            return None
+        self._load(self._pending_sets.pop(0))
+        return self
+
+    def fetchone(self) -> Any:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int) -> list[Any]:
+        self.fetch_sizes.append(size)
+        batch: list[Any] = self._rows[:size]
+        del self._rows[:size]
+        return batch
+
+    def fetchall(self) -> list[Any]:
+        rows: list[Any] = self._rows
+        self._rows = []
+        return rows
+
+    def close(self):
+        self.closed = True
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def _load(self, rows: list[dict[str, Any]]):
+        self.sfqid = f'q{next(self.connector.query_ids)}'
+        self.description = self.connector.description
+        self.rowcount = len(rows)
+        self._rows = [dict(row) if self.cursor_class is sf.DictCursor else tuple(row.values()) for row in rows]
+
+
+class FakeConnector:
+    """
+    Stands for ``snowflake.connector.SnowflakeConnection``. Every statement returns *rows* (or ``rows_for(statement)``);
+    a statement in *errors* raises its error once.
+    """
+    def __init__(
+            self,
+            rows: list[dict[str, Any]] | None = None,
+            *,
+            rows_for: Callable[[str], list[dict[str, Any]]] | None = None,
+            description: list[tuple] | None = None,
+            is_pyformat: bool = False
+    ):
+        self.rows: list[dict[str, Any]] = rows if rows is not None else []
+        self.description: list[tuple] = description if description is not None else DEFAULT_DESCRIPTION
+        self.is_pyformat: bool = is_pyformat
+        self.queries: list[str] = []
+        self.parameters: list[Any] = []
+        self.cursors: list[FakeCursor] = []
+        self.errors: dict[str, Exception] = {}
+        self.pending_results: dict[str, list[Any]] = {}
+        self.query_ids: Iterator[int] = itertools.count(1)
+        self.closed: bool = False
+        self.role: str = 'ANALYST'
+        self.warehouse: str = 'WH_SMALL'
+        self.database: str = 'DB'
+        self.schema: str = 'PUBLIC'
+        self._rows_for: Callable[[str], list[dict[str, Any]]] | None = rows_for
+
+    def rows_for(self, statement: str) -> list[dict[str, Any]]:
+        return self._rows_for(statement) if self._rows_for is not None else list(self.rows)
+
+    def cursor(self, cursor_class: type = sf.DictCursor) -> FakeCursor:
+        cursor: FakeCursor = FakeCursor(self, cursor_class)
+        self.cursors.append(cursor)
+        return cursor
+
+    def get_query_status_throw_if_error(self, sfqid: str) -> str:
+        return 'SUCCESS'
+
+    def is_still_running(self, status: str) -> bool:
+        return False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+    def commit(self):
+        self.queries.append('COMMIT')
+
+    def rollback(self):
+        self.queries.append('ROLLBACK')
+
+
+def make_connection(connector: FakeConnector | None = None, **kwargs: Any) -> SFConnection:
+    """
+    Returns an ``SFConnection`` already connected to *connector*. Keyword arguments are passed to ``SFConnection``.
+    """
+    connection: SFConnection = SFConnection('USER', 'password', 'account', **kwargs)
+    connection._connection = connector if connector is not None else FakeConnector()  # pylint: disable=protected-access
+    return connection
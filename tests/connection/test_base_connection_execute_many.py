@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from esql.connection.base_connection import BaseConnection
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+
+
+class _SleepingConnection(BaseConnection):
+    """
+    Answers ``SELECT <n>`` with ``[n]`` after a random delay, so queries finish out of order
+    """
+    def __init__(self):
+        super().__init__('user', 'password', 'host', None)
+        self.running: int = 0
+        self.max_running: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    def connect(self) -> BaseConnection:
+        return self
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    @contextmanager
+    def get_cursor(self):
+        yield None
+
+    def execute_query(self, query, *query_parameters, **kwargs) -> SFQueryResult:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(random.uniform(0.002, 0.01))
+        with self.lock:
+            self.running -= 1
+
+        value: int = int(query.split()[1])
+        if query_parameters:
+            value += sum(query_parameters)
+        return SFQueryResult(query_id=f'q{value}', error_message=None, results=[value])
+
+
+def test_results_keep_the_order_of_the_queries():
+    connection = _SleepingConnection()
+    results = connection.execute_many([f'SELECT {index}' for index in range(20)], max_concurrency=4)
+    assert [result.results for result in results] == [[index] for index in range(20)]
+    assert 1 < connection.max_running <= 4
+
+
+def test_parameters_are_passed_along():
+    results = _SleepingConnection().execute_many(['SELECT 1', ('SELECT 10', [1, 2])])
+    assert [result.results for result in results] == [[1], [13]]
+
+
+def test_results_can_be_merged():
+    merged = _SleepingConnection().execute_many([f'SELECT {index}' for index in range(5)], merge=True)
+    assert merged.results == [0, 1, 2, 3, 4]
+    assert merged.query_ids == ['q0', 'q1', 'q2', 'q3', 'q4']
+
+
+def test_async_results_keep_the_order_of_the_queries():
+    connection = _SleepingConnection()
+    results = asyncio.run(connection.execute_many_async([f'SELECT {index}' for index in range(10)], max_concurrency=3))
+    assert [result.results for result in results] == [[index] for index in range(10)]
+    assert connection.max_running <= 3
+
+
+def test_no_query_gives_no_result():
+    assert _SleepingConnection().execute_many([]) == []
+    assert _SleepingConnection().execute_many([], merge=True).results == []
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from esql.connection.base_connection_pool import BaseConnectionPool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.is_connected = True
+
+    def close(self):
+        self.is_connected = False
+
+
+class FakePool(BaseConnectionPool[FakeConnection]):
+    __slots__ = (
+        'made',
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.made = []
+
+    def _make_connection(self) -> FakeConnection:
+        connection = FakeConnection()
+        self.made.append(connection)
+        return connection
+
+    def _is_healthy(self, connection: FakeConnection, *, ping: bool) -> bool:
+        return connection.is_connected
+
+
+def test_open_creates_min_size_connections():
+    pool = FakePool(min_size=2, max_size=4).open()
+    assert len(pool.made) == 2
+    assert pool.statistics.idle == 2
+
+
+def test_borrow_reuses_warm_connection():
+    pool = FakePool(min_size=0, max_size=2)
+    with pool.borrow() as first:
+        pass
+    with pool.borrow() as second:
+        pass
+    assert first is second
+    assert pool.statistics.created == 1
+    assert pool.statistics.checkouts == 2
+    assert pool.statistics.checkins == 2
+
+
+def test_unhealthy_connection_is_replaced():
+    pool = FakePool(min_size=1, max_size=1).open()
+    pool.made[0].is_connected = False
+    with pool.borrow() as connection:
+        assert connection is pool.made[1]
+    assert pool.statistics.failed_health_checks == 1
+
+
+def test_idle_connections_are_evicted_down_to_min_size():
+    pool = FakePool(min_size=1, max_size=3, max_idle_time=0)
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert pool.evict_idle() == 1
+    assert pool.statistics.idle == 1
+    assert not first.is_connected
+
+
+def test_borrow_times_out_when_exhausted():
+    pool = FakePool(min_size=0, max_size=1)
+    with pool.borrow():
+        with pytest.raises(TimeoutError):
+            with pool.borrow(timeout=0.01):
+                pass
+    assert pool.statistics.timeouts == 1
+
+
+def test_waiting_borrower_gets_released_connection():
+    pool = FakePool(min_size=0, max_size=1)
+    connection = pool.acquire()
+    borrowed = []
+
+    thread = threading.Thread(target=lambda: borrowed.append(pool.acquire(timeout=5)))
+    thread.start()
+    pool.release(connection)
+    thread.join()
+
+    assert borrowed == [connection]
+    assert pool.statistics.created == 1
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        FakePool(min_size=3, max_size=2)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+from esql.connection.snowflake.sf_records import SFHeader, SFRecordList
+from esql.connection.snowflake.sf_spilled_records import SFSpilledRecords
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+
+def _generate(batches):
+    yield from batches
+
+
+def test_lists_are_concatenated():
+    merged = SFQueryResult.merge(SFQueryResult('q1', None, [1, 2]), SFQueryResult('q2', None, [3]))
+    assert merged.results == [1, 2, 3]
+    assert merged.query_ids == ['q1', 'q2']
+
+
+def test_generators_are_chained_lazily():
+    consumed = []
+
+    def _tracking(name, batches):
+        for batch in batches:
+            consumed.append(name)
+            yield batch
+
+    merged = SFQueryResult.merge(SFQueryResult('q1', None, _tracking('a', [[1], [2]])), SFQueryResult('q2', None, _tracking('b', [[3]])))
+    assert consumed == []
+    assert list(merged.results) == [1, 2, 3]
+    assert consumed == ['a', 'a', 'b']
+
+
+def test_sorted_partitions_are_merged_on_key():
+    merged = SFQueryResult.merge(
+        SFQueryResult('q1', None, _generate([[{'ID': 1}, {'ID': 4}], [{'ID': 6}]])),
+        SFQueryResult('q2', None, [{'ID': 2}, {'ID': 5}]),
+        SFQueryResult('q3', None, _generate([[{'ID': 3}]])),
+        key=lambda record: record['ID']
+    )
+    assert [record['ID'] for record in merged.results] == [1, 2, 3, 4, 5, 6]
+
+
+def test_errors_are_kept_per_part():
+    merged = SFQueryResult.merge(SFQueryResult('q1', None, [1]), SFQueryResult('q2', 'boom', None))
+    assert merged.error == 'boom'
+    assert merged.part_errors == [None, 'boom']
+    assert merged.results == [1]
+
+
+def test_parts_of_different_shapes_are_read_as_records():
+    merged = SFQueryResult.merge(
+        SFQueryResult('q1', None, [{'ID': 1}]),
+        SFQueryResult('q2', None, {'ID': 2}),
+        SFQueryResult('q3', None, _generate([[{'ID': 3}], [{'ID': 4}]]))
+    )
+    assert list(merged.results) == [{'ID': 1}, {'ID': 2}, {'ID': 3}, {'ID': 4}]
+    assert SFQueryResult.merge(SFQueryResult('q1', None, {'ID': 1}), SFQueryResult('q2', None, [{'ID': 2}])).results == [{'ID': 1}, {'ID': 2}]
+
+
+def test_shared_header_is_kept():
+    header = SFHeader(['ID'])
+    merged = SFQueryResult.merge(
+        SFQueryResult('q1', None, SFRecordList(header, [header.make_record((1,))])),
+        SFQueryResult('q2', None, SFRecordList(header, [header.make_record((2,))]))
+    )
+    assert merged.header == header
+    assert merged.results.to_dicts() == [{'ID': 1}, {'ID': 2}]
+
+    other = SFHeader(['NAME'])
+    merged = SFQueryResult.merge(SFQueryResult('q1', None, SFRecordList(header, [])), SFQueryResult('q2', None, SFRecordList(other, [])))
+    assert merged.header is None
+
+
+def test_scalar_and_string_parts_are_single_items():
+    assert SFQueryResult.merge(SFQueryResult('q1', None, 3), SFQueryResult('q2', None, 1)).results == [3, 1]
+    assert list(SFQueryResult.merge(SFQueryResult('q1', None, 3), SFQueryResult('q2', None, 1), key=lambda value: value).results) == [1, 3]
+    assert SFQueryResult.merge(SFQueryResult('q1', None, 'ab'), SFQueryResult('q2', None, 'c')).results == ['ab', 'c']
+    assert list(SFQueryResult.merge(SFQueryResult('q1', None, 'b'), SFQueryResult('q2', None, 'a'), key=str).results) == ['a', 'b']
+
+
+def test_arrow_parts_are_single_items():
+    pyarrow = pytest.importorskip('pyarrow')
+    large = pyarrow.table({'ID': [1, 2, 3], 'NAME': ['a', 'b', 'c']})
+    small = pyarrow.table({'ID': [4], 'NAME': ['d']})
+    assert SFQueryResult.merge(SFQueryResult('q1', None, large), SFQueryResult('q2', None, small)).results == [large, small]
+
+    merged = SFQueryResult.merge(SFQueryResult('q1', None, small), SFQueryResult('q2', None, large), key=lambda table: -table.num_rows)
+    assert list(merged.results) == [large, small]
+
+
+def test_scalar_queries_are_merged_by_execute_many():
+    connection = make_connection(FakeConnector([{'ID': 1, 'NAME': 'a'}]))
+    merged = connection.execute_many(['SELECT 1', 'SELECT 2'], merge=True, collector_method=SFQueryCollectors.fetch_scalar)
+    assert merged.results == [1, 1]
+
+
+def test_spilled_records_are_read_record_by_record():
+    spilled = SFSpilledRecords(memory_budget=0)
+    spilled.append_batch([{'ID': 1}, {'ID': 3}])
+    spilled.append_batch([{'ID': 4}])
+    with spilled.seal():
+        merged = SFQueryResult.merge(SFQueryResult('q1', None, spilled), SFQueryResult('q2', None, [{'ID': 2}]), key=lambda record: record['ID'])
+        assert [record['ID'] for record in merged.results] == [1, 2, 3, 4]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from esql.connection.retry_policy import RetryPolicy, NO_RETRY, is_idempotent_statement
+
+
+def test_delays_are_jittered_and_capped():
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=5.0)
+    for attempt in range(10):
+        assert 0 <= policy.get_delay(attempt) <= min(5.0, 2 ** attempt)
+
+
+def test_can_retry():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.can_retry(0)
+    assert policy.can_retry(1)
+    assert not policy.can_retry(2)
+
+
+def test_no_retry():
+    assert not NO_RETRY.can_retry(0)
+
+
+def test_idempotent_statements():
+    assert is_idempotent_statement('SHOW TABLES IN SCHEMA "DB"."S"')
+    assert is_idempotent_statement('  \n\tdescribe table T')
+    assert is_idempotent_statement('LIST @stage')
+    assert not is_idempotent_statement('SHOWCASE')
+    assert not is_idempotent_statement('INSERT INTO T VALUES (1)')
+    assert not is_idempotent_statement('SELECT * FROM T')
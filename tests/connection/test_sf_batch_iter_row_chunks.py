@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+from esql.connection.snowflake.sf_batch import iter_row_chunks, estimate_row_size
+
+
+def test_estimate_row_size():
+    assert estimate_row_size(('abc', 1, None, b'xy')) == 3 + 8 + 8 + 8 + 2 + 8
+
+
+def test_chunks_by_row_count():
+    chunks = list(iter_row_chunks(((i,) for i in range(10)), 4, None))
+    assert [len(rows) for rows, _ in chunks] == [4, 4, 2]
+    assert [row[0] for rows, _ in chunks for row in rows] == list(range(10))
+
+
+def test_chunks_by_byte_count():
+    rows = [('x' * 92,)] * 5
+    chunks = list(iter_row_chunks(rows, 100, 250))
+    assert [len(rows) for rows, _ in chunks] == [2, 2, 1]
+    assert [size for _, size in chunks] == [200, 200, 100]
+
+
+def test_oversized_row_makes_its_own_chunk():
+    rows = [('a',), ('x' * 1000,), ('b',)]
+    assert [len(rows) for rows, _ in iter_row_chunks(rows, 100, 50)] == [1, 1, 1]
+
+
+def test_no_rows():
+    assert list(iter_row_chunks([], 10, None)) == []
+
+
+def test_invalid_chunk_rows():
+    with pytest.raises(ValueError):
+        list(iter_row_chunks([(1,)], 0, None))
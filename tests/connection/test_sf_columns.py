@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from esql.connection.snowflake.sf_columns import SFColumn, get_columns
+from esql.sql_.adapters.snowflake.snowflake_data_types import SnowflakeDataTypes
+
+_FIXED, _REAL, _TEXT, _VARIANT, _TIMESTAMP_NTZ = 0, 1, 2, 5, 8
+
+
+def test_fixed_with_scale_is_float():
+    assert SFColumn.from_metadata(('PRICE', _FIXED, None, None, 12, 2, True)).data_type == SnowflakeDataTypes.FLOAT
+    assert SFColumn.from_metadata(('ID', _FIXED, None, None, 38, 0, False)).data_type == SnowflakeDataTypes.INTEGER
+
+
+def test_columns_from_description():
+    columns = get_columns([
+        ('NAME', _TEXT, None, None, None, None, True),
+        ('PAYLOAD', _VARIANT, None, None, None, None, True),
+        ('CREATED_AT', _TIMESTAMP_NTZ, None, None, None, 9, False)
+    ])
+    assert [(column.name, column.data_type, column.is_nullable) for column in columns] == [
+        ('NAME', SnowflakeDataTypes.STRING, True),
+        ('PAYLOAD', SnowflakeDataTypes.VARIANT, True),
+        ('CREATED_AT', SnowflakeDataTypes.TIMESTAMP_NO_TIMEZONE, False)
+    ]
+
+
+def test_numpy_dtypes():
+    assert SnowflakeDataTypes.INTEGER.to_numpy_dtype() == 'int64'
+    assert SnowflakeDataTypes.FLOAT.to_numpy_dtype() == 'float64'
+    assert SnowflakeDataTypes.VARIANT.to_numpy_dtype() == 'object'
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+
+import snowflake.connector as sf
+
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+
+def test_results_are_fetched_once_the_query_is_done():
+    connector = FakeConnector([{'ID': 1, 'NAME': 'a'}, {'ID': 2, 'NAME': 'b'}])
+    connection = make_connection(connector)
+    result = asyncio.run(connection.execute_query_async('SELECT * FROM T', verbose=False))
+
+    assert result.results == [{'ID': 1, 'NAME': 'a'}, {'ID': 2, 'NAME': 'b'}]
+    assert result.query_id == 'q1'
+    assert result.statistics.row_count == 2
+    assert not result.is_errored
+    assert connector.cursors[0].closed
+    connection.close()
+
+
+def test_failed_query_gives_an_errored_result():
+    connector = FakeConnector()
+    connector.errors['SELECT * FROM MISSING'] = sf.errors.ProgrammingError(msg='Table does not exist', errno=2003, sfqid='failed')
+    connection = make_connection(connector)
+    result = asyncio.run(connection.execute_query_async('SELECT * FROM MISSING', verbose=False))
+
+    assert result.is_errored
+    assert result.query_id == 'failed'
+    assert result.results is None
+    assert connector.cursors[0].closed
+    connection.close()
+
+
+def test_concurrent_queries_share_the_io_threads():
+    connection = make_connection(FakeConnector([{'ID': 1, 'NAME': 'a'}]), async_io_workers=2)
+
+    async def _run_all():
+        return await asyncio.gather(*(
+            connection.execute_query_async(f'SELECT {index}', collector_method=SFQueryCollectors.fetch_scalar, verbose=False)
+            for index in range(10)
+        ))
+
+    assert [result.results for result in asyncio.run(_run_all())] == [1] * 10
+    assert connection._io_executor._max_workers == 2  # pylint: disable=protected-access
+    connection.close()
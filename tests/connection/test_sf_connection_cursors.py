@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import functools
+
+import snowflake.connector as sf
+import snowflake.connector.cursor as sf_cursor
+
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+
+def test_collectors_declare_their_cursor_class():
+    assert SFQueryCollectors.get_cursor_class(SFQueryCollectors.gather_all_records) is sf.DictCursor
+    assert SFQueryCollectors.get_cursor_class(SFQueryCollectors.gather_compact_records) is sf_cursor.SnowflakeCursor
+    assert SFQueryCollectors.get_cursor_class(functools.partial(SFQueryCollectors.gather_compact_records, lazy_json=True)) is sf_cursor.SnowflakeCursor
+
+
+def test_cursors_are_closed_after_each_query_by_default():
+    connector = FakeConnector([{'ID': 1, 'NAME': 'a'}])
+    connection = make_connection(connector)
+    connection.execute_query('SELECT 1', verbose=False)
+    connection.execute_query('SELECT 2', verbose=False)
+
+    assert len(connector.cursors) == 2
+    assert all(cursor.closed for cursor in connector.cursors)
+
+
+def test_persistent_cursors_are_reused_per_cursor_class():
+    connector = FakeConnector([{'ID': 1, 'NAME': 'a'}])
+    connection = make_connection(connector, persistent_cursors=True)
+    assert connection.execute_query('SELECT 1', verbose=False).results == [{'ID': 1, 'NAME': 'a'}]
+    connection.execute_query('SELECT 2', verbose=False)
+    assert connection.execute_query('SELECT 3', collector_method=SFQueryCollectors.fetch_scalar, verbose=False).results == 1
+
+    assert [cursor.cursor_class for cursor in connector.cursors] == [sf.DictCursor, sf_cursor.SnowflakeCursor]
+    assert not any(cursor.closed for cursor in connector.cursors)
+
+    connection.close()
+    assert all(cursor.closed for cursor in connector.cursors)
+
+
+def test_closed_persistent_cursor_is_replaced():
+    connector = FakeConnector()
+    connection = make_connection(connector, persistent_cursors=True)
+    connection.execute_query('SELECT 1', verbose=False)
+    connector.cursors[0].close()
+    connection.execute_query('SELECT 2', verbose=False)
+
+    assert len(connector.cursors) == 2
+    assert not connector.cursors[1].closed
+
+
+def test_persistent_cursors_stay_bounded_across_worker_threads():
+    connector = FakeConnector([{'ID': 1, 'NAME': 'a'}])
+    connection = make_connection(connector, persistent_cursors=True)
+    for _ in range(50):
+        results = connection.execute_many(['SELECT 1'] * 4, max_concurrency=4)
+        assert [result.results for result in results] == [[{'ID': 1, 'NAME': 'a'}]] * 4
+
+    assert 1 <= len(connector.cursors) <= 4
+    assert not any(cursor.closed for cursor in connector.cursors)
+    connection.close()
+    assert all(cursor.closed for cursor in connector.cursors)
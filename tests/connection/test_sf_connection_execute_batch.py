@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import snowflake.connector as sf
+
+from esql.connection.snowflake import sf_connection
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+_INSERT = 'INSERT INTO T (A) VALUES (?)'
+
+
+class _WarningRecorder:
+    def __init__(self, logger):
+        self.logger = logger
+        self.warnings: list[str] = []
+
+    def warn(self, message: str, *args):
+        self.warnings.append(message % args if args else message)
+
+    def __getattr__(self, name: str):
+        return getattr(self.logger, name)
+
+
+def test_rows_are_sent_chunk_by_chunk():
+    connector = FakeConnector()
+    result = make_connection(connector).execute_batch(_INSERT, ((index,) for index in range(10)), chunk_rows=4, verbose=False)
+
+    assert connector.parameters == [[(0,), (1,), (2,), (3,)], [(4,), (5,), (6,), (7,)], [(8,), (9,)]]
+    assert [chunk.row_count for chunk in result.chunks] == [4, 4, 2]
+    assert not result.is_errored
+
+
+def test_failed_chunk_stops_the_batch():
+    connector = FakeConnector()
+    connector.errors[_INSERT] = sf.errors.ProgrammingError(msg='boom', errno=100038, sfqid='failed')
+    result = make_connection(connector).execute_batch(_INSERT, [(index,) for index in range(10)], chunk_rows=4, verbose=False)
+
+    assert result.query_ids == ['failed']
+    assert result.is_errored
+
+
+def test_failed_chunk_is_skipped_without_stop_on_error():
+    connector = FakeConnector()
+    connector.errors[_INSERT] = sf.errors.ProgrammingError(msg='boom', errno=100038, sfqid='failed')
+    result = make_connection(connector).execute_batch(_INSERT, [(index,) for index in range(10)], chunk_rows=4, stop_on_error=False, verbose=False)
+
+    assert result.query_ids == ['failed', 'q1', 'q2']
+    assert result.results == 6
+    assert result.is_errored
+
+
+def test_client_side_binding_is_reported(monkeypatch):
+    recorder = _WarningRecorder(sf_connection.LOGGER)
+    monkeypatch.setattr(sf_connection, 'LOGGER', recorder)
+
+    make_connection(FakeConnector()).execute_batch(_INSERT, [(1,)], verbose=False)
+    assert recorder.warnings == []
+
+    make_connection(FakeConnector(is_pyformat=True)).execute_batch(_INSERT, [(1,)], verbose=False)
+    assert len(recorder.warnings) == 1
+    assert 'qmark' in recorder.warnings[0]
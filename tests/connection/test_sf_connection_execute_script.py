@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import snowflake.connector as sf
+
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+
+def _rows_for(statement: str) -> list[dict]:
+    return [{'ID': 1, 'NAME': statement}] if statement.startswith('SELECT') else []
+
+
+def test_statements_are_sent_in_one_request():
+    connector = FakeConnector(rows_for=_rows_for)
+    results = make_connection(connector).execute_script(['CREATE TABLE T (A INT);', '  ', 'INSERT INTO T VALUES (1)', 'SELECT A FROM T'], verbose=False)
+
+    assert connector.queries == ['CREATE TABLE T (A INT);\nINSERT INTO T VALUES (1);\nSELECT A FROM T']
+    assert [result.results for result in results] == [[], [], [{'ID': 1, 'NAME': 'SELECT A FROM T'}]]
+    assert len({result.query_id for result in results}) == 3
+
+
+def test_generator_collectors_are_drained():
+    connector = FakeConnector(rows_for=_rows_for)
+    results = make_connection(connector).execute_script(
+        ['SELECT 1', 'SELECT 2'],
+        collector_method=SFQueryCollectors.make_generator,
+        batch_size=10,
+        verbose=False
+    )
+
+    assert [result.results for result in results] == [[[{'ID': 1, 'NAME': 'SELECT 1'}]], [[{'ID': 1, 'NAME': 'SELECT 2'}]]]
+    assert all(cursor.closed for cursor in connector.cursors)
+
+
+def test_failure_is_the_last_result():
+    connector = FakeConnector()
+    connector.errors['DROP TABLE T;\nDROP TABLE U'] = sf.errors.ProgrammingError(msg='Table does not exist', errno=2003, sfqid='failed')
+    results = make_connection(connector).execute_script('DROP TABLE T;\nDROP TABLE U', verbose=False)
+
+    assert len(results) == 1
+    assert results[-1].is_errored
+    assert results[-1].query_id == 'failed'
+
+
+def test_empty_script_sends_nothing():
+    connector = FakeConnector()
+    assert make_connection(connector).execute_script(['', ' '], verbose=False) == []
+    assert connector.queries == []
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+import snowflake.connector as sf
+
+from esql.connection.retry_policy import RetryPolicy
+from esql.exceptions import SessionContextLostException
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+_NO_DELAY = RetryPolicy(max_attempts=3, base_delay=0.0)
+
+
+def _session_expired() -> sf.errors.ProgrammingError:
+    return sf.errors.ProgrammingError(msg='Session expired', errno=390112, sfqid='lost')
+
+
+def test_session_context_is_restored_before_the_query_is_sent_again(monkeypatch):
+    lost = FakeConnector()
+    connection = make_connection(lost, retry_policy=_NO_DELAY)
+    connection.set_session_context(role='ADMIN', warehouse='WH_LARGE', schema='STAGING')
+    lost.errors['DELETE FROM T'] = _session_expired()
+
+    fresh = FakeConnector()
+    monkeypatch.setattr(sf, 'connect', lambda **kwargs: fresh)
+    result = connection.execute_query('DELETE FROM T', verbose=False)
+
+    assert not result.is_errored
+    assert lost.closed
+    assert fresh.queries == ['USE ROLE "ADMIN";\nUSE WAREHOUSE "WH_LARGE";\nUSE SCHEMA "STAGING"', 'DELETE FROM T']
+    assert connection.session_context.role == 'ADMIN'
+
+
+def test_untracked_context_is_taken_from_the_connector(monkeypatch):
+    lost = FakeConnector()
+    lost.warehouse = 'WH_LARGE'
+    connection = make_connection(lost, retry_policy=_NO_DELAY)
+    lost.errors['SELECT 1'] = _session_expired()
+
+    fresh = FakeConnector()
+    monkeypatch.setattr(sf, 'connect', lambda **kwargs: fresh)
+    connection.execute_query('SELECT 1', verbose=False)
+
+    assert fresh.queries == ['USE WAREHOUSE "WH_LARGE"', 'SELECT 1']
+
+
+def test_query_is_not_sent_again_when_the_context_cannot_be_restored(monkeypatch):
+    lost = FakeConnector()
+    connection = make_connection(lost, retry_policy=_NO_DELAY)
+    connection.set_session_context(role='ADMIN')
+    lost.errors['DELETE FROM T'] = _session_expired()
+
+    fresh = FakeConnector()
+    fresh.errors['USE ROLE "ADMIN"'] = sf.errors.ProgrammingError(msg='Role does not exist', errno=2003, sfqid='role')
+    monkeypatch.setattr(sf, 'connect', lambda **kwargs: fresh)
+    with pytest.raises(SessionContextLostException):
+        connection.execute_query('DELETE FROM T', verbose=False)
+    assert 'DELETE FROM T' not in fresh.queries
+
+
+def test_case_sensitive_names_are_restored_exactly(monkeypatch):
+    lost = FakeConnector()
+    lost.database, lost.schema = 'Sales', 'raw "data"'
+    connection = make_connection(lost, retry_policy=_NO_DELAY)
+    connection.set_session_context(role='"Ops"')
+    lost.errors['SELECT 1'] = _session_expired()
+
+    fresh = FakeConnector()
+    monkeypatch.setattr(sf, 'connect', lambda **kwargs: fresh)
+    connection.execute_query('SELECT 1', verbose=False)
+
+    assert fresh.queries == ['USE ROLE "Ops";\nUSE DATABASE "Sales";\nUSE SCHEMA "raw ""data"""', 'SELECT 1']
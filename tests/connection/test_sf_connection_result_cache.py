@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+
+from esql.connection.snowflake.sf_connection import SFConnection
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from esql.connection.snowflake.sf_result_cache import SFResultCache
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+_SELECT = 'SELECT ID, NAME FROM ORDERS'
+
+
+def _cached_connection() -> tuple:
+    connector = FakeConnector([{'ID': 1, 'NAME': 'a'}])
+    connection = make_connection(connector, result_cache=SFResultCache())
+    connection.execute_query(_SELECT, verbose=False)
+    connection.execute_query(_SELECT, verbose=False)
+    assert connector.queries == [_SELECT]
+    return connector, connection
+
+
+def test_writes_sent_by_every_method_invalidate_the_cache():
+    writes = {
+        'execute_query': lambda connection: connection.execute_query('DELETE FROM ORDERS', verbose=False),
+        'execute_script': lambda connection: connection.execute_script(['DELETE FROM ORDERS', 'SELECT 1'], verbose=False),
+        'execute_batch': lambda connection: connection.execute_batch('INSERT INTO ORDERS VALUES (?)', [(1,)], verbose=False),
+        'execute_query_async': lambda connection: asyncio.run(connection.execute_query_async('DELETE FROM ORDERS', verbose=False)),
+        'execute_many_async': lambda connection: asyncio.run(connection.execute_many_async([('DELETE FROM ORDERS', ())], verbose=False))
+    }
+    for method, write in writes.items():
+        connector, connection = _cached_connection()
+        write(connection)
+        connection.execute_query(_SELECT, verbose=False)
+        assert connector.queries[-1] == _SELECT, method
+        connection.close()
+
+
+def test_transaction_writes_and_rollback_invalidate_the_cache():
+    connector, connection = _cached_connection()
+    with connection.transaction() as transaction:
+        transaction.execute('DELETE FROM ORDERS')
+    connection.execute_query(_SELECT, verbose=False)
+    assert connector.queries[-1] == _SELECT
+
+    try:
+        with connection.transaction(buffer_dml=False) as transaction:
+            transaction.execute('DELETE FROM ORDERS')
+            connection.execute_query(_SELECT, verbose=False)  # Caches rows the rollback discards
+            raise KeyError()
+    except KeyError:
+        pass
+    query_count: int = len(connector.queries)
+    connection.execute_query(_SELECT, verbose=False)
+    assert connector.queries[query_count:] == [_SELECT]
+
+
+def test_key_follows_the_connector_context():
+    connector, connection = _cached_connection()
+    assert connection.session_context.role == 'ANALYST'
+
+    connector.role = 'ADMIN'  # As after a USE ROLE sent through a path that does not track the session context
+    connection.execute_query(_SELECT, verbose=False)
+    assert connector.queries == [_SELECT, _SELECT]
+
+
+def test_connections_of_other_accounts_or_users_do_not_share_entries():
+    cache = SFResultCache()
+    connections: list[tuple[FakeConnector, SFConnection]] = []
+    for user, account in (('USER', 'account'), ('USER', 'other_account'), ('OTHER_USER', 'account')):
+        connector = FakeConnector([{'ID': 1, 'NAME': account}])
+        connection = SFConnection(user, 'password', account, result_cache=cache)
+        connection._connection = connector  # pylint: disable=protected-access
+        connections.append((connector, connection))
+
+    for connector, connection in connections:
+        connection.execute_query(_SELECT, verbose=False)
+        assert connector.queries == [_SELECT]
+    assert len(cache) == 3
+
+
+def test_results_of_a_query_in_flight_during_an_invalidation_are_not_cached():
+    cache = SFResultCache()
+
+    def _rows_for(statement: str) -> list[dict]:
+        cache.invalidate('ORDERS')  # As a write sent by another thread while the query runs
+        return [{'ID': 1, 'NAME': 'a'}]
+
+    connector = FakeConnector(rows_for=_rows_for)
+    connection = make_connection(connector, result_cache=cache)
+    connection.execute_query(_SELECT, verbose=False)
+    assert len(cache) == 0
+
+
+def test_reads_running_during_a_write_are_invalidated_once_it_ran():
+    connection: SFConnection | None = None
+
+    def _rows_for(statement: str) -> list[dict]:
+        if statement.startswith('DELETE'):
+            connection.execute_query(_SELECT, verbose=False)  # As a read sent by another thread while the write runs
+        return [{'ID': 1, 'NAME': 'a'}]
+
+    connector = FakeConnector(rows_for=_rows_for)
+    connection = make_connection(connector, result_cache=SFResultCache())
+    connection.execute_query('DELETE FROM ORDERS', verbose=False)
+    connection.execute_query(_SELECT, verbose=False)
+    assert connector.queries == ['DELETE FROM ORDERS', _SELECT, _SELECT]
+
+
+def test_uncacheable_collectors_bypass_the_cache():
+    cache = SFResultCache()
+    connector = FakeConnector([{'ID': 1, 'NAME': 'a'}])
+    connection = make_connection(connector, result_cache=cache)
+    for _ in range(2):
+        assert list(connection.execute_query(_SELECT, collector_method=SFQueryCollectors.make_generator, batch_size=10, verbose=False).results) == [
+            [{'ID': 1, 'NAME': 'a'}]
+        ]
+
+    assert connector.queries == [_SELECT, _SELECT]
+    assert (cache.hit_count, cache.miss_count) == (0, 0)
+    assert not SFQueryCollectors.is_cacheable(SFQueryCollectors.make_pipeline_collector(None, streaming=True))  # noqa
+    assert SFQueryCollectors.is_cacheable(SFQueryCollectors.gather_all_records)
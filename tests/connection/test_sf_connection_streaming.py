@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import gc
+
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+_ROWS = [{'ID': index, 'NAME': f'name {index}'} for index in range(5)]
+
+
+def _stream(connection):
+    return connection.execute_query('SELECT * FROM T', collector_method=SFQueryCollectors.make_generator, batch_size=2, verbose=False)
+
+
+def test_records_are_fetched_batch_by_batch():
+    connector = FakeConnector(_ROWS)
+    result = _stream(make_connection(connector))
+    cursor = connector.cursors[0]
+
+    assert cursor.fetch_sizes == []
+    assert next(result.results) == _ROWS[:2]
+    assert cursor.fetch_sizes == [2]
+    assert not cursor.closed
+
+    assert list(result.results) == [_ROWS[2:4], _ROWS[4:]]
+    assert cursor.fetch_sizes == [2, 2, 2, 2]
+    assert cursor.closed
+
+
+def test_unstarted_results_release_their_cursor():
+    connector = FakeConnector(_ROWS)
+    connection = make_connection(connector)
+    result = _stream(connection)
+    result.close()
+    assert connector.cursors[0].closed
+
+    result = _stream(connection)
+    del result
+    gc.collect()
+    assert connector.cursors[1].closed
+    assert connector.cursors[1].fetch_sizes == []
+
+
+def test_streaming_cursor_is_not_reused():
+    connector = FakeConnector(_ROWS)
+    connection = make_connection(connector, persistent_cursors=True)
+    result = _stream(connection)
+    connection.execute_query('SELECT 1', verbose=False)
+
+    assert len(connector.cursors) == 2
+    assert list(result.results)[-1] == _ROWS[4:]
+    assert connector.cursors[0].closed and not connector.cursors[1].closed
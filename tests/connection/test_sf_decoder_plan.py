@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pytest
+
+from esql.connection.snowflake.sf_decoder_plan import SFDecoderPlan
+
+_FIXED, _TEXT, _DATE, _VARIANT, _TIMESTAMP_NTZ, _ARRAY, _BOOLEAN = 0, 2, 3, 5, 8, 10, 13
+
+
+def _make_plan() -> SFDecoderPlan:
+    return SFDecoderPlan.from_description([
+        ('ID', _FIXED, None, None, 38, 0, False),
+        ('NAME', _TEXT, None, None, None, None, True),
+        ('PAYLOAD', _VARIANT, None, None, None, None, True),
+        ('TAGS', _ARRAY, None, None, None, None, True),
+        ('CREATED_AT', _TIMESTAMP_NTZ, None, None, None, 9, True)
+    ])
+
+
+def test_only_semi_structured_columns_are_parsed():
+    record = _make_plan().decode_record({
+        'ID': 1,
+        'NAME': '{"not": "json"}',
+        'PAYLOAD': '{"a": 1}',
+        'TAGS': '[\n  "x"\n]',
+        'CREATED_AT': datetime(2024, 1, 1)
+    })
+    assert record == {'ID': 1, 'NAME': '{"not": "json"}', 'PAYLOAD': {'a': 1}, 'TAGS': ['x'], 'CREATED_AT': datetime(2024, 1, 1)}
+
+
+def test_text_values_are_converted_and_whitespace_normalized():
+    record = _make_plan().decode_record({
+        'ID': '42',
+        'NAME': 'line one\nline   two',
+        'PAYLOAD': None,
+        'TAGS': None,
+        'CREATED_AT': '2024-01-01T10:00:00'
+    })
+    assert record == {'ID': 42, 'NAME': 'line one line two', 'PAYLOAD': None, 'TAGS': None, 'CREATED_AT': datetime(2024, 1, 1, 10)}
+
+
+def test_date_and_boolean_text_values_are_converted():
+    plan = SFDecoderPlan.from_description([
+        ('DAY', _DATE, None, None, None, None, True),
+        ('IS_ACTIVE', _BOOLEAN, None, None, None, None, True)
+    ])
+    assert plan.decode_record({'DAY': '2024-01-02', 'IS_ACTIVE': 'false'}) == {'DAY': date(2024, 1, 2), 'IS_ACTIVE': False}
+    assert type(plan.decode_record({'DAY': '2024-01-02', 'IS_ACTIVE': 'TRUE'})['DAY']) is date
+    assert plan.decode_values(('2024-01-02', 'false')) == [date(2024, 1, 2), False]
+    assert plan.decode_values((date(2024, 1, 2), True)) == [date(2024, 1, 2), True]
+    with pytest.raises(ValueError):
+        plan.decode_record({'DAY': None, 'IS_ACTIVE': 'maybe'})
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import multiprocessing
+
+from esql.connection.snowflake.sf_disk_result_cache import SFDiskResultCache, decode_results, encode_results
+
+
+def _store_in_other_process(path: str):
+    SFDiskResultCache(path).put('key', 'query', [{'ID': 1, 'NAME': 'a'}], frozenset({'T'}))
+
+
+def test_records_round_trip_through_the_compact_format():
+    records = [{'ID': index, 'NAME': f'name {index}'} for index in range(100)]
+    assert decode_results(encode_results(records)) == records
+    assert decode_results(encode_results([{'A': 1}, {'B': 2}])) == [{'A': 1}, {'B': 2}]
+    assert decode_results(encode_results({'A': 1})) == {'A': 1}
+
+
+def test_entries_are_shared_across_processes_and_restarts(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    process = multiprocessing.get_context('spawn').Process(target=_store_in_other_process, args=(path,))
+    process.start()
+    process.join()
+
+    cache = SFDiskResultCache(path)
+    entry = cache.get('key')
+    assert entry.results == [{'ID': 1, 'NAME': 'a'}]
+    assert entry.query_id == 'query' and entry.tables == {'T'}
+    assert cache.invalidate('db.schema.t') == 1
+    assert cache.get('key') is None
+    cache.close()
+
+
+def test_oldest_entries_are_evicted_beyond_max_bytes(tmp_path):
+    cache = SFDiskResultCache(str(tmp_path / 'cache.sqlite'), max_bytes=1000, compression_level=0)
+    for key in ('a', 'b', 'c'):
+        assert cache.put(key, None, ['x' * 300], frozenset())
+    assert cache.get('a') is None
+    assert cache.get('c') is not None
+    assert cache.size <= 1000
+    assert not cache.put('large', None, ['x' * 2000], frozenset())
+    cache.close()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import pickle
+
+from esql.connection.snowflake.sf_decoder_plan import SFDecoderPlan
+from esql.connection.snowflake.sf_lazy_json import SFLazyJson
+
+_VARIANT = 5
+
+
+def test_value_is_parsed_on_first_access_only():
+    value = SFLazyJson('{"a": [1, 2]}')
+    assert not value.is_parsed
+    assert value['a'] == [1, 2]
+    assert value.is_parsed
+    assert value.value is value.value
+
+
+def test_proxy_compares_to_the_document():
+    assert SFLazyJson('[1, 2]') == [1, 2]
+    assert len(SFLazyJson('{"a": 1, "b": 2}')) == 2
+    assert 'a' in SFLazyJson('{"a": 1}')
+
+
+def test_pickling_keeps_the_raw_text():
+    restored = pickle.loads(pickle.dumps(SFLazyJson('{"a": 1}')))
+    assert restored.raw == '{"a": 1}'
+    assert not restored.is_parsed
+
+
+def test_decoder_plan_option():
+    plan = SFDecoderPlan.from_description([('PAYLOAD', _VARIANT, None, None, None, None, True)], lazy_json=True)
+    record = plan.decode_record({'PAYLOAD': '{"a": 1}'})
+    assert isinstance(record['PAYLOAD'], SFLazyJson)
+    assert record['PAYLOAD'].get('a') == 1
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from esql.connection.snowflake.sf_columns import get_columns
+from esql.connection.snowflake.sf_parallel_decode import iter_decoded_batches
+
+_FIXED, _VARIANT = 0, 5
+
+_COLUMNS = get_columns([
+    ('ID', _FIXED, None, None, 38, 0, False),
+    ('PAYLOAD', _VARIANT, None, None, None, None, True)
+])
+_RESULT_BATCHES = [[(start + index, f'{{"n": {start + index}}}') for index in range(3)] for start in range(0, 30, 3)]
+
+
+def test_batches_are_decoded_in_order():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        batches = list(iter_decoded_batches(_RESULT_BATCHES, _COLUMNS, executor=executor, max_workers=4))
+
+    assert [record['ID'] for batch in batches for record in batch] == list(range(30))
+    assert batches[0][1] == {'ID': 1, 'PAYLOAD': {'n': 1}}
+
+
+def test_unordered_batches_are_all_yielded():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        batches = list(iter_decoded_batches(_RESULT_BATCHES, _COLUMNS, executor=executor, max_workers=4, ordered=False))
+
+    assert sorted(record['ID'] for batch in batches for record in batch) == list(range(30))
+
+
+def test_default_process_pool():
+    batches = list(iter_decoded_batches(_RESULT_BATCHES[:2], _COLUMNS, max_workers=2))
+    assert [record['ID'] for batch in batches for record in batch] == list(range(6))
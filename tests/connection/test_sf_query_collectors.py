@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from tests.connection.fake_snowflake import FakeConnector
+
+_ROWS = [{'ID': 1, 'NAME': 'a\n  b'}, {'ID': 2, 'NAME': 'c'}]
+
+
+def _execute(collector, rows=None, batch_size: int = 1):
+    connector = FakeConnector(_ROWS if rows is None else rows)
+    cursor = connector.cursor(SFQueryCollectors.get_cursor_class(collector)).execute('SELECT * FROM T')
+    return collector(cursor, batch_size)
+
+
+def test_record_collectors_decode_values():
+    assert _execute(SFQueryCollectors.gather_all_records) == [{'ID': 1, 'NAME': 'a b'}, {'ID': 2, 'NAME': 'c'}]
+    assert _execute(SFQueryCollectors.fetch_one_record) == {'ID': 1, 'NAME': 'a b'}
+    assert _execute(SFQueryCollectors.fetch_n_records, batch_size=1) == [{'ID': 1, 'NAME': 'a b'}]
+
+
+def test_compact_records_share_their_header():
+    records = _execute(SFQueryCollectors.gather_compact_records)
+    assert records.header.names == ('ID', 'NAME')
+    assert records.to_dicts() == [{'ID': 1, 'NAME': 'a b'}, {'ID': 2, 'NAME': 'c'}]
+    assert list(_execute(SFQueryCollectors.make_compact_generator, batch_size=1)) == [[(1, 'a b')], [(2, 'c')]]
+
+
+def test_fetch_scalar():
+    assert _execute(SFQueryCollectors.fetch_scalar) == 1
+    assert _execute(SFQueryCollectors.fetch_scalar, rows=[]) is None
+
+
+class _ArrowCursor:
+    """
+    Stands for the Arrow fetch API of a cursor: *tables* are the result chunks
+    """
+    def __init__(self, tables, description):
+        self.tables = tables
+        self.description = description
+
+    def fetch_arrow_batches(self):
+        yield from self.tables
+
+    def fetch_arrow_all(self):
+        if not self.tables:
+            return None
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        return pyarrow.concat_tables(self.tables)
+
+
+def test_arrow_collectors():
+    pyarrow = pytest.importorskip('pyarrow')
+    description = FakeConnector().description
+    tables = [pyarrow.table({'ID': [1, 2], 'NAME': ['a', 'b']}), pyarrow.table({'ID': [3], 'NAME': ['c']})]
+
+    batches = list(SFQueryCollectors.fetch_arrow_batches(_ArrowCursor(tables, description), 1))
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    assert SFQueryCollectors.fetch_arrow_table(_ArrowCursor(tables, description), 1).column('ID').to_pylist() == [1, 2, 3]
+
+
+def test_empty_arrow_table_keeps_the_column_names():
+    pytest.importorskip('pyarrow')
+    table = SFQueryCollectors.fetch_arrow_table(_ArrowCursor([], FakeConnector().description), 1)
+    assert table.num_rows == 0
+    assert table.column_names == ['ID', 'NAME']
+
+
+def test_numpy_columns():
+    numpy = pytest.importorskip('numpy')
+    columns = _execute(SFQueryCollectors.fetch_numpy_columns, rows=_ROWS + [{'ID': 3, 'NAME': None}], batch_size=2)
+    assert columns['ID'].dtype == numpy.int64
+    assert columns['ID'].tolist() == [1, 2, 3]
+    assert columns['NAME'].tolist() == ['a\n  b', 'c', None]
+    assert _execute(SFQueryCollectors.fetch_numpy_columns, rows=[])['ID'].shape == (0,)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+
+import snowflake.connector as sf
+
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+from esql.connection.snowflake.sf_query_statistics import SFQueryStatistics, record_decode_time
+from tests.connection.fake_snowflake import FakeConnector, make_connection
+
+
+def _collector(cursor, batch_size):
+    time.sleep(0.02)
+    record_decode_time(0.01)
+    return [cursor, batch_size]
+
+
+def _streaming_collector(cursor, batch_size):
+    for _ in range(2):
+        record_decode_time(0.01)
+        yield [cursor, batch_size]
+
+
+def test_run_collector_splits_fetch_and_decode_time():
+    statistics = SFQueryStatistics('WH')
+    assert statistics.run_collector(_collector, 'cursor', 10) == ['cursor', 10]
+    assert statistics.decode_time == 0.01
+    assert 0.005 < statistics.fetch_time < statistics.client_time
+
+
+def test_follow_accounts_lazy_results():
+    statistics = SFQueryStatistics()
+    results = statistics.follow(statistics.run_collector(_streaming_collector, 'cursor', 10))
+    assert statistics.decode_time == 0.0
+    assert list(results) == [['cursor', 10], ['cursor', 10]]
+    assert statistics.decode_time == 0.02
+
+
+def test_decode_time_outside_a_query_is_ignored():
+    record_decode_time(1.0)
+    statistics = SFQueryStatistics()
+    assert statistics.decode_time == 0.0
+    assert statistics.compile_time is None
+
+
+def _history_row(statement: str) -> list[dict]:
+    return [{
+        'COMPILATION_TIME': 100, 'EXECUTION_TIME': 2000, 'QUEUED_PROVISIONING_TIME': 0, 'QUEUED_OVERLOAD_TIME': 500,
+        'BYTES_SCANNED': 1024, 'WAREHOUSE_NAME': 'WH'
+    }] if 'QUERY_HISTORY_BY_SESSION' in statement else []
+
+
+def test_query_history_is_read_from_a_qualified_schema():
+    connector = FakeConnector(rows_for=_history_row)
+    connector.database = None
+    statistics = make_connection(connector).fetch_query_statistics(SFQueryResult('01ab-cd', None, [], SFQueryStatistics()))
+
+    assert 'FROM TABLE("SNOWFLAKE".INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION' in connector.queries[0]
+    assert (statistics.compile_time, statistics.execution_time, statistics.queued_time) == (0.1, 2.0, 0.5)
+    assert statistics.bytes_scanned == 1024
+
+
+def _missing_history(statement: str) -> list[dict]:
+    raise sf.errors.ProgrammingError(msg='Object does not exist', errno=2003, sfqid='history')
+
+
+def test_unreadable_query_history_leaves_server_measures_unset():
+    connector = FakeConnector(rows_for=_missing_history)
+    statistics = make_connection(connector).fetch_query_statistics(SFQueryResult('01ab-cd', None, [], SFQueryStatistics('WH')))
+
+    assert 'FROM TABLE("DB".INFORMATION_SCHEMA.QUERY_HISTORY_BY_SESSION' in connector.queries[0]
+    assert statistics.warehouse == 'WH'
+    assert statistics.execution_time is None
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import pickle
+
+from esql.connection.snowflake.sf_records import SFHeader, SFRecordList
+
+
+def test_records_share_their_header():
+    header = SFHeader(['ID', 'NAME'])
+    first, second = header.make_record((1, 'a')), header.make_record((2, 'b'))
+    assert type(first) is type(second)
+    assert first.header is second.header
+
+
+def test_access_by_name_and_position():
+    record = SFHeader(['ID', 'NAME']).make_record((1, 'a'))
+    assert record['NAME'] == 'a'
+    assert record[0] == 1
+    assert record[:1] == (1,)
+    assert record.get('MISSING', 'default') == 'default'
+    assert record.to_dict() == {'ID': 1, 'NAME': 'a'}
+    assert record == (1, 'a')
+
+
+def test_pickled_records_keep_a_single_header():
+    header = SFHeader(['ID', 'NAME'])
+    records = SFRecordList(header, [header.make_record((1, 'a')), header.make_record((2, 'b'))])
+    restored = pickle.loads(pickle.dumps(records))
+    assert restored.to_dicts() == [{'ID': 1, 'NAME': 'a'}, {'ID': 2, 'NAME': 'b'}]
+    assert restored[0].header is restored[1].header is restored.header
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import functools
+import time
+
+import pytest
+
+from esql.connection.base_result_cache import get_referenced_tables, make_cache_key, normalize_statement
+from esql.connection.snowflake.sf_query_collectors import SFQueryCollectors
+from esql.connection.snowflake.sf_result_cache import SFResultCache, describe_collector, estimate_result_size
+
+
+def test_normalization_keeps_literals():
+    assert normalize_statement('select  *\n FROM t -- comment\n WHERE A = \'x  y\';') == "SELECT * FROM T WHERE A = 'x  y'"
+    assert make_cache_key('SELECT 1', (), ('ROLE',)) == make_cache_key(' SELECT\t1 ;', (), ('ROLE',))
+    assert make_cache_key('SELECT 1', (), ('ROLE',)) != make_cache_key('SELECT 1', (), ('OTHER_ROLE',))
+    assert make_cache_key('SELECT ?', (1,), ()) != make_cache_key('SELECT ?', (2,), ())
+
+
+def test_referenced_tables():
+    assert get_referenced_tables('SELECT * FROM DB.S.orders o JOIN "Items" i ON o.ID = i.ID') == {'ORDERS', 'Items'}
+    assert get_referenced_tables('INSERT INTO orders SELECT 1') == {'ORDERS'}
+
+
+def test_collector_description_includes_bound_options():
+    assert describe_collector(SFQueryCollectors.gather_all_records).endswith('SFQueryCollectors.gather_all_records')
+    assert describe_collector(functools.partial(SFQueryCollectors.gather_all_records, lazy_json=True)).endswith("[('lazy_json', True)])")
+
+
+def test_hits_misses_and_ttl():
+    cache = SFResultCache()
+    results = [{'A': 1}]
+    assert cache.get('key') is None
+    assert cache.put('key', 'query', results, frozenset({'T'}))
+    assert cache.get('key').results is results
+    assert not cache.put('other', 'query', results, frozenset(), ttl=0)
+
+    cache.put('short', 'query', results, frozenset(), ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get('short') is None
+    assert (cache.hit_count, cache.miss_count) == (1, 2)
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    record_size = estimate_result_size([{'A': 'x' * 100}])
+    cache = SFResultCache(max_bytes=2 * record_size)
+    for key in ('a', 'b'):
+        cache.put(key, None, [{'A': 'x' * 100}], frozenset())
+    cache.get('a')
+    cache.put('c', None, [{'A': 'x' * 100}], frozenset())
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.eviction_count == 1
+    assert not cache.put('large', None, [{'A': 'x' * 1000}], frozenset())
+
+
+def test_invalidation_by_table():
+    cache = SFResultCache()
+    cache.put('orders', None, [], frozenset({'ORDERS'}))
+    cache.put('both', None, [], frozenset({'ORDERS', 'ITEMS'}))
+    cache.put('items', None, [], frozenset({'ITEMS'}))
+    assert cache.invalidate('db.s.orders') == 2
+    assert cache.invalidate_statement('DELETE FROM items') == 1
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_nested_results_are_sized_recursively():
+    assert estimate_result_size([{'A': ['x' * 1000, 'y' * 1000]}]) > 2000
+    assert estimate_result_size({'A': ('x' * 1000,)}) > 1000
+
+
+def test_columnar_results_are_sized_by_their_arrays():
+    numpy = pytest.importorskip('numpy')
+    assert estimate_result_size({'ID': numpy.arange(100_000, dtype=numpy.int64)}) >= 800_000
+    assert estimate_result_size({'ID': numpy.arange(100_000, dtype=numpy.int64)[::2]}) >= 400_000
+    assert estimate_result_size({'NAME': numpy.array(['x' * 1000] * 10, dtype=object)}) > 10_000
+    assert not SFResultCache(max_bytes=100_000).put('columns', None, {'ID': numpy.arange(100_000)}, frozenset())
+
+
+def test_results_computed_across_an_invalidation_are_not_stored():
+    cache = SFResultCache()
+    generation = cache.generation
+    cache.invalidate('ORDERS')
+    assert not cache.put('stale', None, [], frozenset({'ORDERS'}), generation=generation)
+    assert cache.put('fresh', None, [], frozenset({'ORDERS'}), generation=cache.generation)
+    assert len(cache) == 1
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pytest
+
+from esql.connection.snowflake.sf_columns import get_columns
+from esql.connection.snowflake.sf_row_pipeline import Cast, Drop, Normalize, Parse, Rename, SFRowPipeline
+from esql.sql_.adapters.snowflake.snowflake_data_types import SnowflakeDataTypes
+
+_FIXED, _TEXT, _VARIANT = 0, 2, 5
+
+_COLUMNS = get_columns([
+    ('ID', _FIXED, None, None, 38, 0, False),
+    ('NAME', _TEXT, None, None, None, None, True),
+    ('PAYLOAD', _VARIANT, None, None, None, None, True),
+    ('RAW', _TEXT, None, None, None, None, True)
+])
+
+
+def test_stages_run_in_order():
+    pipeline = SFRowPipeline([Parse(), Cast(('ID',), SnowflakeDataTypes.FLOAT), Drop(('RAW',)), Rename({'ID': 'id'}), Normalize(('NAME',))])
+    records = pipeline.compile(_COLUMNS).process([(1, 'a\n  b', '{"x": 1}', 'raw')])
+    assert records == [{'id': 1.0, 'NAME': 'a b', 'PAYLOAD': {'x': 1}}]
+
+
+def test_only_requested_work_is_compiled():
+    compiled = SFRowPipeline([Parse(), Normalize(('NAME',))]).compile(_COLUMNS)
+    assert compiled.stage_labels == ('0:parse', '1:normalize')
+    assert compiled.process([(1, 'a', None, 'b\n c')]) == [{'ID': 1, 'NAME': 'a', 'PAYLOAD': None, 'RAW': 'b\n c'}]
+
+
+def test_compiled_pipelines_are_cached_and_timed():
+    pipeline = SFRowPipeline.default()
+    assert pipeline.compile(_COLUMNS) is pipeline.compile(_COLUMNS)
+    pipeline.compile(_COLUMNS).process([(1, 'a', '[]', 'b')] * 10)
+    assert pipeline.row_count == 10
+    assert set(pipeline.timings) == {'convert'}
+
+
+def test_row_converter_is_generated_per_schema():
+    columns = get_columns([('it\'s "odd"', _TEXT, None, None, None, None, True), ('N', _TEXT, None, None, None, None, True)])
+    compiled = SFRowPipeline([Normalize(), Cast(('N',), SnowflakeDataTypes.FLOAT), Rename({'N': 'n'})]).compile(columns)
+    assert compiled.convert_row(('a  b', None)) == {'it\'s "odd"': 'a b', 'n': None}
+    assert compiled.convert_row((None, '2')) == {'it\'s "odd"': None, 'n': 2.0}
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(ValueError):
+        SFRowPipeline([Drop(('NAME',)), Normalize(('NAME',))]).compile(_COLUMNS)
+
+
+def test_date_cast_gives_dates():
+    cast = SFRowPipeline([Cast(('NAME', 'RAW'), SnowflakeDataTypes.DATE)]).compile(_COLUMNS)
+    records = cast.process([(1, date(2024, 1, 31), None, '2024-02-01'), (2, datetime(2024, 3, 1, 12, 30), None, None)])
+    assert [(record['NAME'], record['RAW']) for record in records] == [(date(2024, 1, 31), date(2024, 2, 1)), (date(2024, 3, 1), None)]
+
+
+def test_bool_cast_parses_text():
+    cast = SFRowPipeline([Cast(('NAME',), SnowflakeDataTypes.BOOL)]).compile(_COLUMNS)
+    records = cast.process([(1, 'false', None, None), (2, 'TRUE', None, None), (3, 0, None, None), (4, True, None, None)])
+    assert [record['NAME'] for record in records] == [False, True, False, True]
+    with pytest.raises(ValueError):
+        cast.process([(1, 'maybe', None, None)])
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from esql.connection.snowflake.sf_session_context import SFSessionContext, format_exact_identifier
+
+
+def _make_context() -> SFSessionContext:
+    return SFSessionContext(
+        role='ANALYST',
+        warehouse='WH_SMALL',
+        database='DB',
+        schema='PUBLIC',
+        parameters={'QUERY_TAG': '', 'AUTOCOMMIT': 'true', 'STATEMENT_TIMEOUT_IN_SECONDS': '172800'}
+    )
+
+
+def test_no_op_changes_are_elided():
+    context = _make_context()
+    assert context.plan(
+        role='analyst',
+        warehouse='WH_SMALL',
+        database='db',
+        schema='public',
+        parameters={'autocommit': True, 'STATEMENT_TIMEOUT_IN_SECONDS': 172800}
+    ) == []
+
+
+def test_changes_are_ordered():
+    context = _make_context()
+    assert context.plan(warehouse='WH_LARGE', role='ADMIN', parameters={'QUERY_TAG': 'nightly', 'AUTOCOMMIT': False}) == [
+        'USE ROLE "ADMIN"',
+        'USE WAREHOUSE "WH_LARGE"',
+        "ALTER SESSION SET QUERY_TAG = 'nightly', AUTOCOMMIT = False"
+    ]
+
+
+def test_database_change_resets_schema():
+    context = _make_context()
+    assert context.plan(database='OTHER', schema='PUBLIC') == ['USE DATABASE "OTHER"', 'USE SCHEMA "PUBLIC"']
+
+    context.apply(database='OTHER')
+    assert context.schema == 'PUBLIC'
+    assert context.plan(database='OTHER', schema='public') == []
+
+
+def test_apply_records_parameters():
+    context = _make_context()
+    context.apply(parameters={'query_tag': 'nightly', 'AUTOCOMMIT': False})
+    assert context.parameters['QUERY_TAG'] == 'nightly'
+    assert context.parameters['AUTOCOMMIT'] == 'false'
+    assert context.plan(parameters={'QUERY_TAG': 'nightly', 'AUTOCOMMIT': False}) == []
+
+
+def test_unseeded_parameters_are_always_sent():
+    context = SFSessionContext(role='ANALYST')
+    assert context.plan(parameters={'QUERY_TAG': 'x'}) == ["ALTER SESSION SET QUERY_TAG = 'x'"]
+
+
+def test_quoted_identifiers_keep_their_case():
+    context = _make_context()
+    context.apply(role='"My_Role"', database='sales')
+    assert (context.role, context.database) == ('My_Role', 'SALES')
+    assert context.plan(role='"My_Role"', database='SALES') == []
+    assert context.plan(role='my_role') == ['USE ROLE "MY_ROLE"']
+
+
+def test_exact_identifiers_are_quoted_unless_plain_uppercase():
+    assert format_exact_identifier('ANALYTICS_2') == 'ANALYTICS_2'
+    assert format_exact_identifier('My_Db') == '"My_Db"'
+    assert format_exact_identifier('raw "data"') == '"raw ""data"""'
+    assert format_exact_identifier(None) is None
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+from esql.connection.snowflake.sf_show_paginator import SFShowPaginator
+
+
+class _ShowConnection:
+    """
+    Serves SHOW pages from *names* like Snowflake: sorted by name, FROM included
+    """
+    def __init__(self, names: list[str], failing_page: int | None = None):
+        self.names: list[str] = sorted(names)
+        self.failing_page: int | None = failing_page
+        self.queries: list[tuple[int, str | None]] = []
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+
+    def get_io_executor(self) -> ThreadPoolExecutor:
+        return self.executor
+
+    def execute_query(self, query, *query_parameters, **kwargs) -> SFQueryResult:
+        limit, limit_filter = query
+        self.queries.append(query)
+        if len(self.queries) == self.failing_page:
+            return SFQueryResult(query_id='failed', error_message='boom', results=None)
+
+        start: int = 0 if limit_filter is None else next(index for index, name in enumerate(self.names) if name >= limit_filter)
+        rows = [{'name': name, 'schema_name': 'S'} for name in self.names[start:start + limit]]
+        return SFQueryResult(query_id=str(len(self.queries)), error_message=None, results=rows)
+
+
+def _lister(*, limit: int, limit_filter: str | None) -> tuple[int, str | None]:
+    return limit, limit_filter
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_pages_cover_every_row_once(prefetch):
+    names = [f'T{index:03}' for index in range(25)]
+    connection = _ShowConnection(names)
+    paginator = SFShowPaginator(connection, _lister, page_size=10, prefetch=prefetch)  # noqa
+    assert [row['name'] for row in paginator] == names
+    assert connection.queries == [(10, None), (10, 'T009'), (10, 'T018')]
+    assert paginator.row_count == 25
+    assert paginator.error is None
+
+
+def test_failed_page_stops_the_iteration():
+    connection = _ShowConnection([f'T{index:03}' for index in range(25)], failing_page=2)
+    paginator = SFShowPaginator(connection, _lister, page_size=10)  # noqa
+    assert len(list(paginator)) == 10
+    assert paginator.error == 'boom'
+    assert paginator.query_id == 'failed'
+
+
+def test_page_stuck_on_one_name_stops_the_iteration():
+    connection = _ShowConnection(['A'] + ['B'] * 5)
+    paginator = SFShowPaginator(connection, _lister, page_size=3, prefetch=False)  # noqa
+    assert [row['name'] for row in paginator] == ['A', 'B', 'B']
+    assert 'increase page_size' in paginator.error
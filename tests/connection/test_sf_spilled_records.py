@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import sys
+
+from esql.connection.snowflake.sf_spilled_records import SFSpilledRecords, estimate_record_size
+
+
+def _make_batch(start: int) -> list[dict]:
+    return [{'ID': index, 'NAME': f'name {index}'} for index in range(start, start + 10)]
+
+
+def _fill(records: SFSpilledRecords) -> SFSpilledRecords:
+    for start in range(0, 100, 10):
+        records.append_batch(_make_batch(start))
+    return records.seal()
+
+
+def test_small_results_stay_in_memory():
+    with _fill(SFSpilledRecords(memory_budget=1024 * 1024)) as records:
+        assert not records.is_spilled
+        assert [record['ID'] for record in records] == list(range(100))
+
+
+def test_spilled_records_keep_their_order_and_can_be_iterated_again():
+    batch_size = sum(estimate_record_size(record) for record in _make_batch(0))
+    with _fill(SFSpilledRecords(memory_budget=3 * batch_size)) as records:
+        assert records.is_spilled
+        assert 0 < records.spilled_batch_count < 10
+        assert len(records) == 100
+        assert [record['ID'] for record in records] == list(range(100))
+        assert [record['NAME'] for record in records][-1] == 'name 99'
+
+
+def test_estimation_includes_object_overhead():
+    record = {f'C{index}': index + 1000 for index in range(10)}
+    assert estimate_record_size(record) >= sys.getsizeof(record) + 10 * sys.getsizeof(1000)
+    assert estimate_record_size({'PAYLOAD': {'x': [1, 2]}}) > estimate_record_size({'PAYLOAD': {}})
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from esql.connection.snowflake.sf_struct_converter import SFStructConverter, get_struct_converter
+from esql.sql_.adapters.snowflake.enums.warehouse_sizes import WarehouseSizes
+from esql.sql_.adapters.snowflake.result_structs.list_columns_result import ListColumnsResult
+from esql.sql_.adapters.snowflake.result_structs.list_warehouses_result import ListWarehousesResult
+
+
+def test_columns_are_matched_by_name_and_unknown_ones_ignored():
+    converter = SFStructConverter(ListColumnsResult, [
+        'table_name', 'schema_name', 'column_name', 'data_type', 'null?', 'default', 'kind', 'expression', 'comment',
+        'database_name', 'autoincrement', 'some_new_column'
+    ])
+    result = converter.convert(('T', 'S', 'C', '{"type":"FIXED"}', 'true', '', 'COLUMN', '', '', 'D', '', 'ignored'))
+    assert result.table_name == 'T'
+    assert result.null is True
+    assert result.database_name == 'D'
+
+
+def test_values_are_coerced_to_field_types():
+    converter = get_struct_converter(ListWarehousesResult, ('name', 'state', 'size', 'running', 'queued', 'is_default', 'available', 'created_on'))
+    result = converter.convert(('WH', 'STARTED', 'X-Small', '2', 0, 'false', '100', datetime(2024, 1, 1)))
+    assert result.size is WarehouseSizes.X_SMALL
+    assert result.running == 2
+    assert result.is_default is False
+    assert result.available == 100.0
+    assert result.created_on == datetime(2024, 1, 1)
+    assert result.owner is None
+
+
+def test_converters_are_shared():
+    column_names = ('name', 'size')
+    assert get_struct_converter(ListWarehousesResult, column_names) is get_struct_converter(ListWarehousesResult, column_names)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+from esql.connection.snowflake.sf_query_result import SFQueryResult
+from esql.connection.snowflake.sf_transaction import SFTransaction
+from esql.exceptions import TransactionFailedException
+
+
+class _ScriptRecorder:
+    def __init__(self, failing_statement: str | None = None):
+        self.failing_statement: str | None = failing_statement
+        self.scripts: list[list[str]] = []
+        self.queries: list[str] = []
+        self.result_cache = None
+
+    def execute_script(self, statements, *query_parameters, **kwargs) -> list[SFQueryResult]:
+        self.scripts.append(list(statements))
+        results: list[SFQueryResult] = []
+        for statement in statements:
+            if statement == self.failing_statement:
+                results.append(SFQueryResult(query_id='failed', error_message='boom', results=None))
+                break
+            results.append(SFQueryResult(query_id='ok', error_message=None, results=[]))
+        return results
+
+    def execute_query(self, query, *query_parameters, **kwargs) -> SFQueryResult:
+        self.queries.append(query)
+        return SFQueryResult(query_id='ok', error_message=None, results=[])
+
+
+def test_buffered_dml_is_sent_with_begin_and_commit():
+    connection = _ScriptRecorder()
+    transaction = SFTransaction(connection)  # noqa
+    assert transaction.execute('INSERT INTO T VALUES (1)') is None
+    assert transaction.execute('UPDATE T SET A = 2') is None
+    transaction.commit()
+
+    assert connection.scripts == [['BEGIN', 'INSERT INTO T VALUES (1)', 'UPDATE T SET A = 2', 'COMMIT']]
+    assert transaction.round_trips == 1
+    assert transaction.round_trips_saved == 3
+
+
+def test_reads_flush_pending_dml_first():
+    connection = _ScriptRecorder()
+    transaction = SFTransaction(connection)  # noqa
+    transaction.execute('DELETE FROM T')
+    transaction.execute('SELECT COUNT(*) FROM T')
+    transaction.commit()
+
+    assert connection.scripts == [['BEGIN', 'DELETE FROM T', 'SELECT COUNT(*) FROM T'], ['COMMIT']]
+
+
+def test_empty_transaction_sends_nothing():
+    connection = _ScriptRecorder()
+    transaction = SFTransaction(connection)  # noqa
+    transaction.commit()
+
+    assert connection.scripts == []
+    assert connection.queries == []
+
+
+def test_failed_commit_rolls_back():
+    connection = _ScriptRecorder(failing_statement='INSERT INTO T VALUES (1)')
+    transaction = SFTransaction(connection)  # noqa
+    transaction.execute('INSERT INTO T VALUES (1)')
+
+    with pytest.raises(TransactionFailedException):
+        transaction.commit()
+    assert connection.queries == ['ROLLBACK']
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from esql.connection.snowflake.sf_warehouse_router import SFWarehouseRouter, SFWarehouseTier, SFWarehouseLoad
+from esql.sql_.adapters.snowflake.enums.warehouse_sizes import WarehouseSizes
+
+GB = 1024 ** 3
+
+TIERS = [
+    SFWarehouseTier('WH_M', WarehouseSizes.MEDIUM, None),
+    SFWarehouseTier('WH_XS', WarehouseSizes.X_SMALL, GB),
+    SFWarehouseTier('WH_S', WarehouseSizes.SMALL, 10 * GB),
+]
+
+
+def test_tiers_are_sorted_by_size():
+    assert [tier.warehouse for tier in SFWarehouseRouter(TIERS).tiers] == ['WH_XS', 'WH_S', 'WH_M']
+
+
+def test_cheap_query_goes_to_smallest_idle_warehouse():
+    assert SFWarehouseRouter(TIERS).select_tier(1000, {}).warehouse == 'WH_XS'
+
+
+def test_heavy_query_skips_small_warehouses():
+    router = SFWarehouseRouter(TIERS)
+    assert router.select_tier(5 * GB, {}).warehouse == 'WH_S'
+    assert router.select_tier(50 * GB, {}).warehouse == 'WH_M'
+
+
+def test_cheap_query_avoids_queue():
+    router = SFWarehouseRouter(TIERS, max_escalation=1)
+    loads = {'WH_XS': SFWarehouseLoad(running=8, queued=4)}
+    assert router.select_tier(1000, loads).warehouse == 'WH_S'
+
+
+def test_escalation_is_bounded():
+    router = SFWarehouseRouter(TIERS, max_escalation=0)
+    loads = {'WH_XS': SFWarehouseLoad(running=8, queued=4)}
+    assert router.select_tier(1000, loads).warehouse == 'WH_XS'
+
+
+def test_unknown_estimate_is_eligible_everywhere():
+    router = SFWarehouseRouter(TIERS)
+    loads = {'WH_XS': SFWarehouseLoad(1, 3), 'WH_S': SFWarehouseLoad(1, 2)}
+    assert router.select_tier(None, loads).warehouse == 'WH_M'
+    assert router.select_tier(None, {}).warehouse == 'WH_XS'
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from esql.sql_.adapters.snowflake.stmt_components.snowflake_statements import StatementElementFirst, StatementElement, StatementElementMulti
+from esql.sql_.adapters.snowflake.stmt_components.snowflake_statements import StatementElementFirst, StatementElement, StatementElementMulti, build_statement
 
 
 def test_snowflake_statement_application_role():
@@ -11,3 +11,14 @@ def test_snowflake_statement_application_role():
     assert StatementElementFirst(
         StatementElementMulti('APPLICATION ROLE %0%1', ('%%.', None), ('%%', 'role_name'))
     ).get() == 'APPLICATION ROLE "ROLE_NAME"'
+
+
+def test_statement_with_flags_and_first_element():
+    assert build_statement(
+        'SHOW PARAMETERS',
+        StatementElementFirst(
+            StatementElement('IN SESSION', True),
+            StatementElement('IN ACCOUNT', False)
+        ),
+        indent_level=0
+    ) == 'SHOW PARAMETERS IN SESSION'
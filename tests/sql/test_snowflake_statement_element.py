@@ -129,3 +129,7 @@ def test_special_characters_in_element_string():
     element = StatementElement("Special chars: %%", "\\t\\n\\r", value_type=SnowflakeValueTypes.VALUE)
     assert element.get() == "Special chars: '\\t\\n\\r'"
 
+
+def test_boolean_flag_without_placeholder():
+    assert StatementElement("TERSE", True).get() == "TERSE"
+    assert StatementElement("TERSE", False).get() is None